@@ -11,25 +11,44 @@ __copyright__ = 'Copyright 2024, PHUB'
 __license__ = 'GPLv3'
 __version__  = '4.7.2'
 
-__all__ = ['Client', 'Quality', 'core', 'utils',
-           'consts', 'errors', 'objects', 'modules']
-
-# Shortcuts
-from .core import Client
-from .utils import Quality
-
-# Sub modules
-from . import core
-from . import utils
-from . import consts
-from . import errors
-
-# Sub packages
-from . import objects
-from . import modules
-
-# Sub packages content
-from .objects import *
-from .modules import *
+__all__ = ['Client', 'AsyncClient', 'Quality', 'profile', 'VideoFrame', 'core', 'utils',
+           'consts', 'errors', 'objects', 'modules', 'export', 'frame']
+
+from typing import TYPE_CHECKING
+
+from ._lazy import attach
+
+# Submodules and shortcuts are imported on first access
+_SUBMODULES = ['core', 'utils', 'consts', 'errors', 'literals', 'objects', 'modules', 'export', 'frame']
+
+_OBJECTS = ['Image', 'Tag', 'Like', 'FeedItem', 'Lookup', 'User', 'Feed', 'Video', 'VideoRecord',
+            'Account', '_BaseQuality', 'Query', 'queries', 'Playlist']
+
+_MODULES = ['parser', 'display', 'download', 'rss', 'limiter', 'retry', 'transport',
+            'cache', 'middleware', 'flight', 'stream', 'metrics', 'trace', 'cassette', 'session', 'identity', 'store']
+
+__getattr__, __dir__ = attach(__name__, _SUBMODULES, {
+    # Shortcuts
+    'Client': '.core',
+    'AsyncClient': '.core',
+    'Quality': '.utils',
+    'profile': '.modules.trace',
+    'VideoFrame': '.frame',
+
+    # Sub packages content
+    **dict.fromkeys(_OBJECTS, '.objects'),
+    **dict.fromkeys(_MODULES, '.modules')
+})
+
+if TYPE_CHECKING:
+    from .core import Client, AsyncClient
+    from .utils import Quality
+    from .modules.trace import profile
+    from .frame import VideoFrame
+
+    from . import core, utils, consts, errors, literals, objects, modules, export, frame
+
+    from .objects import *
+    from .modules import *
 
 # EOF
@@ -0,0 +1,55 @@
+'''
+PHUB lazy loading helpers.
+
+Packages attach their public names to the submodules defining them,
+which are only imported on first access (PEP 562).
+'''
+
+from __future__ import annotations
+
+import sys
+import importlib
+from typing import Callable
+
+
+def attach(package: str,
+           submodules: list[str] = (),
+           attributes: dict[str, str] = None) -> tuple[Callable, Callable]:
+    '''
+    Build the ``__getattr__`` and ``__dir__`` functions of a lazy package.
+
+    Args:
+        package (str): The package name (usually ``__name__``).
+        submodules (list[str]): Submodules exposed as attributes.
+        attributes (dict[str, str]): Attribute names and the relative module defining them.
+
+    Returns:
+        tuple[Callable, Callable]: The ``__getattr__`` and ``__dir__`` functions.
+    '''
+
+    attributes = dict(attributes or {})
+    submodules = set(submodules)
+
+    def __getattr__(name: str) -> object:
+
+        if name in submodules:
+            value = importlib.import_module(f'{package}.{name}')
+
+        elif name in attributes:
+            module = importlib.import_module(attributes[name], package)
+            value = getattr(module, name)
+
+        else:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+        # Cache the value so __getattr__ is not called again
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+
+        return sorted({*vars(sys.modules[package]), *submodules, *attributes})
+
+    return __getattr__, __dir__
+
+# EOF
@@ -0,0 +1,12 @@
+'''
+PHUB benchmarks.
+
+These benchmarks run on fixture pages and against a local
+stand-in server, and never reach Pornhub.
+
+- ``python -m phub.bench``: hot paths (regexes, parsing, serialization, downloaders).
+- ``python -m phub.bench.transport``: segment throughput of each transport profile.
+- ``python -m phub.bench.imports``: import time of PHUB entry points, against a budget.
+'''
+
+# EOF
@@ -0,0 +1,53 @@
+'''
+Run the PHUB benchmarks.
+
+Usage: python -m phub.bench [PATTERN ...] [--min-time S] [--save FILE] [--compare FILE]
+'''
+
+from __future__ import annotations
+
+import sys
+import argparse
+
+from . import suite, runner
+
+
+def main() -> None:
+    
+    parser = argparse.ArgumentParser(prog = 'python -m phub.bench',
+                                     description = __doc__.strip().split('\n')[0])
+    parser.add_argument('patterns', nargs = '*', help = 'Benchmarks to run (glob or substring)')
+    parser.add_argument('--min-time', type = float, default = .5, help = 'Minimum measuring time per benchmark')
+    parser.add_argument('--fixtures', help = 'Directory of recorded fixture pages')
+    parser.add_argument('--save', help = 'Save results as a baseline')
+    parser.add_argument('--compare', help = 'Compare results to a baseline')
+    parser.add_argument('--threshold', type = float, default = .1, help = 'Throughput drop considered a regression')
+    parser.add_argument('--list', action = 'store_true', help = 'List benchmarks and exit')
+    args = parser.parse_args()
+    
+    names = suite.select(args.patterns)
+    
+    if args.list:
+        print('\n'.join(names))
+        return
+    
+    if not names:
+        sys.exit('No benchmark matches the given patterns')
+    
+    baseline = runner.load(args.compare) if args.compare else None
+    results = list(suite.run(names, args.min_time, args.fixtures))
+    
+    print(runner.report(results, baseline, args.threshold))
+    
+    if args.save:
+        runner.save(results, args.save)
+    
+    # Fail on regressions, for CI use
+    if baseline is not None and any((delta := runner.change(result, baseline)) is not None
+                                    and delta < -args.threshold for result in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
+
+# EOF
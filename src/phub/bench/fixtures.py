@@ -0,0 +1,209 @@
+'''
+Benchmark fixture pages.
+
+Fixtures are generated deterministically with the structure and
+size of real Pornhub pages. Recorded pages can be used instead by
+placing them in a directory (see ``FILES``).
+'''
+
+from __future__ import annotations
+
+import os
+import json
+import random
+import logging
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+# Fixture names and their file names in a fixtures directory
+FILES = {
+    'video': 'video.html',          # A video page
+    'search': 'search.html',        # A search results page
+    'feed': 'feed.html',            # A user feed page
+    'api_video': 'video.json',      # A webmasters video_by_id response
+    'api_search': 'search.json'     # A webmasters search response
+}
+
+WORDS = ('amateur', 'hot', 'blonde', 'teen', 'milf', 'outdoor', 'pov', 'couple',
+         'real', 'homemade', 'solo', 'toy', 'latina', 'ebony', 'asian', 'big')
+
+def _key(rng: random.Random) -> str:
+    return 'ph' + ''.join(rng.choices('0123456789abcdef', k = 13))
+
+def _title(rng: random.Random) -> str:
+    return ' '.join(rng.choices(WORDS, k = rng.randint(3, 9))).title()
+
+def _filler(rng: random.Random, size: int) -> str:
+    '''
+    Markup of related videos and scripts, to reach real page sizes.
+    '''
+
+    blocks = []
+    while sum(map(len, blocks)) < size:
+        key = _key(rng)
+        blocks.append(
+            f'<li class="relatedVideo"><div class="phimage"><a href="/view_video.php?viewkey={key}" '
+            f'title="{_title(rng)}" class="fade linkVideoThumb"><img src="https://ei.phncdn.com/videos/{key}/thumb.jpg" '
+            f'data-thumb_url="https://ei.phncdn.com/videos/{key}/thumb.jpg" width="150" height="84"></a>'
+            f'<var class="duration">{rng.randint(1, 59)}:{rng.randint(0, 59):02}</var></div></li>\n'
+        )
+
+    return ''.join(blocks)
+
+def video_page(rng: random.Random, size: int = 400_000) -> str:
+    '''
+    Build a video page.
+    '''
+
+    key = _key(rng)
+    title = _title(rng)
+
+    flashvars = {
+        'isVertical': 'false',
+        'video_duration': rng.randint(60, 3600),
+        'video_title': title,
+        'image_url': f'https://ei.phncdn.com/videos/{key}/original/1.jpg',
+        'hotspots': [str(rng.randint(0, 500)) for _ in range(100)],
+        'playbackTracking': {'video_id': rng.randint(10 ** 8, 10 ** 9)},
+        'isHD': 'true',
+        'isVR': 'false',
+        'mediaDefinitions': [
+            {'format': 'hls', 'quality': q, 'videoUrl': f'https://ev-h.phncdn.com/hls/videos/{key}/{q}P_4000K/master.m3u8'}
+            for q in ('1080', '720', '480', '240')
+        ],
+        'thumbs': {'samplingFrequency': 9, 'urlPattern': f'https://ei.phncdn.com/videos/{key}/S{{0}}.jpg'}
+    }
+
+    head = (
+        '<!DOCTYPE html><html><head><title>' + title + ' - Pornhub.com</title>'
+        '<script type="application/ld+json">{"@context": "http://schema.org/", "@type": "VideoObject", '
+        f'"name": "{title}", "embedUrl": "https://www.pornhub.com/embed/{key}", '
+        '"uploadDate": "2023-04-05T06:07:08+00:00"}</script>\n'
+        '<script>var token = "' + ''.join(rng.choices('abcdefABCDEF0123456789', k = 80)) + '", '
+        'isLogged = false;</script>\n</head><body>'
+    )
+
+    player = f'<script type="text/javascript">\nvar flashvars_{rng.randint(10 ** 8, 10 ** 9)} = {json.dumps(flashvars)};\n</script>'
+
+    author = (
+        '<div class="userInfo"><span class="usernameBadgesWrapper"><a rel="" href="/model/some-model"  '
+        'class="bolded">Some Model</a></span></div>'
+        '<div class="favorite-wrapper js-favoriteBtn tooltipTrig active" data-title="Favorite"></div>'
+        '<div class="categoriesWrapper"><a class="item" data-label="Category" href="/categories/amateur">Amateur</a>'
+        '<a class="item" data-label="Category" href="/video?c=3">Babe</a></div>'
+        '<div class="pornstarsWrapper"><a class="pstar-list-btn js-mxp" data-mxptype="Pornstar" data-mxptext="Some Star" '
+        'data-id="1" href="/pornstar/some-star">Some Star</a></div>'
+    )
+
+    return head + _filler(rng, size // 2) + player + author + _filler(rng, size // 2) + '</body></html>'
+
+def search_page(rng: random.Random, items: int = 32, size: int = 250_000) -> str:
+    '''
+    Build a search results page.
+    '''
+
+    blocks = []
+    for i in range(items):
+        key = _key(rng)
+        blocks.append(
+            f'<li class="pcVideoListItem js-pop videoblock videoBox" id="v{rng.randint(10 ** 8, 10 ** 9)}" '
+            f'data-video-segment="straight" data-video-vkey="{key}" data-id="{i}">'
+            f'<div class="wrap"><div class="phimage"><a href="/view_video.php?viewkey={key}" title="{_title(rng)}" '
+            f'class="fade linkVideoThumb"><img src="https://ei.phncdn.com/videos/{key}/thumb.jpg" '
+            f'data-mediabook="https://ew.phncdn.com/videos/{key}/180P_225K.webm" width="150"></a>'
+            f'<div class="marker-overlays js-noFade"><span class="hd-thumbnail">HD</span></div></div>'
+            f'<var class="duration">{rng.randint(1, 59)}:{rng.randint(0, 59):02}</var></div></li>\n'
+        )
+
+    pad = _filler(rng, max(size - sum(map(len, blocks)), 0) // 2)
+    return ('<html><body>' + pad + '<div class="container"><div class="showingCounter">Showing 1-32 of '
+            f'{rng.randint(1000, 9000)} </div><ul id="videoSearchResult">' + ''.join(blocks) + '</ul></div>' + pad + '</body></html>')
+
+def feed_page(rng: random.Random, items: int = 20) -> str:
+    '''
+    Build a user feed page.
+    '''
+
+    sections = []
+    for _ in range(items):
+        kind = rng.choice(('stream_videos_uploaded', 'stream_favourites_videos', 'stream_grouped_comments_videos'))
+        sections.append(
+            f'<section class="feedItemSection" data-table="{kind}"><div class="feedInfo"><a class="userLink" '
+            f'href="/model/model-{rng.randint(1, 999)}">Model</a>  uploaded  a video  </div>'
+            f'<div class="feedRight"><ul>' + _filler(rng, 2000) + '</ul></div></section>'
+        )
+
+    return '<html><body><div class="feedPage">' + ''.join(sections) + '</div></body></html>'
+
+def api_video(rng: random.Random) -> dict:
+    '''
+    Build a webmasters video object.
+    '''
+
+    key = _key(rng)
+
+    return {
+        'duration': f'{rng.randint(1, 59)}:{rng.randint(0, 59):02}',
+        'views': rng.randint(0, 10 ** 7),
+        'video_id': key,
+        'rating': rng.uniform(50, 100),
+        'ratings': rng.randint(0, 10 ** 5),
+        'title': _title(rng),
+        'url': f'https://www.pornhub.com/view_video.php?viewkey={key}',
+        'default_thumb': f'https://ei.phncdn.com/videos/{key}/original/1.jpg',
+        'thumb': f'https://ei.phncdn.com/videos/{key}/original/1.jpg',
+        'publish_date': f'20{rng.randint(10, 24)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)} 12:34:56',
+        'segment': 'straight',
+        'thumbs': [{'size': '320x240', 'width': '320', 'height': '240',
+                    'src': f'https://ei.phncdn.com/videos/{key}/original/{i}.jpg'} for i in range(16)],
+        'tags': [{'tag_name': word} for word in rng.sample(WORDS, 10)],
+        'pornstars': [],
+        'categories': [{'category': word} for word in rng.sample(WORDS, 4)]
+    }
+
+def generate(seed: int = 0) -> dict[str, str]:
+    '''
+    Generate all fixtures.
+
+    Args:
+        seed (int): The random seed.
+
+    Returns:
+        dict[str, str]: The fixture contents, by name.
+    '''
+
+    rng = random.Random(seed)
+
+    return {
+        'video': video_page(rng),
+        'search': search_page(rng),
+        'feed': feed_page(rng),
+        'api_video': json.dumps({'video': api_video(rng)}),
+        'api_search': json.dumps({'videos': [api_video(rng) for _ in range(30)]})
+    }
+
+def load(directory: Union[str, os.PathLike] = None, seed: int = 0) -> dict[str, str]:
+    '''
+    Load fixtures, using recorded pages where available.
+
+    Args:
+        directory (PathLike): Directory containing recorded fixtures.
+        seed (int): Random seed of generated fixtures.
+
+    Returns:
+        dict[str, str]: The fixture contents, by name.
+    '''
+
+    fixtures = generate(seed)
+
+    for name, file in FILES.items():
+        if directory and os.path.isfile(path := os.path.join(directory, file)):
+            logger.info('Using recorded fixture %s', path)
+
+            with open(path, encoding = 'utf-8') as handle:
+                fixtures[name] = handle.read()
+
+    return fixtures
+
+# EOF
@@ -0,0 +1,110 @@
+'''
+Import time of PHUB entry points, checked against a budget.
+
+Usage: python -m phub.bench.imports [--repeat N] [--budget MS]
+'''
+
+from __future__ import annotations
+
+import sys
+import argparse
+import statistics
+import subprocess
+
+# Statements to time and their budget in milliseconds, interpreter startup excluded
+BUDGETS: dict[str, float] = {
+    'import phub': 20,
+    'import phub.modules': 20,
+    'import phub.objects': 150,
+    'from phub import Client': 250
+}
+
+# Modules that must stay unloaded after a plain ``import phub``
+DEFERRED = ['phub.core', 'phub.objects', 'phub.modules', 'httpx', 'asyncio', 'sqlite3', 'ffmpeg_progress_yield']
+
+
+def measure(statement: str) -> float:
+    '''
+    Time a statement in a fresh interpreter. The clock runs
+    inside the child, so interpreter startup is excluded.
+
+    Args:
+        statement (str): The import statement.
+
+    Returns:
+        float: The elapsed time in seconds.
+    '''
+
+    code = f'import time\nstart = time.perf_counter()\n{statement}\nprint(time.perf_counter() - start)'
+    output = subprocess.run([sys.executable, '-c', code], check = True, capture_output = True, text = True)
+    return float(output.stdout.split()[-1])
+
+def loaded(statement: str = 'import phub') -> list[str]:
+    '''
+    List the deferred modules a statement loads.
+
+    Args:
+        statement (str): The import statement.
+
+    Returns:
+        list[str]: The loaded modules among ``DEFERRED``.
+    '''
+
+    code = f'{statement}\nimport sys\nprint(*(m for m in {DEFERRED!r} if m in sys.modules))'
+    output = subprocess.run([sys.executable, '-c', code], check = True, capture_output = True, text = True)
+    return output.stdout.split()
+
+def run(budgets: dict[str, float] = None, repeat: int = 7) -> list[dict]:
+    '''
+    Time import statements in fresh interpreters.
+
+    Args:
+        budgets (dict[str, float]): Statements and their budget in milliseconds.
+        repeat (int): Interpreters spawned per statement.
+
+    Returns:
+        list[dict]: A result for each statement.
+    '''
+
+    budgets = budgets or BUDGETS
+
+    results = []
+    for statement, budget in budgets.items():
+        elapsed = statistics.median(measure(statement) for _ in range(repeat))
+
+        results.append({
+            'statement': statement,
+            'ms': round(elapsed * 1000, 1),
+            'budget': budget,
+            'ok': elapsed * 1000 <= budget
+        })
+
+    return results
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description = __doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type = int, default = 7)
+    parser.add_argument('--budget', type = float, help = 'Budget of `import phub` in milliseconds')
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS)
+    if args.budget is not None:
+        budgets['import phub'] = args.budget
+
+    results = run(budgets, args.repeat)
+
+    print(f'{"statement":<28}{"ms":>10}{"budget":>10}')
+    for result in results:
+        flag = '' if result['ok'] else '  over budget'
+        print(f'{result["statement"]:<28}{result["ms"]:>10}{result["budget"]:>10}{flag}')
+
+    if eager := loaded():
+        print('`import phub` loads deferred modules:', ', '.join(eager))
+
+    sys.exit(0 if all(r['ok'] for r in results) and not eager else 1)
+
+if __name__ == '__main__':
+    main()
+
+# EOF
@@ -0,0 +1,190 @@
+'''
+Benchmark measurement and baselines.
+'''
+
+from __future__ import annotations
+
+import gc
+import os
+import json
+import time
+import logging
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Callable, Union
+
+logger = logging.getLogger(__name__)
+
+
+class Skip(Exception):
+    '''
+    Raised by a benchmark setup that can't run here
+    (e.g. a missing optional dependency).
+    '''
+
+@dataclass
+class Result:
+    '''
+    Represents the measurements of a benchmark.
+    '''
+
+    name: str
+    ops: float = None # Operations per second
+    p50: float = None # Median operation time, in seconds
+    p99: float = None # 99th percentile operation time, in seconds
+    peak: int = None # Peak memory allocated during one operation, in bytes
+    iterations: int = 0
+    skipped: str = None # Reason the benchmark was skipped
+
+def _percentile(samples: list[float], q: float) -> float:
+    '''
+    Get a percentile of sorted samples.
+    '''
+
+    return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+def measure(name: str,
+            func: Callable[[], object],
+            min_time: float = .5,
+            min_iterations: int = 3,
+            sample_time: float = 1e-3) -> Result:
+    '''
+    Measure a function.
+
+    Fast functions are timed by batches lasting at least
+    ``sample_time``, so each sample is the mean time of the
+    operations of a batch.
+
+    Args:
+        name (str): The benchmark name.
+        func (Callable): The operation.
+        min_time (float): Minimum total measuring time.
+        min_iterations (int): Minimum amount of operations.
+        sample_time (float): Minimum duration of a sample.
+
+    Returns:
+        Result: The measurements.
+    '''
+
+    # Warm up and calibrate the batch size
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    batch = max(1, int(sample_time / first)) if first else 1000
+
+    # Peak memory of a single operation
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    samples = []
+    iterations = 0
+    started = time.perf_counter()
+
+    while time.perf_counter() - started < min_time or iterations < min_iterations:
+        start = time.perf_counter()
+        for _ in range(batch): func()
+        samples.append((time.perf_counter() - start) / batch)
+        iterations += batch
+
+    samples.sort()
+    total = sum(samples) * batch
+
+    return Result(
+        name = name,
+        ops = iterations / total if total else float('inf'),
+        p50 = _percentile(samples, .5),
+        p99 = _percentile(samples, .99),
+        peak = peak,
+        iterations = iterations
+    )
+
+def save(results: list[Result], path: Union[str, os.PathLike]) -> None:
+    '''
+    Save results as a baseline.
+
+    Args:
+        results (list[Result]): The results.
+        path (PathLike): The baseline file.
+    '''
+
+    with open(path, 'w', encoding = 'utf-8') as file:
+        json.dump({result.name: asdict(result) for result in results if not result.skipped},
+                  file, indent = 2)
+
+    logger.info('Saved baseline to %s', path)
+
+def load(path: Union[str, os.PathLike]) -> dict[str, Result]:
+    '''
+    Load a baseline.
+
+    Args:
+        path (PathLike): The baseline file.
+
+    Returns:
+        dict[str, Result]: The baseline results, by name.
+    '''
+
+    with open(path, encoding = 'utf-8') as file:
+        return {name: Result(**data) for name, data in json.load(file).items()}
+
+def change(result: Result, baseline: dict[str, Result]) -> Union[float, None]:
+    '''
+    Relative throughput change of a result compared to a baseline.
+
+    Returns:
+        float: The change (-0.1 is 10% slower), or None if there is nothing to compare to.
+    '''
+
+    if result.skipped or not (base := baseline.get(result.name)) or not base.ops:
+        return None
+
+    return result.ops / base.ops - 1
+
+def _time(seconds: Union[float, None]) -> str:
+
+    if seconds is None: return '-'
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale: return f'{seconds / scale:.2f}{unit}'
+    return f'{seconds / 1e-9:.0f}ns'
+
+def report(results: list[Result], baseline: dict[str, Result] = None, threshold: float = .1) -> str:
+    '''
+    Format results as a table.
+
+    Args:
+        results (list[Result]): The results.
+        baseline (dict[str, Result]): A baseline to compare to.
+        threshold (float): Throughput drop flagged as a regression.
+
+    Returns:
+        str: The table.
+    '''
+
+    width = max([len(result.name) for result in results] + [9])
+    lines = [f'{"benchmark":<{width}} {"ops/s":>12} {"p50":>10} {"p99":>10} {"peak":>10}'
+             + (f' {"change":>9}' if baseline is not None else '')]
+
+    for result in results:
+        if result.skipped:
+            lines.append(f'{result.name:<{width}} skipped: {result.skipped}')
+            continue
+
+        line = (f'{result.name:<{width}} {result.ops:>12,.1f} {_time(result.p50):>10} '
+                f'{_time(result.p99):>10} {result.peak / 1024:>8.0f}Ki')
+
+        if baseline is not None:
+            delta = change(result, baseline)
+            flag = ' !' if delta is not None and delta < -threshold else ''
+            line += f' {"-" if delta is None else f"{delta:+.1%}":>9}{flag}'
+
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+# EOF
@@ -0,0 +1,121 @@
+'''
+Local stand-in HTTP server for benchmarks.
+'''
+
+from __future__ import annotations
+
+import time
+import logging
+import threading
+from typing import Callable, Union
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+logger = logging.getLogger(__name__)
+
+Route = Callable[[str], Union[tuple[int, dict, bytes], None]]
+
+
+class StandInServer:
+    '''
+    A threaded HTTP/1.1 server serving payloads from a route
+    function, with simulated connection and request latencies.
+    
+    Connection latency is paid once per TCP connection, which
+    makes the effects of keep-alive and pre-warming measurable
+    on localhost.
+    '''
+    
+    def __init__(self,
+                 route: Route,
+                 latency: float = 0,
+                 connect_latency: float = 0) -> None:
+        '''
+        Initialise a new server.
+        
+        Args:
+            route (Callable): Maps a request path to a (status, headers, body) tuple, or None for 404.
+            latency (float): Time to wait before answering each request.
+            connect_latency (float): Time to wait when a new connection is opened.
+        '''
+        
+        server = self
+        self.route = route
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def setup(self) -> None:
+                with server._lock: server.connections += 1
+                time.sleep(server.connect_latency)
+                super().setup()
+            
+            def respond(self, body: bool) -> None:
+                with server._lock: server.requests += 1
+                time.sleep(server.latency)
+                
+                status, headers, payload = server.route(self.path) or (404, {}, b'')
+                
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                
+                if body: self.wfile.write(payload)
+            
+            def do_GET(self) -> None:
+                self.respond(True)
+            
+            def do_HEAD(self) -> None:
+                self.respond(False)
+            
+            def log_message(self, *_) -> None:
+                pass
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target = self.httpd.serve_forever, daemon = True)
+    
+    def __repr__(self) -> str:
+        
+        return f'phub.bench.StandInServer(port={self.port})'
+    
+    def __enter__(self) -> StandInServer:
+        
+        self.thread.start()
+        logger.info('Started %s', self)
+        return self
+    
+    def __exit__(self, *_) -> None:
+        
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    @property
+    def port(self) -> int:
+        '''
+        The server port.
+        '''
+        
+        return self.httpd.server_address[1]
+    
+    def url(self, path: str = '') -> str:
+        '''
+        Get the absolute URL of a path on the server.
+        
+        Args:
+            path (str): The path.
+        
+        Returns:
+            str: The URL.
+        '''
+        
+        return f'http://127.0.0.1:{self.port}/{path.lstrip("/")}'
+
+# EOF
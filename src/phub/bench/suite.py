@@ -0,0 +1,310 @@
+'''
+PHUB hot path benchmarks.
+'''
+
+from __future__ import annotations
+
+import os
+import json
+import shutil
+import fnmatch
+import logging
+import tempfile
+import subprocess
+from types import SimpleNamespace
+from typing import Callable, Iterator
+
+from . import fixtures
+from .server import StandInServer
+from .runner import Skip, Result, measure
+from .. import Client, consts, utils
+from ..objects import Video, FeedItem
+from ..modules import parser, download
+
+logger = logging.getLogger(__name__)
+
+Setup = Callable[['Context'], Callable[[], object]]
+
+BENCHMARKS: dict[str, Setup] = {}
+
+SEGMENTS = 40 # Segments per download
+SEGMENT_SIZE = 128 * 1024
+
+
+def bench(name: str) -> Callable[[Setup], Setup]:
+    '''
+    Register a benchmark. The decorated function gets a
+    context and returns the operation to time.
+    '''
+
+    def decorator(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+class Context:
+    '''
+    Shared benchmark resources: fixtures, an offline client,
+    a stand-in server and a temporary directory.
+    '''
+
+    def __init__(self, fixtures_dir: str = None) -> None:
+        '''
+        Initialise a new context.
+
+        Args:
+            fixtures_dir (str): Directory of recorded fixtures, if any.
+        '''
+
+        self.fixtures = fixtures.load(fixtures_dir)
+        self.client = Client(login = False)
+        self.directory = tempfile.mkdtemp(prefix = 'phub-bench-')
+        self._server: StandInServer = None
+
+    def __enter__(self) -> Context:
+
+        return self
+
+    def __exit__(self, *_) -> None:
+
+        if self._server:
+            self._server.__exit__()
+
+        shutil.rmtree(self.directory, ignore_errors = True)
+
+    @property
+    def server(self) -> StandInServer:
+        '''
+        The stand-in server, serving segments and files of the
+        context directory.
+        '''
+
+        if self._server is None:
+            payload = os.urandom(SEGMENT_SIZE)
+
+            def route(path: str):
+                file = os.path.join(self.directory, 'www', path.lstrip('/'))
+                if os.path.isfile(file):
+                    with open(file, 'rb') as handle:
+                        return 200, {}, handle.read()
+
+                if path.endswith('.ts'):
+                    return 200, {'Content-Type': 'video/mp2t'}, payload
+
+            self._server = StandInServer(route).__enter__()
+
+        return self._server
+
+    def fake_video(self) -> SimpleNamespace:
+        '''
+        A video downloading its segments from the stand-in server.
+        '''
+
+        return SimpleNamespace(
+            client = self.client,
+            get_segments = lambda _: [self.server.url(f'seg-{i}.ts') for i in range(SEGMENTS)],
+            get_M3U_URL = lambda _: self.server.url('hls/index.m3u8')
+        )
+
+    def loaded_video(self) -> Video:
+        '''
+        A video with its webmasters data and page injected.
+        '''
+
+        video = Video(self.client, json.loads(self.fixtures['api_video'])['video']['url'])
+        video._load_data(json.loads(self.fixtures['api_video']))
+        video._load_page(self.fixtures['video'])
+        return video
+
+# === Regexes === #
+
+# Per-field video page regexes replaced by parser.extract, kept as its baseline
+_VIDEO_REGEXES = {
+    'get_flash':     consts.find(r'var (flashvars_\d*) = ({.*});\n'),
+    'video_channel': consts.find(r'href=\"(.*?)\" data-event=\"Video Underplayer\".*?bolded\">(.*?)<'),
+    'video_model':   consts.find(r'n class=\"usernameBadgesWrapper.*? href=\"(.*?)\"  class=\"bolded\">(.*?)<'),
+    'is_favorite':   consts.find(r'<div class=\".*?js-favoriteBtn.*?active\"'),
+    'fixed_title':   consts.find(consts.engine.DOTALL, r'(?<="name": ")[^"]+')
+}
+
+def _regex(fixture: str, pattern: str, *args) -> None:
+
+    @bench(f're.{pattern}')
+    def setup(ctx: Context):
+        raw = ctx.fixtures[fixture]
+        func = _VIDEO_REGEXES.get(pattern) or getattr(consts.re, pattern)
+        return lambda: func(raw, *args)
+
+for _fixture, _pattern, _args in [
+    ('video', 'get_flash', ()),
+    ('video', 'get_token', ()),
+    ('video', 'fixed_title', ()),
+    ('video', 'video_model', (False,)),
+    ('video', 'video_channel', (False,)),
+    ('video', 'is_favorite', (False,)),
+    ('video', 'get_challenge', (False,)),
+    ('search', 'container', ()),
+    ('search', 'query_counter', (False,)),
+    ('feed', 'feed_items', ()),
+]:
+    _regex(_fixture, _pattern, *_args)
+
+@bench('re.get_videos')
+def _(ctx: Context):
+    container = consts.re.container(ctx.fixtures['search'])
+    return lambda: consts.re.get_videos(container)
+
+@bench('re.is_video_url')
+def _(ctx: Context):
+    url = json.loads(ctx.fixtures['api_video'])['video']['url']
+    return lambda: consts.re.is_video_url(url) and consts.re.get_viewkey(url)
+
+# === Parsing === #
+
+@bench('parser.extract')
+def _(ctx: Context):
+    page = ctx.fixtures['video']
+    return lambda: parser.extract(page)
+
+@bench('VideoQuery._parse_page')
+def _(ctx: Context):
+    query = ctx.client.search('bench')
+    raw = ctx.fixtures['search']
+    return lambda: query._parse_page(raw)
+
+@bench('VideoQuery._eval_video (page)')
+def _(ctx: Context):
+    query = ctx.client.search('bench')
+    items = query._parse_page(ctx.fixtures['search'])
+    return lambda: [query._eval_video(item) for item in items]
+
+@bench('VideoQuery._iter_page (page)')
+def _(ctx: Context):
+    query = ctx.client.search('bench')
+    items = query._parse_page(ctx.fixtures['search'])
+    return lambda: list(query._iter_page(items))
+
+@bench('JSONQuery._parse_page')
+def _(ctx: Context):
+    query = ctx.client.search_hubtraffic('bench')
+    raw = ctx.fixtures['api_search']
+    return lambda: query._parse_page(raw)
+
+@bench('FeedItem (page)')
+def _(ctx: Context):
+    try:
+        import bs4 # type: ignore
+
+    except ImportError:
+        raise Skip('requires bs4')
+
+    items = consts.re.feed_items(ctx.fixtures['feed'])
+
+    def run():
+        for raw in items:
+            item = FeedItem(ctx.client, raw)
+            item.header, item.item_type, item.html
+
+    return run
+
+# === Serialization === #
+
+@bench('Video.dictify')
+def _(ctx: Context):
+    video = ctx.loaded_video()
+
+    # Serialized pornstars would fetch their user pages
+    data, page = dict(video.data), video.page._replace(pornstars = ())
+
+    def run():
+        fresh = Video(ctx.client, video.url)
+        fresh.data, fresh.page = dict(data), page
+        return fresh.dictify()
+
+    return run
+
+@bench('utils.serialize')
+def _(ctx: Context):
+    data = json.loads(ctx.fixtures['api_search'])
+    return lambda: utils.serialize(data, recursive = True)
+
+# === Downloaders === #
+
+def _downloader(name: str, downloader: Callable, prepare: Callable[[Context], None] = None) -> None:
+
+    @bench(f'download.{name}')
+    def setup(ctx: Context):
+        if prepare: prepare(ctx)
+        video = ctx.fake_video()
+        path = os.path.join(ctx.directory, f'{name}.ts')
+        return lambda: downloader(video, 'best', lambda *_: None, path)
+
+def _prepare_ffmpeg(ctx: Context) -> None:
+    '''
+    Encode a small HLS stream for FFMPEG to download.
+    '''
+
+    if not shutil.which(consts.FFMPEG_EXECUTABLE):
+        raise Skip('requires ffmpeg')
+
+    folder = os.path.join(ctx.directory, 'www', 'hls')
+    os.makedirs(folder, exist_ok = True)
+
+    try:
+        subprocess.run([consts.FFMPEG_EXECUTABLE, '-y', '-loglevel', 'error',
+                        '-f', 'lavfi', '-i', 'testsrc=duration=8:size=320x240:rate=25',
+                        '-c:v', 'mpeg2video', '-f', 'hls', '-hls_time', '1', '-hls_list_size', '0',
+                        '-hls_segment_filename', os.path.join(folder, 'seg-%d.ts'),
+                        os.path.join(folder, 'index.m3u8')], check = True, timeout = 60)
+
+    except (OSError, subprocess.SubprocessError) as err:
+        raise Skip(f'could not encode a test stream ({err})')
+
+_downloader('default', download.default)
+_downloader('threaded', download.threaded(max_workers = 8))
+_downloader('FFMPEG', download.FFMPEG, _prepare_ffmpeg)
+
+def select(patterns: list[str] = None) -> list[str]:
+    '''
+    Select benchmarks by name.
+
+    Args:
+        patterns (list[str]): Glob patterns or substrings of benchmark names.
+
+    Returns:
+        list[str]: The benchmark names.
+    '''
+
+    if not patterns:
+        return list(BENCHMARKS)
+
+    return [name for name in BENCHMARKS
+            if any(fnmatch.fnmatch(name, pattern) or pattern in name for pattern in patterns)]
+
+def run(names: list[str] = None, min_time: float = .5, fixtures_dir: str = None) -> Iterator[Result]:
+    '''
+    Run benchmarks.
+
+    Args:
+        names (list[str]): Benchmarks to run. Defaults to all.
+        min_time (float): Minimum measuring time of each benchmark.
+        fixtures_dir (str): Directory of recorded fixtures, if any.
+
+    Returns:
+        Iterator[Result]: The results, as they are measured.
+    '''
+
+    with Context(fixtures_dir) as ctx:
+        for name in names or BENCHMARKS:
+            try:
+                func = BENCHMARKS[name](ctx)
+
+            except Skip as skip:
+                yield Result(name, skipped = str(skip))
+                continue
+
+            logger.info('Running benchmark %s', name)
+            yield measure(name, func, min_time)
+
+# EOF
@@ -0,0 +1,89 @@
+'''
+Segment throughput of each transport profile.
+
+Usage: python -m phub.bench.transport [--segments N] [--size BYTES] [--workers N]
+'''
+
+from __future__ import annotations
+
+import time
+import argparse
+
+from .server import StandInServer
+from .. import Client
+from ..modules import download
+from ..modules.transport import PROFILES
+
+
+def run(segments: int = 200,
+        size: int = 256 * 1024,
+        workers: int = 20,
+        latency: float = .01,
+        connect_latency: float = .05,
+        profiles: list[str] = ('default', 'crawl', 'download')) -> list[dict]:
+    '''
+    Download fake segments with the threaded downloader using
+    each transport profile.
+    
+    Args:
+        segments (int): Amount of segments to download.
+        size (int): Size of a segment in bytes.
+        workers (int): Downloader workers.
+        latency (float): Simulated time to first byte.
+        connect_latency (float): Simulated connection (TCP + TLS) setup time.
+        profiles (list[str]): Names of the profiles to benchmark.
+    
+    Returns:
+        list[dict]: A result for each profile.
+    '''
+    
+    payload = bytes(size)
+    route = lambda path: (200, {'Content-Type': 'video/mp2t'}, payload) if path.endswith('.ts') else None
+    
+    results = []
+    for name in profiles:
+        
+        # Use a fresh server so connection counts are per profile
+        with StandInServer(route, latency, connect_latency) as server:
+            urls = [server.url(f'seg-{i}.ts') for i in range(segments)]
+            client = Client(transport = name)
+            
+            start = time.perf_counter()
+            client.prewarm(urls[0])
+            buffer = download._base_threaded(client, urls, lambda *_: None, max_workers = workers)
+            elapsed = time.perf_counter() - start
+            
+            results.append({
+                'profile': name,
+                'seconds': round(elapsed, 3),
+                'segments/s': round(len(buffer) / elapsed, 1),
+                'MB/s': round(sum(map(len, buffer.values())) / elapsed / 1e6, 2),
+                'connections': server.connections,
+                'failed': segments - len(buffer)
+            })
+    
+    return results
+
+def main() -> None:
+    
+    parser = argparse.ArgumentParser(description = __doc__.strip().split('\n')[0])
+    parser.add_argument('--segments', type = int, default = 200)
+    parser.add_argument('--size', type = int, default = 256 * 1024)
+    parser.add_argument('--workers', type = int, default = 20)
+    parser.add_argument('--latency', type = float, default = .01)
+    parser.add_argument('--connect-latency', type = float, default = .05)
+    parser.add_argument('--profiles', nargs = '+', default = [p for p in PROFILES if p])
+    args = parser.parse_args()
+    
+    results = run(args.segments, args.size, args.workers, args.latency,
+                  args.connect_latency, args.profiles)
+    
+    keys = list(results[0])
+    print(' '.join(k.rjust(12) for k in keys))
+    for result in results:
+        print(' '.join(str(result[k]).rjust(12) for k in keys))
+
+if __name__ == '__main__':
+    main()
+
+# EOF
@@ -39,7 +39,10 @@ RSS = 'https://www.pornhub.com/video/webmasterss'
 
 MAX_CALL_RETRIES = 4 # Maximum times a HTTPError can be reproduced
 MAX_CALL_TIMEOUT = .4 # Time to wait before retrying basic calls
+MAX_CALL_BACKOFF = 8 # Maximum time to wait between two retries
+MAX_RETRY_AFTER = 60 # Maximum time to honor from a server Retry-After header
 CALL_TIMEOUT = 30 # Time to wait before retrying calls (in case no error happens)
+STREAM_CHUNK_SIZE = 64 * 1024 # Size of streamed response chunks
 CHALLENGE_TIMEOUT = 2 # Time to wait before injecting the new cookie for resolving the challenge (needs to be at least 1)
 
 DOWNLOAD_SEGMENT_MAX_ATTEMPS = 5
@@ -222,15 +225,11 @@ class re:
     # Find regexes
     get_viewkey              = mtch(                             r'[&\?]viewkey=([a-z\d]+)(?=&|$)'                                             ) # Get video URL viewkey
     ffmpeg_line              = find(                             r'seg-(\d*?)-'                                                                ) # Get FFMPEG segment progress
-    get_flash                = find(                             r'var (flashvars_\d*) = ({.*});\n'                                            ) # Get flash data from a video page
     get_token                = find(                             r'token *?= \"(.*?)\",'                                                       ) # Get authentification token
-    video_channel            = find(                             r'href=\"(.*?)\" data-event=\"Video Underplayer\".*?bolded\">(.*?)<'          ) # Get video author, if channel
-    video_model              = find(                             r'n class=\"usernameBadgesWrapper.*? href=\"(.*?)\"  class=\"bolded\">(.*?)<' ) # Get video author, if model
     get_feed_type            = find(                             r'data-table="(.*?)"'                                                         ) # Get feed section type
     get_user_type            = find(                             r'\/(model|pornstar|channels|user|users)\/.*?'                                ) # Get a user type
     get_thumb_id             = find(                             r'\/([a-z0-9]+?)\/(?=original|thumb)'                                         ) # Get video id from its thumbnail 
     remove_host              = subc(                             _raw_root, ''                                                                 ) # Remove the HOST root from a URL
-    is_favorite              = find(                             r'<div class=\".*?js-favoriteBtn.*?active\"'                                  ) # Check if is favorite    
     eval_video               = find( engine.DOTALL,              r'id=\"(.*?)\".*?-vkey=\"(.*?)\".*?title=\"(.*?)\".*?src=\"(.*?)\".*?</div'   ) # Parse video data
     eval_public_video        = find( engine.DOTALL,              r'-mediabook=\"(.*?)\".*?marker-overlays.*?>(.*?)'                            ) # Parse public-only video data
     user_avatar              = find( engine.DOTALL,              r'previewAvatarPicture\">.*?src=\"(.*?)\"'                                    ) # get the user avatar
@@ -254,6 +253,21 @@ class re:
     user_infos               = comp( engine.DOTALL, p.findall,   r'infoPiece\".*?span>\s*(.*?):.*?smallInfo\">\s*(.*?)\s*<\/'                  ) # Get user info
     feed_items               = comp( engine.DOTALL, p.findall,   r'feedItemSection\"(.*?)<\/section'                                           ) # Get all items in the Feed
     get_ps                   = comp( engine.DOTALL, p.findall,   r'img.*?src=\"(.*?)\".*?href=\"(.*?)\".*?>(.*?)<.*?(\d.*?)\s'                 ) # Get pornstars data (avatar, url, name, video count)
+    scan_video               = comp(                p.finditer,  r'var flashvars_|"name": "|token *?= "|n class="usernameBadgesWrapper|data-event="Video Underplayer"|'
+                                                                 r'js-favoriteBtn|class="views"|class="votes|data-label="[Tt]ag"|"uploadDate": "|'
+                                                                 r'data-label="Category"|data-mxptype="Pornstar"'                              ) # Find the video page fields in a single scan (no groups, to keep it fast)
+    page_flash               = comp(                p.match,     r'var flashvars_\d+ = ({.*});\n'                                            ) # Match flash data on a video page
+    page_title               = comp(                p.match,     r'"name": "([^"]+)'                                                           ) # Match a video page title
+    page_token               = comp(                p.match,     r'token *?= \"(.*?)\",'                                                       ) # Match a video page token
+    page_model               = comp(                p.match,     r'n class=\"usernameBadgesWrapper.*? href=\"(.*?)\"  class=\"bolded\">(.*?)<' ) # Match a video author, if model
+    page_channel             = comp(                p.match,     r'data-event=\"Video Underplayer\".*?bolded\">(.*?)<'                         ) # Match a video author, if channel (URL precedes)
+    page_favorite            = comp(                p.match,     r'js-favoriteBtn[^"]*?active\"'                                               ) # Match an active favorite button
+    page_views               = comp(                p.match,     r'class=\"views\"><span class=\"count\">([^<]*)<'                             ) # Match video views
+    page_votes               = comp(                p.match,     r'class=\"votes(Up|Down)\"[^>]*?data-rating=\"(\d+)\"'                       ) # Match video up or down votes
+    page_tag                 = comp(                p.match,     r'data-label=\"[Tt]ag\"[^>]*>\s*([^<]+?)\s*<'                               ) # Match a video tag
+    page_date                = comp(                p.match,     r'"uploadDate": "([^"]+)'                                                     ) # Match a video upload date
+    page_category            = comp(                p.match,     r'data-label=\"Category\"[^>]*>\s*([^<]+?)\s*<'                              ) # Match a video category
+    page_pornstar            = comp(                p.match,     r'data-mxptype=\"Pornstar\" data-mxptext=\"([^\"]+)\"[^>]*?href=\"([^\"]+)\"'    ) # Match a video pornstar (name and URL)
     get_videos               = comp( engine.DOTALL, p.findall,   r'<li.*?videoblock(.*?)</li'                                                  ) # Get all videos
     get_markers              = comp( engine.DOTALL, p.findall,   r'class=\"(.*?)\"'                                                            ) # Get markers identifiers    
     get_urls                 = comp(                p.findall,   r'https:\/\/.*?(?:\s|$)'                                                      ) # Get all URLs in a raw string
@@ -262,7 +276,6 @@ class re:
     is_video_url             = comp(                p.fullmatch, _raw_root + r'view_video\.php\?viewkey=(?:ph)?[a-z\d]{3,}(&pkey=\d+)?'        ) # Check if a video URL is valid
     is_quality               = comp(                p.fullmatch, r'\d+p?'                                                                      ) # Check if is a video quality
     is_playlist              = comp(                p.fullmatch, r'^https?:\/\/(?:www\.)?(?:[a-z]{2}\.)?pornhub\.[a-z]{2,3}\/playlist\/\d+$'   )  # Checks if it's a playlist
-    fixed_title = find(engine.DOTALL, r'(?<="name": ")[^"]+')
 
 # Attach regex names representation to their wrapper for error display purposes
 _REGEXES_NAMES = {v.__doc__: k for k, v in vars(re).items() if v.__doc__}
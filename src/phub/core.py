@@ -2,22 +2,40 @@
 PHUB core module.
 '''
 
+import os
 import time
+import asyncio
 import logging
 import random
+import itertools
+import threading
 
 import httpx
-from typing import Iterable, Union
+from typing import Any, Callable, Hashable, Iterable, Iterator, AsyncIterator, Literal, Union
 from functools import cached_property
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 from . import utils
 from . import consts
 from . import errors
 from . import literals
 
-from .modules import parser
+from .modules import trace
+from .modules.limiter import RateLimiter
+from .modules.retry import RetryPolicy, get_policies
+from .modules.transport import TransportProfile, get_profile
+from .modules.cache import ResponseCache
+from .modules.middleware import Middleware, Call, URLMiddleware, MetricsMiddleware, defaults as default_middlewares
+from .modules.flight import FlightGroup
+from .modules.stream import Stream, AsyncStream
+from .modules.metrics import Metrics, endpoint
+from .modules.cassette import Cassette
+from .modules.session import SessionStore
+from .modules.identity import IdentityMap
+from .modules.store import MetadataStore
 
-from .objects import (Video, User,
+from .objects import (Video, VideoRecord, User, Lookup,
                       Account, Query, queries, Playlist)
 
 logger = logging.getLogger(__name__)
@@ -29,6 +47,8 @@ class Client:
     with Pornhub.
     '''
     
+    is_async: bool = False
+    
     def __init__(self,
                  email: str = None,
                  password: str = None,
@@ -36,10 +56,23 @@ class Client:
                  language: literals.language = 'en',
                  delay: Union[int, float] = 0,
                  proxies: dict = None,
-                 login: bool = True,
+                 login: Union[bool, Literal['lazy']] = True,
                  bypass_geo_blocking: bool = False,
                  change_title_language: bool = True,
-                 use_webmaster_api: bool = True) -> None:
+                 use_webmaster_api: bool = True,
+                 limiter: RateLimiter = None,
+                 retry: Union[RetryPolicy, dict[literals.url_kind, RetryPolicy]] = None,
+                 transport: Union[TransportProfile, str] = None,
+                 cache: Union[ResponseCache, str, os.PathLike] = None,
+                 middlewares: list[Middleware] = None,
+                 coalesce: bool = True,
+                 metrics: Metrics = None,
+                 cassette: Union[Cassette, str, os.PathLike] = None,
+                 session_store: Union[SessionStore, str, os.PathLike] = None,
+                 compact: bool = False,
+                 identity_map: bool = False,
+                 store: Union[MetadataStore, str, os.PathLike] = None,
+                 freshness: dict[str, Union[float, None]] = None) -> None:
         '''
         Initialises a new client.
         
@@ -49,10 +82,23 @@ class Client:
             language (str): Client language (fr, en, ru, etc.)
             delay (int | float): Minimum delay between requests.
             proxies (dict): Dictionary of proxies for the requests.
-            login (bool): Whether to directly log in after initialization.
+            login (bool | str): Whether to directly log in after initialization, or 'lazy' to log in on the first account-bound use.
             bypass_geo_blocking (bool): Whether to bypass geo-blocking.
             change_title_language (bool): Whether to change title language into your language based on the input URL
             use_webmaster_api (bool): Whether to use the webmaster API or HTML content extraction
+            limiter (RateLimiter): Custom request pacing. Overrides ``delay``.
+            retry (RetryPolicy | dict): Retry policy for all calls, or per traffic class (page, api, media).
+            transport (TransportProfile | str): Connection pools settings, or a preset name (crawl, download).
+            cache (ResponseCache | PathLike): Persistent cache for GET responses, or its database path.
+            middlewares (list[Middleware]): Middlewares to add after the default ones (before metrics).
+            coalesce (bool): Whether concurrent identical GET calls share a single request.
+            metrics (Metrics): Registry to record request metrics in. Can be shared between clients.
+            cassette (Cassette | PathLike): Record and replay responses from a cassette, or its path (auto mode).
+            session_store (SessionStore | PathLike): Save the login session and restore it on the next run, or its path.
+            compact (bool): Whether video queries yield compact VideoRecord objects and drop their pages, for large crawls.
+            identity_map (bool): Whether the same viewkey (or user URL) always yields the same object, shared across queries.
+            store (MetadataStore | PathLike): Persistent store for video data, or its database path.
+            freshness (dict): Time to live of video fields in seconds, used by :meth:`Video.revalidate`.
         Raises:
             LoginFailed: If Pornhub refuses the authentification.
                 The reason will be passed as the error body.
@@ -65,6 +111,8 @@ class Client:
         self.change_title_language = change_title_language
         self.bypass_geo_blocking = bypass_geo_blocking
         self.use_webmaster_api = use_webmaster_api
+        self.transport = get_profile(transport)
+        self.cassette = cassette if cassette is None or isinstance(cassette, Cassette) else Cassette(cassette)
 
         self.reset()
 
@@ -74,16 +122,37 @@ class Client:
                             'password': password}
         
         self.delay = delay
-        self.start_delay = False
-        self.last_request_time = None
+        if limiter: self.limiter = limiter
+        self.retry = get_policies(retry)
+        self.cache = cache if cache is None or isinstance(cache, ResponseCache) else ResponseCache(cache)
+        self.metrics = metrics or Metrics()
+        
+        self.middlewares = default_middlewares(self.cache)
+        for middleware in middlewares or []:
+            self.use(middleware)
+        
+        self.coalesce = coalesce
+        self.flights = FlightGroup()
+        self.compact = compact
+        self.identities = IdentityMap() if identity_map else None
+        self.store = store if store is None or isinstance(store, MetadataStore) else MetadataStore(store)
+        self.freshness = freshness or {}
         
         # Connect account
         self.logged = False
         self.account = Account(self)
         logger.debug('Connected account to client %s', self.account)
         
+        self.session_store = session_store if session_store is None or isinstance(session_store, SessionStore) \
+                             else SessionStore(session_store)
+        self.stored_session = None
+        self.restored = False # Whether the session was restored and not validated yet
+        
+        self.lazy_login = login == 'lazy'
+        self._login_lock = threading.Lock()
+        
         # Automatic login
-        if login and self.account:
+        if login and self.account and not self._restore_session() and not self.lazy_login:
             self.login()
     
     def reset(self) -> None:
@@ -94,11 +163,11 @@ class Client:
         '''
 
         # Initialise session
-        self.session = httpx.Client(
-            headers = consts.HEADERS,
-            cookies = consts.COOKIES,
-            follow_redirects = True
-        )
+        self.session = self._create_session()
+        
+        # Media hosts may use their own connection pool
+        self.media_session = self._create_session('media') \
+                             if self.transport.separate_media else None
         
         self._clear_granted_token()
 
@@ -114,6 +183,210 @@ class Client:
             self.session.headers.update({"CF-IPCountry": f"{language_code}"})
             logging.debug(f"Using faked headers for geo-bypass: {self.session.headers}")
 
+    @property
+    def delay(self) -> Union[int, float]:
+        '''
+        Minimum delay between requests.
+        Setting it replaces the client limiter.
+        '''
+        
+        return self._delay
+    
+    @delay.setter
+    def delay(self, value: Union[int, float]) -> None:
+        
+        self._delay = value
+        self.limiter = RateLimiter.from_delay(value)
+
+    def _create_session(self, kind: literals.url_kind = 'page') -> httpx.Client:
+        '''
+        Build a new HTTP session.
+        
+        Args:
+            kind (str): The traffic class the session is used for.
+        
+        Returns:
+            httpx.Client: The session used to send requests.
+        '''
+        
+        args = self.transport.session_args(kind)
+        
+        if self.cassette:
+            args['transport'] = self.cassette.transport(httpx.HTTPTransport(**args))
+        
+        return httpx.Client(
+            headers = consts.HEADERS,
+            cookies = consts.COOKIES,
+            follow_redirects = True,
+            **args
+        )
+
+    def _get_session(self, kind: literals.url_kind) -> httpx.Client:
+        '''
+        Get the session of a traffic class.
+        
+        Args:
+            kind (str): The request traffic class.
+        
+        Returns:
+            httpx.Client: The session to send the request with.
+        '''
+        
+        if kind == 'media' and self.media_session is not None:
+            return self.media_session
+        
+        return self.session
+
+    def prewarm(self, url: str, connections: int = None) -> None:
+        '''
+        Open keep-alive connections to a host before sending
+        a burst of requests to it (e.g. segments of a download).
+        
+        Args:
+            url (str): A URL on the host to warm up.
+            connections (int): Amount of connections to open. Defaults to the transport profile one.
+        '''
+        
+        connections = connections or self.transport.prewarm
+        if not connections: return
+        
+        kind = utils.url_kind(url)
+        session = self._get_session(kind)
+        logger.info('Opening %s connections to %s', connections, url)
+        
+        def warm(_) -> None:
+            try:
+                self.limiter.acquire(kind)
+                sent = time.perf_counter()
+                response = session.head(url, timeout = consts.CALL_TIMEOUT)
+                
+                self.metrics.observe('request_seconds', time.perf_counter() - sent, endpoint = 'head')
+                self.metrics.inc('requests_total', endpoint = 'head', status = response.status_code)
+            
+            except httpx.HTTPError as err:
+                logger.debug('Failed to warm connection: %s', err)
+                self.metrics.inc('errors_total', endpoint = 'head')
+        
+        with ThreadPoolExecutor(max_workers = connections) as pool:
+            list(pool.map(warm, range(connections)))
+
+    def use(self, middleware: Middleware, index: int = None) -> None:
+        '''
+        Add a middleware to the client chain.
+        
+        Args:
+            middleware (Middleware): The middleware.
+            index (int): Its position in the chain. By default, it is
+                         added last, right before the metrics middleware
+                         (which must stay last to only measure network attempts).
+        '''
+        
+        if index is None:
+            index = len(self.middlewares)
+            
+            if self.middlewares and isinstance(self.middlewares[-1], MetricsMiddleware):
+                index -= 1
+        
+        self.middlewares.insert(index, middleware)
+        logger.debug('Using middleware %s', middleware)
+
+    def _retry_wait(self,
+                    policy: RetryPolicy,
+                    attempt: int,
+                    started: float,
+                    silent: bool,
+                    error: Exception = None,
+                    response: httpx.Response = None) -> Union[float, None]:
+        '''
+        Decide whether a call attempt must be retried.
+        
+        Args:
+            policy (RetryPolicy): The call retry policy.
+            attempt (int): The index of the attempt.
+            started (float): Monotonic time at which the call started.
+            silent (bool): Whether to supress this call from logs.
+            error (Exception): The error raised by the attempt, if any.
+            response (httpx.Response): The attempt response, if any.
+        
+        Returns:
+            float: Delay before the next attempt, or None if the response can be returned.
+        
+        Raises:
+            Exception: The attempt error, if it can't be solved by retrying.
+            ConnectionError: If the call failed too many times.
+        '''
+        
+        if error is None and response.status_code not in policy.statuses:
+            return None
+        
+        wait = policy.wait(attempt, started, error, response,
+                           delay = getattr(error, 'delay', None))
+        
+        if wait is None:
+            # Let the caller handle the failed response
+            if error is None:
+                return None
+            
+            if isinstance(error, httpx.HTTPStatusError) or not policy.is_retryable(error):
+                raise error
+            
+            raise ConnectionError(f'Call failed after {attempt + 1} attempts. Aborting.') from error
+        
+        reason = repr(error) if error else f'status {response.status_code}'
+        logger.log(logging.DEBUG if silent else logging.WARNING,
+                   f'Call failed: {reason}. Retrying in {wait:.2f}s (attempt {attempt + 1}/{policy.attempts})')
+        
+        return wait
+
+    def _send(self, call: Call) -> httpx.Response:
+        '''
+        Send a single call attempt through the middleware chain.
+        
+        Args:
+            call (Call): The call.
+        
+        Returns:
+            httpx.Response: The response.
+        '''
+        
+        entered = []
+        response = None
+        
+        try:
+            for middleware in self.middlewares:
+                entered.append(middleware)
+                
+                if (response := middleware.before_request(self, call)) is not None:
+                    break
+            
+            else:
+                session = self._get_session(call.kind)
+                request = session.build_request(
+                    method = call.method,
+                    url = call.url,
+                    headers = call.headers,
+                    data = call.data,
+                    timeout = call.timeout
+                )
+                
+                response = session.send(request, stream = call.stream)
+            
+            for middleware in reversed(entered):
+                response = middleware.after_response(self, call, response)
+            
+            return response
+        
+        except Exception as err:
+            if call.stream and response is not None:
+                response.close()
+            
+            for middleware in reversed(entered):
+                if (response := middleware.on_error(self, call, err)) is not None:
+                    logger.info('Middleware %s recovered from %s', middleware, repr(err))
+                    return response
+            
+            raise
+
     def call(self,
              func: str,
              method: str = 'GET',
@@ -121,7 +394,10 @@ class Client:
              headers: dict = None,
              timeout: float = consts.CALL_TIMEOUT,
              throw: bool = True,
-             silent: bool = False) -> httpx.Response:
+             silent: bool = False,
+             retry: RetryPolicy = None,
+             cache: bool = True,
+             coalesce: bool = True) -> httpx.Response:
         '''
         Used internally to send a request or an API call.
 
@@ -133,6 +409,9 @@ class Client:
             timeout (float): Request maximum response time.
             throw (bool): Whether to raise an error when a request explicitly fails.
             silent (bool): Whether to supress this call from logs.
+            retry (RetryPolicy): Override the client retry policy for this call.
+            cache (bool): Whether the response can be served from and saved to the client cache.
+            coalesce (bool): Whether to share the response of an identical call in progress.
 
         Returns:
             Response: The fetched response.
@@ -141,64 +420,125 @@ class Client:
             ConnectionError: If the request was blocked by Pornhub.
             HTTPError: If the request failed, for any reason.
         '''
-        func = utils.fix_url(func)
+        
         logger.log(logging.DEBUG if silent else logging.INFO, 'Fetching %s', func or '/')
+        
+        call = Call(func, method, data, headers, timeout, throw, silent, cache, retry)
+        
+        with trace.span('client.call', url = func, method = method) as current:
+            
+            if coalesce and (key := self._flight_key(call)):
+                response = self.flights.do(key, lambda: self._call(call))
+            
+            else:
+                response = self._call(call)
+            
+            if current: current.set(status = response.status_code, attempts = call.attempt + 1)
+            return response
 
-        # Delay mechanism
-        if self.last_request_time:
-            elapsed_time = time.time() - self.last_request_time
-            if elapsed_time < self.delay:
-                time.sleep(self.delay - elapsed_time)
-
-        self.last_request_time = time.time()  # Update the time of the last request
-
-        if not self.language == "en":
-            host = consts.LANGUAGE_MAPPING.get(self.language)
-            logging.debug(f"Changed PornHub root host to: {host}")
-
-        else:
-            host = consts.HOST
+    def _flight_key(self, call: Call) -> Union[tuple, None]:
+        '''
+        Get the key identical concurrent calls share.
+        
+        Args:
+            call (Call): The call.
+        
+        Returns:
+            tuple: The key, or None if the call can't be coalesced.
+        '''
+        
+        # Only idempotent calls without extra parameters are coalesced
+        if not self.coalesce or call.method not in ('GET', 'HEAD') or call.data or call.headers:
+            return None
+        
+        return (call.method, URLMiddleware.resolve(self, call.url), self.language, call.throw, call.cache)
 
-        url = func if 'http' in func else utils.concat(host, func)
+    def _call(self, call: Call) -> httpx.Response:
+        '''
+        Send a call, retrying failed attempts.
+        
+        Args:
+            call (Call): The call.
+        
+        Returns:
+            httpx.Response: The final response.
+        '''
+        
+        started = time.monotonic()
 
-        for i in range(consts.MAX_CALL_RETRIES):
+        for attempt in itertools.count():
+            call.attempt = attempt
+            error = response = None
+            
             try:
-                response = self.session.request(
-                    method = method,
-                    url = url,
-                    headers = headers,
-                    data = data,
-                    timeout = timeout
-                )
-
-                # Silent 429 errors
-                if b'429</title>' in response.content:
-                    raise ConnectionError('Pornhub raised error 429: too many requests')
-
-                # Attempt to resolve the challenge if needed
-                challenge = consts.re.get_challenge(response.text, False)
-                if challenge:
-                    logger.info('Challenge found, attempting to resolve')
-                    parser.challenge(self, *challenge)
-                    
-                    logger.info(f"Sleeping for {consts.CHALLENGE_TIMEOUT} seconds")
-                    time.sleep(consts.CHALLENGE_TIMEOUT)
-                    continue  # Reload page
-
-                break
+                response = self._send(call)
 
             except Exception as err:
-                logger.log(logging.DEBUG if silent else logging.WARNING,
-                           f'Call failed: {repr(err)}. Retrying (attempt {i + 1}/{consts.MAX_CALL_RETRIES})')
-                time.sleep(consts.MAX_CALL_TIMEOUT)
-                continue
+                error = err
 
-        else:
-            raise ConnectionError(f'Call failed after {i + 1} retries. Aborting.')
+            policy = call.retry or self.retry[call.kind]
+            wait = self._retry_wait(policy, attempt, started, call.silent, error, response)
+            if wait is None: break
+            
+            if call.stream and response is not None:
+                response.close()
+            
+            time.sleep(wait)
 
-        if throw: response.raise_for_status()
         return response
 
+    @contextmanager
+    def stream(self,
+               func: str,
+               method: str = 'GET',
+               data: dict = None,
+               headers: dict = None,
+               timeout: float = consts.CALL_TIMEOUT,
+               throw: bool = True,
+               silent: bool = False,
+               retry: RetryPolicy = None,
+               chunk_size: int = consts.STREAM_CHUNK_SIZE) -> Iterator[Stream]:
+        '''
+        Send a request and stream its response body.
+        The request goes through the middlewares, limiter and retry
+        policy like any call. Once the body is being read, errors
+        are not retried.
+        
+        Args:
+            func (str): URL or PH function to fetch or call.
+            method (str): Request method (GET, POST, PUT, ...).
+            data (dict): Optional data to send to the server.
+            headers (dict): Additional request headers.
+            timeout (float): Request maximum response time.
+            throw (bool): Whether to raise an error when a request explicitly fails.
+            silent (bool): Whether to supress this call from logs.
+            retry (RetryPolicy): Override the client retry policy for this call.
+            chunk_size (int): Size of the body chunks.
+        
+        Returns:
+            Stream: The streamed response.
+        
+        Raises:
+            ConnectionError: If the request was blocked by Pornhub.
+            HTTPError: If the request failed, for any reason.
+        '''
+        
+        logger.log(logging.DEBUG if silent else logging.INFO, 'Streaming %s', func or '/')
+        
+        call = Call(func, method, data, headers, timeout, throw, silent,
+                    cache = False, retry = retry, stream = True)
+        
+        with trace.span('client.stream', url = func, method = method):
+            response = self._call(call)
+        
+        try:
+            yield Stream(response, chunk_size)
+        
+        finally:
+            response.close()
+            self.metrics.inc('bytes_total', response.num_bytes_downloaded,
+                             endpoint = endpoint(call.kind, call.method))
+
     def login(self,
               force: bool = False,
               throw: bool = True) -> bool:
@@ -224,13 +564,68 @@ class Client:
             raise errors.ClientAlreadyLogged()
     
         # Get token
-        page = self.call('').text
-        base_token = consts.re.get_token(page)
+        page = self.call('', cache = False).text
         
         # Send credentials
-        payload = consts.LOGIN_PAYLOAD | self.credentials | {'token': base_token}
+        payload = self._login_payload(page)
         response = self.call('front/authenticate', method = 'POST', data = payload)
         
+        return self._login_result(response, throw)
+    
+    def ensure_login(self) -> bool:
+        '''
+        Log in if the client was set to log in lazily and
+        is not logged yet, and check a restored session on
+        its first use. Concurrent callers wait for a single login.
+        
+        Returns:
+            bool: Whether the client is logged in.
+        
+        Raises:
+            LoginFailed: If the login failed, for a reason passed in the error body.
+        '''
+        
+        self._check_session()
+        
+        if self.logged or not (self.lazy_login and self.account):
+            return self.logged
+        
+        with self._login_lock:
+            if not self.logged:
+                logger.info('Logging in on first account-bound use')
+                self.login()
+        
+        return self.logged
+    
+    def _login_payload(self, page: str) -> dict:
+        '''
+        Build the login request payload.
+        
+        Args:
+            page (str): The home page, containing the base token.
+        
+        Returns:
+            dict: The authentification payload.
+        '''
+        
+        base_token = consts.re.get_token(page)
+        return consts.LOGIN_PAYLOAD | self.credentials | {'token': base_token}
+    
+    def _login_result(self, response: httpx.Response, throw: bool) -> bool:
+        '''
+        Parse the login response and connect the account.
+        
+        Args:
+            response (httpx.Response): The authentification response.
+            throw (bool): Whether to raise an error if this fails.
+        
+        Returns:
+            bool: Whether the login was successful.
+        
+        Raises:
+            LoginFailed: If the login failed, for a reason passed in the error body.
+        '''
+        
         # Parse response
         data = response.json()
         success = int(data.get('success'))
@@ -246,14 +641,80 @@ class Client:
         # Update account data
         self.account.connect(data)
         self.logged = bool(success)
+        self.restored = False
+        
+        if self.session_store and self.logged:
+            self.stored_session = self.session_store.capture(self, data)
+            self.session_store.save(self.stored_session)
+        
         return self.logged
     
-    def get(self, video: Union[str, Video]) -> Video:
+    def _restore_session(self) -> bool:
+        '''
+        Restore the account session saved by a previous client.
+        The session is validated once it is used.
+        
+        Returns:
+            bool: Whether a session was restored.
+        '''
+        
+        if not (self.session_store and self.account):
+            return False
+        
+        session = self.session_store.restore(self)
+        if session is None:
+            return False
+        
+        self.account.connect(session.account)
+        self.stored_session = session
+        self.logged = self.restored = True
+        return True
+    
+    def _check_session(self) -> Union[str, None]:
+        '''
+        Check that a restored session is still valid, once, and
+        log in again if it was revoked.
+        
+        Returns:
+            str: The home page served to the account, or None if there was nothing to check.
+        '''
+        
+        if not self.restored:
+            return None
+        
+        with self._login_lock:
+            if not self.restored:
+                return None
+            
+            page = self.call('', cache = False).text
+            
+            if not self._is_logged_page(page):
+                logger.warning('Restored session is stale, logging in again')
+                self.login(force = True)
+                page = self.call('', cache = False).text
+            
+            self.restored = False
+            return page
+    
+    def _is_logged_page(self, page: str) -> bool:
+        '''
+        Whether a page was served to the logged account.
+        
+        Args:
+            page (str): A Pornhub page.
+        
+        Returns:
+            bool: Whether the page links to the account user.
+        '''
+        
+        return f'/users/{self.account.name}' in page
+    
+    def get(self, video: Union[str, Video, VideoRecord]) -> Video:
         '''
         Get a Pornhub video.
         
         Args:
-            video (str | Video): Video URL or viewkey.
+            video (str | Video | VideoRecord): Video URL, viewkey or object.
         
         Returns:
             Video: The corresponding video object.
@@ -261,7 +722,14 @@ class Client:
         
         logger.debug(f'Fetching video at {video}')
 
-        if isinstance(video, Video):
+        if isinstance(video, VideoRecord):
+            # Records of this client keep their data
+            if video.client is self:
+                return video.video
+            
+            url = video.url
+
+        elif isinstance(video, Video):
             # User might want to re-init a video,
             # or use another client
             url = video.url
@@ -281,8 +749,66 @@ class Client:
             
             url = utils.concat(consts.HOST, 'view_video.php?viewkey=' + key)
         
-        return Video(self, url, change_title_language=self.change_title_language,
-                     use_webmaster_api=self.use_webmaster_api)
+        return self._shared(('video', consts.re.get_viewkey(url, False)),
+                            lambda: Video(self, url, change_title_language=self.change_title_language,
+                                          use_webmaster_api=self.use_webmaster_api))
+
+    def _shared(self, key: tuple[str, Hashable], build: Callable[[], Any]) -> Any:
+        '''
+        Get an object from the identity map, if enabled.
+        
+        Args:
+            key (tuple): The object kind and identifier (e.g. ``('video', viewkey)``).
+            build (Callable): Builds the object if it is not mapped.
+        
+        Returns:
+            Any: The shared object, or a new one.
+        '''
+        
+        if self.identities is None or key[1] is None:
+            return build()
+        
+        return self.identities.get(key, build)
+
+    def get_many(self,
+                 keys: Iterable[Union[str, Video, VideoRecord]],
+                 fields: Iterable[str] = ('data@',),
+                 concurrency: int = 8) -> list[Lookup]:
+        '''
+        Get many videos and fetch their data concurrently.
+        
+        Args:
+            keys (Iterable[str | Video | VideoRecord]): Video URLs, viewkeys or objects.
+            fields (Iterable[str]): Keys to fetch on each video (see :meth:`Video.fetch`).
+            concurrency (int): Maximum amount of videos fetched at once.
+        
+        Returns:
+            list[Lookup]: A lookup for each key, in order. Failed lookups hold their error.
+        '''
+        
+        fields = list(fields)
+        
+        with trace.span('client.get_many', concurrency = concurrency), \
+             ThreadPoolExecutor(max_workers = concurrency) as pool:
+            
+            futures = [pool.submit(trace.propagate(self._lookup), key, fields) for key in keys]
+            return [future.result() for future in futures]
+    
+    def _lookup(self, key: Union[str, Video, VideoRecord], fields: list[str]) -> Lookup:
+        '''
+        Get a single video for :meth:`get_many`.
+        '''
+        
+        try:
+            video = self.get(key)
+            for field in fields:
+                video.fetch(field)
+            
+            return Lookup(key, video)
+        
+        except Exception as err:
+            logger.warning('Lookup of %s failed: %r', key, err)
+            return Lookup(key, error = err)
 
     def get_user(self, user: Union[str, User]) -> User:
         '''
@@ -499,8 +1025,461 @@ class Client:
             AssertionError: If the client is not logged in
         '''
         
-        assert self.logged, 'Client must be logged in'
-        page = self.call('').text
-        return consts.re.get_token(page)
+        # The page checking a restored session also holds a token
+        page = self._check_session()
+        assert self.ensure_login(), 'Client must be logged in'
+        
+        session = self.stored_session
+        if session and (token := self.session_store.token(session)):
+            logger.debug('Using saved granted token (%ss old)', round(session.token_age))
+            return token
+        
+        page = page or self.call('', cache = False).text
+        token = consts.re.get_token(page)
+        
+        if session := self.stored_session:
+            session.token, session.token_time = token, time.time()
+            session.sync(self)
+            self.session_store.save(session)
+        
+        return token
+
+
+class AsyncClient(Client):
+    '''
+    Represents a client capable of handling requests
+    with Pornhub asynchronously, on top of an asyncio
+    event loop.
+    
+    Network bound methods (call, login, get, search, ...)
+    are coroutines. The client should be used as an async
+    context manager so the login (if any) and the session
+    cleanup are awaited properly:
+    
+    .. code-block:: python
+    
+        async with phub.AsyncClient() as client:
+            video = await client.get('xxx')
+            await video.afetch('data@')
+    
+    Account interactions have async variants (e.g.
+    ``await video.alike()``), since they need a granted token.
+    '''
+    
+    is_async: bool = True
+    
+    def __init__(self,
+                 email: str = None,
+                 password: str = None,
+                 *,
+                 login: bool = True,
+                 **kwargs) -> None:
+        '''
+        Initialises a new async client.
+        
+        Args:
+            email (str): Account email address.
+            password (str): Account password.
+            login (bool): Whether to log in when entering the client context.
+            kwargs: Other arguments passed to :class:`Client`.
+        
+        Raises:
+            ValueError: If ``login`` is 'lazy'. Account properties can't await
+                a login, so async clients log in explicitly.
+        '''
+        
+        if login == 'lazy':
+            raise ValueError('AsyncClient does not support lazy login. Log in when entering '
+                             'the client context (login = True) or with `await client.login()`.')
+        
+        super().__init__(email, password, login = False, **kwargs)
+        self.auto_login = login
+        self._login_lock = None # Created in the event loop
+    
+    async def __aenter__(self) -> 'AsyncClient':
+        
+        if self.auto_login and self.account and not self.logged and not self._restore_session():
+            await self.login()
+        
+        return self
+    
+    async def __aexit__(self, *_) -> None:
+        
+        await self.close()
+    
+    async def close(self) -> None:
+        '''
+        Close the client session.
+        '''
+        
+        await self.session.aclose()
+        
+        if self.media_session is not None:
+            await self.media_session.aclose()
+    
+    def _create_session(self, kind: literals.url_kind = 'page') -> httpx.AsyncClient:
+        '''
+        Build a new asynchronous HTTP session.
+        
+        Args:
+            kind (str): The traffic class the session is used for.
+        
+        Returns:
+            httpx.AsyncClient: The session used to send requests.
+        '''
+        
+        args = self.transport.session_args(kind)
+        
+        if self.cassette:
+            args['transport'] = self.cassette.transport(httpx.AsyncHTTPTransport(**args))
+        
+        return httpx.AsyncClient(
+            headers = consts.HEADERS,
+            cookies = consts.COOKIES,
+            follow_redirects = True,
+            **args
+        )
+    
+    async def prewarm(self, url: str, connections: int = None) -> None:
+        '''
+        Open keep-alive connections to a host.
+        See :meth:`Client.prewarm`.
+        '''
+        
+        connections = connections or self.transport.prewarm
+        if not connections: return
+        
+        kind = utils.url_kind(url)
+        session = self._get_session(kind)
+        logger.info('Opening %s connections to %s', connections, url)
+        
+        async def warm() -> None:
+            try:
+                await self.limiter.aacquire(kind)
+                sent = time.perf_counter()
+                response = await session.head(url, timeout = consts.CALL_TIMEOUT)
+                
+                self.metrics.observe('request_seconds', time.perf_counter() - sent, endpoint = 'head')
+                self.metrics.inc('requests_total', endpoint = 'head', status = response.status_code)
+            
+            except httpx.HTTPError as err:
+                logger.debug('Failed to warm connection: %s', err)
+                self.metrics.inc('errors_total', endpoint = 'head')
+        
+        await asyncio.gather(*(warm() for _ in range(connections)))
+    
+    async def _send(self, call: Call) -> httpx.Response:
+        '''
+        Send a single call attempt through the middleware chain.
+        See :meth:`Client._send`.
+        '''
+        
+        entered = []
+        response = None
+        
+        try:
+            for middleware in self.middlewares:
+                entered.append(middleware)
+                
+                if (response := await middleware.abefore_request(self, call)) is not None:
+                    break
+            
+            else:
+                session = self._get_session(call.kind)
+                request = session.build_request(
+                    method = call.method,
+                    url = call.url,
+                    headers = call.headers,
+                    data = call.data,
+                    timeout = call.timeout
+                )
+                
+                response = await session.send(request, stream = call.stream)
+            
+            for middleware in reversed(entered):
+                response = await middleware.aafter_response(self, call, response)
+            
+            return response
+        
+        except Exception as err:
+            if call.stream and response is not None:
+                await response.aclose()
+            
+            for middleware in reversed(entered):
+                if (response := await middleware.aon_error(self, call, err)) is not None:
+                    logger.info('Middleware %s recovered from %s', middleware, repr(err))
+                    return response
+            
+            raise
+    
+    async def call(self,
+                   func: str,
+                   method: str = 'GET',
+                   data: dict = None,
+                   headers: dict = None,
+                   timeout: float = consts.CALL_TIMEOUT,
+                   throw: bool = True,
+                   silent: bool = False,
+                   retry: RetryPolicy = None,
+                   cache: bool = True,
+                   coalesce: bool = True) -> httpx.Response:
+        '''
+        Used internally to send a request or an API call.
+        See :meth:`Client.call`.
+        '''
+        
+        logger.log(logging.DEBUG if silent else logging.INFO, 'Fetching %s', func or '/')
+        
+        call = Call(func, method, data, headers, timeout, throw, silent, cache, retry)
+        
+        with trace.span('client.call', url = func, method = method) as current:
+            
+            if coalesce and (key := self._flight_key(call)):
+                response = await self.flights.ado(key, lambda: self._call(call))
+            
+            else:
+                response = await self._call(call)
+            
+            if current: current.set(status = response.status_code, attempts = call.attempt + 1)
+            return response
+    
+    async def _call(self, call: Call) -> httpx.Response:
+        '''
+        Send a call, retrying failed attempts.
+        See :meth:`Client._call`.
+        '''
+        
+        started = time.monotonic()
+        
+        for attempt in itertools.count():
+            call.attempt = attempt
+            error = response = None
+            
+            try:
+                response = await self._send(call)
+            
+            except Exception as err:
+                error = err
+            
+            policy = call.retry or self.retry[call.kind]
+            wait = self._retry_wait(policy, attempt, started, call.silent, error, response)
+            if wait is None: break
+            
+            if call.stream and response is not None:
+                await response.aclose()
+            
+            await asyncio.sleep(wait)
+        
+        return response
+    
+    @asynccontextmanager
+    async def stream(self,
+                     func: str,
+                     method: str = 'GET',
+                     data: dict = None,
+                     headers: dict = None,
+                     timeout: float = consts.CALL_TIMEOUT,
+                     throw: bool = True,
+                     silent: bool = False,
+                     retry: RetryPolicy = None,
+                     chunk_size: int = consts.STREAM_CHUNK_SIZE) -> AsyncIterator[AsyncStream]:
+        '''
+        Send a request and stream its response body.
+        See :meth:`Client.stream`.
+        '''
+        
+        logger.log(logging.DEBUG if silent else logging.INFO, 'Streaming %s', func or '/')
+        
+        call = Call(func, method, data, headers, timeout, throw, silent,
+                    cache = False, retry = retry, stream = True)
+        
+        with trace.span('client.stream', url = func, method = method):
+            response = await self._call(call)
+        
+        try:
+            yield AsyncStream(response, chunk_size)
+        
+        finally:
+            await response.aclose()
+            self.metrics.inc('bytes_total', response.num_bytes_downloaded,
+                             endpoint = endpoint(call.kind, call.method))
+    
+    async def login(self,
+                    force: bool = False,
+                    throw: bool = True) -> bool:
+        '''
+        Attempt to log in.
+        See :meth:`Client.login`.
+        '''
+        
+        logger.debug('Attempting login')
+        
+        if not force and self.logged:
+            logger.error('Client is already logged in')
+            raise errors.ClientAlreadyLogged()
+        
+        page = (await self.call('', cache = False)).text
+        
+        payload = self._login_payload(page)
+        response = await self.call('front/authenticate', method = 'POST', data = payload)
+        
+        return self._login_result(response, throw)
+    
+    async def ensure_login(self) -> bool:
+        '''
+        Check a restored session on its first use. Async
+        clients don't log in lazily.
+        See :meth:`Client.ensure_login`.
+        
+        Returns:
+            bool: Whether the client is logged in.
+        '''
+        
+        await self._check_session()
+        return self.logged
+    
+    async def _check_session(self) -> Union[str, None]:
+        '''
+        Check that a restored session is still valid, once.
+        See :meth:`Client._check_session`.
+        '''
+        
+        if not self.restored:
+            return None
+        
+        self._login_lock = self._login_lock or asyncio.Lock()
+        
+        async with self._login_lock:
+            if not self.restored:
+                return None
+            
+            page = (await self.call('', cache = False)).text
+            
+            if not self._is_logged_page(page):
+                logger.warning('Restored session is stale, logging in again')
+                await self.login(force = True)
+                page = (await self.call('', cache = False)).text
+            
+            self.restored = False
+            return page
+    
+    async def get(self, video: Union[str, Video, VideoRecord]) -> Video:
+        '''
+        Get a Pornhub video.
+        See :meth:`Client.get`.
+        
+        If the client does not use the webmaster API,
+        the video page is fetched before returning.
+        '''
+        
+        obj = super().get(video)
+        
+        if obj.use_webmaster_api is False:
+            await obj.afetch('page@')
+        
+        return obj
+    
+    async def get_many(self,
+                       keys: Iterable[Union[str, Video, VideoRecord]],
+                       fields: Iterable[str] = ('data@',),
+                       concurrency: int = 8) -> list[Lookup]:
+        '''
+        Get many videos and fetch their data concurrently.
+        See :meth:`Client.get_many`.
+        '''
+        
+        fields = list(fields)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def lookup(key: Union[str, Video, VideoRecord]) -> Lookup:
+            async with semaphore:
+                try:
+                    video = await self.get(key)
+                    for field in fields:
+                        await video.afetch(field)
+                    
+                    return Lookup(key, video)
+                
+                except Exception as err:
+                    logger.warning('Lookup of %s failed: %r', key, err)
+                    return Lookup(key, error = err)
+        
+        with trace.span('client.get_many', concurrency = concurrency):
+            return list(await asyncio.gather(*map(lookup, keys)))
+    
+    async def search(self, query: str, **kwargs) -> Query:
+        '''
+        Performs searching on Pornhub.
+        See :meth:`Client.search`.
+        
+        The returned query supports ``async for`` iteration.
+        '''
+        
+        return super().search(query, **kwargs)
+    
+    async def search_hubtraffic(self, query: str, **kwargs) -> Query:
+        '''
+        Perform searching on Pornhub using the HubTraffic API.
+        See :meth:`Client.search_hubtraffic`.
+        
+        The returned query supports ``async for`` iteration.
+        '''
+        
+        return super().search_hubtraffic(query, **kwargs)
+    
+    def _clear_granted_token(self) -> None:
+        '''
+        Removes the current granted token stored, if any.
+        '''
+        
+        self._token = None
+    
+    @property
+    def _granted_token(self) -> str:
+        '''
+        The granted token of the account, once fetched with
+        :meth:`_agranted_token`. Account interactions of async
+        clients (e.g. :meth:`Video.alike`) await it first.
+        
+        Raises:
+            RuntimeError: If the token was not fetched yet.
+        '''
+        
+        if self._token is None:
+            raise RuntimeError('Granted token is not fetched. Use the async account '
+                               'methods (e.g. `await video.alike()`) with async clients.')
+        
+        return self._token
+    
+    async def _agranted_token(self) -> str:
+        '''
+        Get a granted token for the account.
+        See :meth:`Client._granted_token`.
+        
+        Raises:
+            AssertionError: If the client is not logged in
+        '''
+        
+        if self._token is not None:
+            return self._token
+        
+        page = await self._check_session()
+        assert await self.ensure_login(), 'Client must be logged in'
+        
+        session = self.stored_session
+        if session and (token := self.session_store.token(session)):
+            logger.debug('Using saved granted token (%ss old)', round(session.token_age))
+            self._token = token
+            return token
+        
+        page = page or (await self.call('', cache = False)).text
+        self._token = consts.re.get_token(page)
+        
+        if session := self.stored_session:
+            session.token, session.token_time = self._token, time.time()
+            session.sync(self)
+            self.session_store.save(session)
+        
+        return self._token
 
 # EOF
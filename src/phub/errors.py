@@ -60,6 +60,40 @@ class VideoError(Exception):
     is not available).
     '''
 
+class TooManyRequests(ConnectionError):
+    '''
+    Pornhub rate limited the client (error 429).
+    
+    Note: You can use: attr:`Client.limiter` to slow down requests.
+    '''
+    
+    def __init__(self, *args, response: object = None) -> None:
+        
+        super().__init__(*args)
+        self.response = response
+
+class RetryRequested(ConnectionError):
+    '''
+    A middleware asked for the call to be retried
+    (e.g. after resolving a challenge).
+    '''
+    
+    def __init__(self, *args, delay: float = None) -> None:
+        
+        super().__init__(*args)
+        self.delay = delay
+
+class CassetteMiss(LookupError):
+    '''
+    A request is not recorded in a replay-only cassette.
+    '''
+
+class SessionError(ValueError):
+    '''
+    A saved session file is unreadable or was written
+    by an incompatible version.
+    '''
+
 class RegionBlocked(Exception):
     """
     Sometimes videos can be blocked in your region.
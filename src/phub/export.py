@@ -0,0 +1,252 @@
+'''
+PHUB video exports.
+
+Videos are streamed to JSON lines, CSV or Parquet files
+with a fixed schema, in constant memory.
+'''
+
+from __future__ import annotations
+
+import os
+import csv
+import json
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple, Union
+
+from . import errors
+from . import literals
+from .modules import trace
+
+if TYPE_CHECKING:
+    from .objects import Video
+
+logger = logging.getLogger(__name__)
+
+
+class Column(NamedTuple):
+    '''
+    Represents an exported column.
+    '''
+
+    type: str # str, int, float, bool, list[str] or list[int]
+    field: str # The video field it reads (see objects.video.FIELDS)
+    get: Callable[[Video], Any]
+
+def _pornstars(video: Video) -> list[str]:
+    '''
+    Get the pornstar names of a video, without looking users up.
+    '''
+
+    if video.page and video.page.pornstars:
+        return [name for _, name in video.page.pornstars]
+
+    return [ps['pornstar_name'] for ps in video.fetch('data@pornstars') or ()]
+
+SCHEMA: dict[str, Column] = {
+    'key':         Column('str',       'key',         lambda video: video.key),
+    'url':         Column('str',       'url',         lambda video: video.url),
+    'title':       Column('str',       'title',       lambda video: video.title),
+    'image':       Column('str',       'image',       lambda video: video.image.url),
+    'duration':    Column('int',       'duration',    lambda video: int(video.duration.total_seconds())),
+    'views':       Column('int',       'views',       lambda video: video.views),
+    'likes':       Column('int',       'likes',       lambda video: video.likes.up),
+    'dislikes':    Column('int',       'likes',       lambda video: video.likes.down),
+    'rating':      Column('float',     'likes',       lambda video: video.likes.ratings),
+    'date':        Column('str',       'date',        lambda video: video.date.isoformat()),
+    'tags':        Column('list[str]', 'tags',        lambda video: [tag.name for tag in video.tags]),
+    'categories':  Column('list[str]', 'categories',  lambda video: list(video.categories)),
+    'pornstars':   Column('list[str]', 'pornstars',   _pornstars),
+    'author':      Column('str',       'author',      lambda video: video.author.name),
+    'orientation': Column('str',       'orientation', lambda video: video.orientation),
+    'hotspots':    Column('list[int]', 'hotspots',    lambda video: list(video.hotspots)),
+    'is_vertical': Column('bool',      'is_vertical', lambda video: video.is_vertical),
+    'is_HD':       Column('bool',      'is_HD',       lambda video: video.is_HD),
+    'is_VR':       Column('bool',      'is_VR',       lambda video: video.is_VR)
+}
+
+DEFAULT_FIELDS = ['key', 'title', 'duration', 'views', 'likes', 'dislikes', 'date', 'tags']
+
+def _row(video: Video, fields: list[str], planned: list[str]) -> Union[dict, None]:
+    '''
+    Fetch and build the row of a video.
+
+    Args:
+        video (Video): The video.
+        fields (list[str]): The exported columns.
+        planned (list[str]): The video fields they read.
+
+    Returns:
+        dict: The row, or None if the video is unavailable.
+    '''
+
+    # Compact records are served by their full video
+    video = getattr(video, 'video', video)
+
+    try:
+        video.prefetch(planned, users = False)
+        return {field: SCHEMA[field].get(video) for field in fields}
+
+    except (errors.VideoError, errors.RegionBlocked) as err:
+        logger.warning('Skipping unavailable video %s: %s', video, err)
+
+def rows(videos: Iterable[Video],
+         fields: list[str] = None,
+         concurrency: int = 4) -> Iterator[dict]:
+    '''
+    Iterate rows of videos, in order. Each video fetches only what its
+    columns need, and up to ``concurrency`` videos are fetched at once.
+    Unavailable videos are skipped.
+
+    Args:
+        videos (Iterable[Video]): The videos (e.g. a query).
+        fields (list[str]): The columns (see :data:`SCHEMA`).
+        concurrency (int): Maximum amount of videos fetched at once.
+
+    Returns:
+        Iterator[dict]: The rows.
+    '''
+
+    fields = list(fields or DEFAULT_FIELDS)
+
+    if unknown := [field for field in fields if field not in SCHEMA]:
+        raise ValueError(f'Unknown export fields: {unknown}')
+
+    planned = list(dict.fromkeys(SCHEMA[field].field for field in fields))
+    return _stream(videos, fields, planned, concurrency)
+
+def _stream(videos: Iterable[Video], fields: list[str], planned: list[str], concurrency: int) -> Iterator[dict]:
+    '''
+    Generate the rows of :func:`rows`.
+    '''
+
+    # Keep a bounded window of videos in flight
+    with ThreadPoolExecutor(max_workers = concurrency) as pool:
+        window = deque()
+
+        for video in videos:
+            window.append(pool.submit(trace.propagate(_row), video, fields, planned))
+
+            if len(window) >= concurrency:
+                if (row := window.popleft().result()) is not None:
+                    yield row
+
+        while window:
+            if (row := window.popleft().result()) is not None:
+                yield row
+
+def _write_jsonl(rows: Iterator[dict], path: str, fields: list[str], batch_size: int) -> int:
+    '''
+    Write rows as JSON lines.
+    '''
+
+    count = 0
+    with open(path, 'w', encoding = 'utf-8') as file:
+        for row in rows:
+            file.write(json.dumps(row, ensure_ascii = False) + '\n')
+            count += 1
+
+    return count
+
+def _write_csv(rows: Iterator[dict], path: str, fields: list[str], batch_size: int) -> int:
+    '''
+    Write rows as CSV.
+    '''
+
+    # Lists are JSON encoded
+    lists = [field for field in fields if SCHEMA[field].type.startswith('list')]
+
+    count = 0
+    with open(path, 'w', encoding = 'utf-8', newline = '') as file:
+        writer = csv.DictWriter(file, fields)
+        writer.writeheader()
+
+        for row in rows:
+            writer.writerow(row | {field: json.dumps(row[field], ensure_ascii = False) for field in lists})
+            count += 1
+
+    return count
+
+def _write_parquet(rows: Iterator[dict], path: str, fields: list[str], batch_size: int) -> int:
+    '''
+    Write rows to Parquet, one row group per batch.
+    '''
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    except ImportError as err:
+        raise ImportError('Parquet exports require the pyarrow package') from err
+
+    types = {'str': pa.string(), 'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(),
+             'list[str]': pa.list_(pa.string()), 'list[int]': pa.list_(pa.int64())}
+
+    schema = pa.schema([(field, types[SCHEMA[field].type]) for field in fields])
+
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+
+        for row in rows:
+            batch.append(row)
+
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema = schema))
+                count += len(batch)
+                batch.clear()
+
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema = schema))
+            count += len(batch)
+
+    return count
+
+WRITERS: dict[literals.export_format, Callable] = {
+    'jsonl': _write_jsonl,
+    'csv': _write_csv,
+    'parquet': _write_parquet
+}
+
+def write(videos: Iterable[Video],
+          path: Union[str, os.PathLike],
+          format: literals.export_format = None,
+          fields: list[str] = None,
+          concurrency: int = 4,
+          batch_size: int = 1024) -> int:
+    '''
+    Export videos to a file.
+
+    Args:
+        videos (Iterable[Video]): The videos (e.g. a query).
+        path (PathLike): The file path.
+        format (str): The file format (jsonl, csv or parquet). Guessed from the path extension by default.
+        fields (list[str]): The columns (see :data:`SCHEMA`).
+        concurrency (int): Maximum amount of videos fetched at once.
+        batch_size (int): Amount of rows per Parquet row group.
+
+    Returns:
+        int: The amount of exported videos.
+
+    Raises:
+        ValueError: If the format or a field is unknown.
+        ImportError: If exporting to Parquet without pyarrow.
+    '''
+
+    path = os.fspath(path)
+    format = format or os.path.splitext(path)[1].lstrip('.').lower()
+
+    if format not in WRITERS:
+        raise ValueError(f'Unknown export format: {format!r}')
+
+    fields = list(fields or DEFAULT_FIELDS)
+    stream = rows(videos, fields, concurrency)
+
+    with trace.span('export.write', format = format, fields = ','.join(fields)):
+        count = WRITERS[format](stream, path, fields, batch_size)
+
+    logger.info('Exported %s videos to %s', count, path)
+    return count
+
+# EOF
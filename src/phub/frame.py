@@ -0,0 +1,640 @@
+'''
+PHUB video frames.
+
+Columnar, in-memory tables of video statistics, for vectorized
+filtering, ranking and grouping (requires numpy).
+'''
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Union
+
+from . import export
+
+if TYPE_CHECKING:
+    import numpy
+    from .objects import Video, Query
+    from .modules.store import MetadataStore
+
+logger = logging.getLogger(__name__)
+
+# Scalar columns and their dtypes. Missing integers are -1,
+# missing ratings NaN and missing dates NaT.
+SCALARS: dict[str, str] = {
+    'key':      'object',
+    'views':    'int64',
+    'duration': 'int64',
+    'likes':    'int64',
+    'dislikes': 'int64',
+    'rating':   'float64',
+    'date':     'datetime64[s]'
+}
+
+# Columns holding a list of labels per video
+LISTS = ('tags', 'categories')
+
+COLUMNS = list(SCALARS) + list(LISTS)
+
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+
+_MISSING = {'int64': -1, 'float64': float('nan'), 'datetime64[s]': 'NaT', 'object': None}
+
+def _numpy():
+    '''
+    Import numpy.
+    '''
+
+    try:
+        import numpy
+
+    except ImportError as err:
+        raise ImportError('VideoFrame requires the numpy package') from err
+
+    return numpy
+
+
+class Labels:
+    '''
+    A column of label lists (e.g. tags), stored as codes
+    into a vocabulary and offsets of each row.
+    '''
+
+    def __init__(self, vocabulary: numpy.ndarray, codes: numpy.ndarray, offsets: numpy.ndarray) -> None:
+        '''
+        Initialise a new label column.
+
+        Args:
+            vocabulary (ndarray): The distinct labels.
+            codes (ndarray): The label codes of all rows, concatenated.
+            offsets (ndarray): Where the codes of each row start (plus the end).
+        '''
+
+        self.vocabulary = vocabulary
+        self.codes = codes
+        self.offsets = offsets
+
+    def __repr__(self) -> str:
+
+        return f'phub.frame.Labels(rows={len(self)}, labels={len(self.vocabulary)})'
+
+    def __len__(self) -> int:
+
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> list[str]:
+
+        return self.vocabulary[self.codes[self.offsets[index]:self.offsets[index + 1]]].tolist()
+
+    @classmethod
+    def build(cls, rows: Iterable[Iterable[str]]) -> Labels:
+        '''
+        Build a column from label lists.
+
+        Args:
+            rows (Iterable): The labels of each row.
+
+        Returns:
+            Labels: The column.
+        '''
+
+        np = _numpy()
+        index: dict[str, int] = {}
+        codes, offsets = [], [0]
+
+        for labels in rows:
+            codes.extend(index.setdefault(label, len(index)) for label in labels)
+            offsets.append(len(codes))
+
+        vocabulary = np.empty(len(index), dtype = object)
+        vocabulary[:] = list(index)
+
+        return cls(vocabulary, np.array(codes, dtype = np.int32), np.array(offsets, dtype = np.int64))
+
+    @property
+    def lengths(self) -> numpy.ndarray:
+        '''
+        The amount of labels of each row.
+        '''
+
+        return _numpy().diff(self.offsets)
+
+    @property
+    def rows(self) -> numpy.ndarray:
+        '''
+        The row index of each code.
+        '''
+
+        np = _numpy()
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    def take(self, indices: numpy.ndarray) -> Labels:
+        '''
+        Select rows.
+
+        Args:
+            indices (ndarray): The row indices.
+
+        Returns:
+            Labels: The selected rows (sharing the same vocabulary).
+        '''
+
+        np = _numpy()
+        lengths = self.lengths[indices]
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        # Shift each selected code back to its source position
+        shift = np.repeat(self.offsets[:-1][indices] - offsets[:-1], lengths)
+        codes = self.codes[np.arange(offsets[-1]) + shift]
+
+        return Labels(self.vocabulary, codes, offsets)
+
+    def contains(self, *labels: str) -> numpy.ndarray:
+        '''
+        Get which rows have any of some labels.
+
+        Args:
+            labels (str): The labels.
+
+        Returns:
+            ndarray: A boolean mask of the rows.
+        '''
+
+        np = _numpy()
+        wanted = np.isin(self.vocabulary, labels)
+
+        mask = np.zeros(len(self), dtype = bool)
+        mask[self.rows[wanted[self.codes]]] = True
+        return mask
+
+    def tolist(self) -> list[list[str]]:
+        '''
+        Get the label lists of all rows.
+        '''
+
+        labels = self.vocabulary[self.codes].tolist()
+        return [labels[start:end] for start, end in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())]
+
+class VideoFrame:
+    '''
+    A columnar table of video statistics, backed by numpy arrays.
+
+    Scalar columns (see :data:`SCALARS`) are numpy arrays, and ``tags``
+    and ``categories`` are :py:class:`Labels` columns. Frames are
+    immutable: filters and sorts return new frames.
+    '''
+
+    def __init__(self, columns: dict[str, Union[numpy.ndarray, Labels]]) -> None:
+        '''
+        Initialise a new frame.
+
+        Args:
+            columns (dict): The columns, all of the same length.
+        '''
+
+        self.columns = columns
+
+    def __repr__(self) -> str:
+
+        return f'phub.VideoFrame(rows={len(self)})'
+
+    def __len__(self) -> int:
+
+        return len(self.columns['key'])
+
+    def __iter__(self) -> Iterator[dict]:
+
+        columns = {name: self.column_list(name) for name in self.columns}
+
+        for index in range(len(self)):
+            yield {name: values[index] for name, values in columns.items()}
+
+    def __getitem__(self, item: Any) -> Union[numpy.ndarray, Labels, VideoFrame]:
+        '''
+        Get a column by name, or select rows with a boolean mask,
+        an index array or a slice.
+        '''
+
+        if isinstance(item, str):
+            return self.columns[item]
+
+        np = _numpy()
+        indices = np.arange(len(self))[item]
+
+        if indices.ndim != 1:
+            raise IndexError('Frames can only be indexed by a column name, a mask, indices or a slice')
+
+        return self.take(indices)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> VideoFrame:
+        '''
+        Build a frame from rows, as yielded by :func:`phub.export.rows`.
+
+        Args:
+            rows (Iterable[dict]): The rows, with all :data:`COLUMNS`.
+
+        Returns:
+            VideoFrame: The frame.
+        '''
+
+        np = _numpy()
+        values: dict[str, list] = {name: [] for name in COLUMNS}
+
+        for row in rows:
+            for name, column in values.items():
+                column.append(row.get(name))
+
+        columns = {}
+        for name, dtype in SCALARS.items():
+            column = [_MISSING[dtype] if value is None else value for value in values[name]]
+
+            if dtype == 'object':
+                columns[name] = np.empty(len(column), dtype = object)
+                columns[name][:] = column
+
+            else:
+                columns[name] = np.array(column, dtype = dtype)
+
+        for name in LISTS:
+            columns[name] = Labels.build(value or () for value in values[name])
+
+        return cls(columns)
+
+    @classmethod
+    def from_videos(cls, videos: Iterable[Video], concurrency: int = 4) -> VideoFrame:
+        '''
+        Build a frame from videos. Each video fetches only what the
+        frame needs, and unavailable videos are skipped.
+
+        Args:
+            videos (Iterable[Video]): The videos (e.g. a query).
+            concurrency (int): Maximum amount of videos fetched at once.
+
+        Returns:
+            VideoFrame: The frame.
+        '''
+
+        _numpy()
+        return cls.from_rows(export.rows(videos, COLUMNS, concurrency))
+
+    @classmethod
+    def from_query(cls, query: Query, max: int = 0, concurrency: int = 4) -> VideoFrame:
+        '''
+        Build a frame from query results.
+
+        Args:
+            query (Query): The query.
+            max (int): Maximum amount of videos.
+            concurrency (int): Maximum amount of videos fetched at once.
+
+        Returns:
+            VideoFrame: The frame.
+        '''
+
+        # Pages are not kept while the frame is built
+        return cls.from_videos(query._stream(max), concurrency)
+
+    @classmethod
+    def from_store(cls, store: MetadataStore, language: str = 'en') -> VideoFrame:
+        '''
+        Build a frame from all videos of a metadata store,
+        without sending requests. Stale entries are used as is.
+
+        Args:
+            store (MetadataStore): The store.
+            language (str): The client language of the entries.
+
+        Returns:
+            VideoFrame: The frame.
+        '''
+
+        _numpy()
+        return cls.from_rows(_stored_row(key, sources) for key, sources in store.entries(language))
+
+    def column_list(self, name: str) -> list:
+        '''
+        Get the values of a column as Python objects.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            list: The column values.
+        '''
+
+        column = self.columns[name]
+
+        if name == 'date':
+            return column.astype(object).tolist()
+
+        return column.tolist()
+
+    def take(self, indices: numpy.ndarray) -> VideoFrame:
+        '''
+        Select rows.
+
+        Args:
+            indices (ndarray): The row indices.
+
+        Returns:
+            VideoFrame: The selected rows.
+        '''
+
+        return VideoFrame({name: column.take(indices) if isinstance(column, Labels) else column[indices]
+                           for name, column in self.columns.items()})
+
+    def has(self, column: str, *labels: str) -> numpy.ndarray:
+        '''
+        Get which videos have any of some tags or categories.
+
+        Args:
+            column (str): The label column (tags or categories).
+            labels (str): The labels.
+
+        Returns:
+            ndarray: A boolean mask of the videos.
+        '''
+
+        if column not in LISTS:
+            raise ValueError(f'Not a label column: {column!r}')
+
+        return self.columns[column].contains(*labels)
+
+    def filter(self, mask: numpy.ndarray = None, **ranges: tuple) -> VideoFrame:
+        '''
+        Select videos by mask and column ranges.
+
+        Args:
+            mask (ndarray): A boolean mask of the videos.
+            ranges (tuple): Inclusive (min, max) bounds of scalar columns. Use None for no bound.
+
+        Returns:
+            VideoFrame: The selected videos.
+
+        Example:
+            >>> frame.filter(frame.has('tags', 'amateur'), views = (10_000, None))
+        '''
+
+        np = _numpy()
+        selected = np.ones(len(self), dtype = bool) if mask is None else np.asarray(mask, dtype = bool)
+
+        for name, (low, high) in ranges.items():
+            column = self._scalar(name)
+
+            if name == 'date':
+                low, high = (None if bound is None else np.datetime64(bound, 's') for bound in (low, high))
+
+            if low is not None:
+                selected &= column >= low
+
+            if high is not None:
+                selected &= column <= high
+
+        return self.take(np.flatnonzero(selected))
+
+    def sort(self, by: str = 'views', descending: bool = True) -> VideoFrame:
+        '''
+        Sort videos by a scalar column. Ties keep their order,
+        and missing values are last.
+
+        Args:
+            by (str): The column name.
+            descending (bool): Whether to sort from the highest value.
+
+        Returns:
+            VideoFrame: The sorted videos.
+        '''
+
+        np = _numpy()
+        column = self._scalar(by)
+
+        if descending:
+            order = len(self) - 1 - np.argsort(column[::-1], kind = 'stable')[::-1]
+
+        else:
+            order = np.argsort(column, kind = 'stable')
+
+        # Keep missing values last, in both directions
+        missing = self._missing(by)[order]
+        return self.take(np.concatenate((order[~missing], order[missing])))
+
+    def top(self, k: int, by: str = 'views') -> VideoFrame:
+        '''
+        Get the videos with the highest values of a column, sorted.
+
+        Args:
+            k (int): Amount of videos.
+            by (str): The column name.
+
+        Returns:
+            VideoFrame: The top videos.
+        '''
+
+        np = _numpy()
+        candidates = np.flatnonzero(~self._missing(by))
+
+        if k >= len(candidates):
+            return self.take(candidates).sort(by)
+
+        # Only sort the k best videos
+        column = self._scalar(by)[candidates]
+        best = np.argpartition(column, len(column) - k)[len(column) - k:]
+        return self.take(candidates[np.sort(best)]).sort(by)
+
+    def group(self,
+              by: Union[str, numpy.ndarray],
+              column: str = None,
+              agg: str = 'sum') -> dict[str, numpy.ndarray]:
+        '''
+        Group videos and aggregate a column. Videos are grouped by each
+        of their labels for tags and categories. Missing values are not
+        aggregated, and groups without values get a missing aggregate.
+
+        Args:
+            by (str | ndarray): A column name, or a key per video (e.g. ``frame['date'].astype('datetime64[M]')``).
+            column (str): The aggregated scalar column, if any.
+            agg (str): The aggregate (count, sum, mean, min or max).
+
+        Returns:
+            dict: The group keys (under 'key'), the video count of each group (under 'count')
+                  and the aggregated values (under the column name).
+
+        Example:
+            >>> frame.group('categories', 'views', 'mean')
+        '''
+
+        np = _numpy()
+
+        if agg not in AGGREGATES:
+            raise ValueError(f'Unknown aggregate: {agg!r}')
+
+        # Map each (video, group) pair to a group code
+        if isinstance(by, str) and by in LISTS:
+            labels = self.columns[by]
+            keys, codes, rows = labels.vocabulary, labels.codes, labels.rows
+
+        else:
+            values = self._scalar(by) if isinstance(by, str) else np.asarray(by)
+            keys, codes = np.unique(values, return_inverse = True)
+            rows = np.arange(len(self))
+
+        order = np.argsort(codes, kind = 'stable')
+        codes, rows = codes[order], rows[order]
+
+        starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1]))) if len(codes) else np.array([], dtype = int)
+        counts = np.diff(np.append(starts, len(codes)))
+
+        result = {'key': keys[codes[starts]], 'count': counts}
+
+        if column is not None and agg != 'count':
+            values = self._scalar(column)[rows]
+            missing = self._missing(column)[rows]
+
+            if not len(starts):
+                result[column] = values[:0]
+                return result
+
+            # Missing values are replaced by a neutral value of the aggregate
+            present = values[~missing]
+            if agg == 'min':
+                neutral = present.max() if len(present) else values[0]
+                aggregated = np.minimum.reduceat(np.where(missing, neutral, values), starts)
+
+            elif agg == 'max':
+                neutral = present.min() if len(present) else values[0]
+                aggregated = np.maximum.reduceat(np.where(missing, neutral, values), starts)
+
+            else:
+                aggregated = np.add.reduceat(np.where(missing, np.zeros(1, values.dtype), values), starts)
+
+            # Groups without values have a missing aggregate
+            found = np.add.reduceat((~missing).astype(np.int64), starts)
+            if agg == 'mean':
+                aggregated = np.divide(aggregated, found, out = np.full(len(found), np.nan), where = found > 0)
+
+            else:
+                aggregated[found == 0] = _MISSING[SCALARS[column]]
+
+            result[column] = aggregated
+
+        return result
+
+    def _scalar(self, name: str) -> numpy.ndarray:
+        '''
+        Get a scalar column.
+        '''
+
+        if name not in SCALARS:
+            raise ValueError(f'Not a scalar column: {name!r}')
+
+        return self.columns[name]
+
+    def _missing(self, name: str) -> numpy.ndarray:
+        '''
+        Get which values of a scalar column are missing.
+        '''
+
+        np = _numpy()
+        column = self._scalar(name)
+
+        if SCALARS[name] == 'float64':
+            return np.isnan(column)
+
+        if SCALARS[name] == 'datetime64[s]':
+            return np.isnat(column)
+
+        if SCALARS[name] == 'int64':
+            return column == -1
+
+        return np.array([value is None for value in column], dtype = bool)
+
+    def to_pandas(self) -> Any:
+        '''
+        Get the frame as a pandas DataFrame (lists are kept as Python lists).
+
+        Returns:
+            pandas.DataFrame: The data frame.
+        '''
+
+        try:
+            import pandas
+
+        except ImportError as err:
+            raise ImportError('VideoFrame.to_pandas requires the pandas package') from err
+
+        return pandas.DataFrame({name: self.column_list(name) if name in LISTS else column
+                                 for name, column in self.columns.items()})
+
+    def to_arrow(self) -> Any:
+        '''
+        Get the frame as a pyarrow Table (using the export column types).
+
+        Returns:
+            pyarrow.Table: The table.
+        '''
+
+        try:
+            import pyarrow as pa
+
+        except ImportError as err:
+            raise ImportError('VideoFrame.to_arrow requires the pyarrow package') from err
+
+        arrays = {}
+        for name, column in self.columns.items():
+            if name in LISTS:
+                arrays[name] = pa.ListArray.from_arrays(pa.array(column.offsets, pa.int32()),
+                                                        pa.array(column.vocabulary[column.codes], pa.string()))
+
+            elif name == 'key':
+                arrays[name] = pa.array(column.tolist(), pa.string())
+
+            else:
+                arrays[name] = pa.array(column)
+
+        return pa.table(arrays)
+
+def _stored_row(key: str, sources: dict[str, dict]) -> dict:
+    '''
+    Build the frame row of a stored video, the same way
+    video properties read it (page first, then data).
+    '''
+
+    data = sources.get('data') or {}
+    flashvars = (sources.get('page') or {}).get('flashvars') or {}
+    page = (sources.get('page') or {}).get('page') or {}
+
+    row = {'key': key, 'views': page.get('views')}
+
+    if row['views'] is None:
+        row['views'] = data.get('views')
+
+    if seconds := flashvars.get('video_duration'):
+        row['duration'] = int(seconds)
+
+    elif raw := data.get('duration'):
+        row['duration'] = sum(int(part) * 60 ** index for index, part in enumerate(raw.split(':')[::-1]))
+
+    if page.get('likes'):
+        up, down = page['likes']
+        row |= {'likes': up, 'dislikes': down, 'rating': up / (up + down) if up + down else 0}
+
+    elif data.get('rating') is not None and data.get('ratings') is not None:
+        rating = data['rating'] / 100
+        row |= {'likes': round(rating * data['ratings']),
+                'dislikes': round((1 - rating) * data['ratings']),
+                'rating': rating}
+
+    if page.get('date'):
+        row['date'] = page['date'][:19]
+
+    elif raw := data.get('publish_date'):
+        row['date'] = datetime.strptime(raw, '%Y-%m-%d %H:%M:%S').isoformat()
+
+    row['tags'] = page.get('tags') or [tag['tag_name'] for tag in data.get('tags') or ()]
+    row['categories'] = page.get('categories') or [item['category'] for item in data.get('categories') or ()]
+
+    return row
+
+# EOF
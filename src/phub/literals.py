@@ -39,6 +39,15 @@ offers = Literal['custom videos', 'fan club']
 # User relationship
 relation = Literal['single', 'taken', 'open']
 
+# Traffic classes of outgoing requests
+url_kind = Literal['page', 'api', 'media']
+
+# Video data sources (webmasters API or video page)
+video_source = Literal['data', 'page']
+
+# Video export file formats
+export_format = Literal['jsonl', 'csv', 'parquet']
+
 # Video segment (orientation)
 Segment = Literal['female', 'male', 'straight', 'gay', 'transgender', 'miscellaneous', 'uncategorized']
 
@@ -2,11 +2,17 @@
 PHUB submodules.
 '''
 
-__all__ = ['parser', 'display', 'download', 'rss']
+__all__ = ['parser', 'display', 'download', 'rss', 'limiter', 'retry', 'transport', 'cache', 'middleware', 'flight', 'stream', 'metrics', 'trace', 'cassette', 'session', 'identity', 'store']
 
-from . import rss
-from . import parser
-from . import display
-from . import download
+from typing import TYPE_CHECKING
 
-# EOF
\ No newline at end of file
+from .._lazy import attach
+
+# Submodules are imported on first access
+__getattr__, __dir__ = attach(__name__, __all__)
+
+if TYPE_CHECKING:
+    from . import (rss, parser, display, download, limiter, retry, transport, cache,
+                   middleware, flight, stream, metrics, trace, cassette, session, identity, store)
+
+# EOF
@@ -0,0 +1,316 @@
+'''
+PHUB persistent HTTP response cache.
+'''
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Union
+
+import httpx
+
+from .. import literals
+
+logger = logging.getLogger(__name__)
+
+# Headers that do not describe the decompressed cached body
+_DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'set-cookie')
+
+# The usage table keeps a running total of the body sizes, so
+# writes don't have to sum the whole table
+_SCHEMA = '''
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS usage (total INTEGER NOT NULL);
+INSERT INTO usage SELECT COALESCE(SUM(size), 0) FROM entries WHERE NOT EXISTS (SELECT 1 FROM usage);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+BEGIN UPDATE usage SET total = total + new.size; END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+BEGIN UPDATE usage SET total = total - old.size; END;
+COMMIT;
+'''
+
+
+@dataclass
+class CacheEntry:
+    '''
+    Represents a cached response.
+    '''
+
+    key: str
+    url: str
+    status: int
+    headers: dict
+    body: bytes
+    stored: float
+
+    @property
+    def age(self) -> float:
+        '''
+        Time since the entry was stored or revalidated.
+        '''
+
+        return time.time() - self.stored
+
+    @property
+    def validators(self) -> dict[str, str]:
+        '''
+        Headers used to revalidate the entry.
+        '''
+
+        headers = {}
+
+        if etag := self.headers.get('etag'):
+            headers['If-None-Match'] = etag
+
+        if modified := self.headers.get('last-modified'):
+            headers['If-Modified-Since'] = modified
+
+        return headers
+
+    def response(self) -> httpx.Response:
+        '''
+        Rebuild the response.
+
+        Returns:
+            httpx.Response: The cached response.
+        '''
+
+        return httpx.Response(
+            status_code = self.status,
+            headers = self.headers,
+            content = self.body,
+            request = httpx.Request('GET', self.url),
+            extensions = {'phub_cache': 'hit'}
+        )
+
+class ResponseCache:
+    '''
+    An on-disk cache for GET responses, shared safely between
+    threads and processes (SQLite in WAL mode).
+
+    Entries are keyed by normalized URL and client language and
+    stored compressed. Expired entries holding an ETag or a
+    Last-Modified header are revalidated with conditional requests.
+    When the cache grows over ``max_size``, the least recently used
+    entries are evicted. Calls of logged in clients, or carrying
+    credentials, are never cached, since account pages hold tokens
+    and private data.
+    '''
+
+    def __init__(self,
+                 path: Union[str, os.PathLike] = 'phub-cache.db',
+                 ttl: dict[literals.url_kind, float] = None,
+                 max_size: int = 256 * 1024 ** 2,
+                 level: int = 6) -> None:
+        '''
+        Initialise a new cache.
+
+        Args:
+            path (PathLike): The database path.
+            ttl (dict): Time to live of each traffic class in seconds. Classes without a TTL are not cached.
+            max_size (int): Maximum size of the compressed bodies in bytes.
+            level (int): Compression level.
+        '''
+
+        self.path = os.fspath(path)
+        self.ttl = DEFAULT_TTL | (ttl or {})
+        self.max_size = max_size
+        self.level = level
+
+        self._local = threading.local()
+        self.db.executescript(_SCHEMA)
+
+        logger.debug('Initialised response cache at %s', self.path)
+
+    def __repr__(self) -> str:
+
+        return f'phub.ResponseCache(path={self.path})'
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        '''
+        The database connection of the current thread.
+        '''
+
+        if not (db := getattr(self._local, 'db', None)):
+            db = sqlite3.connect(self.path, timeout = 30, isolation_level = None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            # Fire delete triggers on INSERT OR REPLACE
+            db.execute('PRAGMA recursive_triggers=ON')
+            self._local.db = db
+
+        return db
+
+    @staticmethod
+    def normalize(url: str) -> str:
+        '''
+        Normalize a URL so equivalent URLs share the same entry.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            str: The normalized URL.
+        '''
+
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values = True)))
+
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(),
+                           parts.path or '/', query, ''))
+
+    def make_key(self, url: str, language: str) -> str:
+        '''
+        Build an entry key.
+
+        Args:
+            url (str): The request URL.
+            language (str): The client language.
+
+        Returns:
+            str: The entry key.
+        '''
+
+        raw = f'{language}|{self.normalize(url)}'
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def cacheable(self, kind: literals.url_kind) -> bool:
+        '''
+        Whether responses of a traffic class are cached.
+        '''
+
+        return bool(self.ttl.get(kind))
+
+    def is_fresh(self, entry: CacheEntry, kind: literals.url_kind) -> bool:
+        '''
+        Whether an entry can be served without revalidation.
+        '''
+
+        return entry.age < (self.ttl.get(kind) or 0)
+
+    def get(self, url: str, language: str) -> Union[CacheEntry, None]:
+        '''
+        Look up an entry.
+
+        Args:
+            url (str): The request URL.
+            language (str): The client language.
+
+        Returns:
+            CacheEntry: The entry, or None if the URL is not cached.
+        '''
+
+        key = self.make_key(url, language)
+        row = self.db.execute('SELECT url, status, headers, body, stored FROM entries WHERE key = ?',
+                              (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        self.db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+
+        url, status, headers, body, stored = row
+        return CacheEntry(key, url, status, json.loads(headers), zlib.decompress(body), stored)
+
+    def store(self, url: str, language: str, response: httpx.Response) -> None:
+        '''
+        Save a response.
+
+        Args:
+            url (str): The request URL.
+            language (str): The client language.
+            response (httpx.Response): A successful, fully read response.
+        '''
+
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() not in _DROPPED_HEADERS}
+
+        body = zlib.compress(response.content, self.level)
+        now = time.time()
+
+        self.db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (self.make_key(url, language), str(response.url), response.status_code,
+                         json.dumps(headers), body, len(body), now, now))
+
+        self.evict()
+
+    def revalidated(self, entry: CacheEntry, response: httpx.Response) -> None:
+        '''
+        Mark an entry as fresh after a 304 response.
+
+        Args:
+            entry (CacheEntry): The revalidated entry.
+            response (httpx.Response): The 304 response, whose validators may be updated.
+        '''
+
+        for header in ('etag', 'last-modified'):
+            if value := response.headers.get(header):
+                entry.headers[header] = value
+
+        entry.stored = time.time()
+        self.db.execute('UPDATE entries SET stored = ?, headers = ? WHERE key = ?',
+                        (entry.stored, json.dumps(entry.headers), entry.key))
+
+    @property
+    def size(self) -> int:
+        '''
+        Total size of the compressed bodies in bytes.
+        '''
+
+        return self.db.execute('SELECT total FROM usage').fetchone()[0]
+
+    def evict(self) -> None:
+        '''
+        Remove least recently used entries until the cache fits in ``max_size``.
+        '''
+
+        total = self.size
+        if total <= self.max_size:
+            return
+
+        logger.info('Cache is %s bytes over its size limit, evicting', total - self.max_size)
+
+        freed = 0
+        stale = []
+        for key, size in self.db.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            if total - freed <= self.max_size: break
+            stale.append((key,))
+            freed += size
+
+        self.db.executemany('DELETE FROM entries WHERE key = ?', stale)
+
+    def clear(self) -> None:
+        '''
+        Remove all entries.
+        '''
+
+        self.db.execute('DELETE FROM entries')
+
+DEFAULT_TTL: dict[literals.url_kind, float] = {
+    'page': 15 * 60,
+    'api': 60 * 60,
+    'media': None
+}
+
+# EOF
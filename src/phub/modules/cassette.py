@@ -0,0 +1,379 @@
+'''
+PHUB record/replay transport.
+
+A cassette records the responses of a client once and replays
+them later without network access, for deterministic tests and
+benchmarks.
+'''
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Iterator, AsyncIterator, Literal, Union
+
+import httpx
+
+from .. import errors
+
+logger = logging.getLogger(__name__)
+
+Mode = Literal['replay', 'record', 'auto']
+
+# Bodies worth compressing in the archive
+_TEXT_TYPES = ('text', 'json', 'javascript', 'mpegurl', 'xml')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS interactions (
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body TEXT NOT NULL,
+    elapsed REAL NOT NULL,
+    PRIMARY KEY (key, seq)
+);
+CREATE TABLE IF NOT EXISTS bodies (
+    hash TEXT PRIMARY KEY,
+    compressed INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+'''
+
+
+class Cassette:
+    '''
+    An archive of recorded responses (SQLite, bodies deduplicated
+    and compressed when they are text).
+
+    Requests are matched on method, normalized URL and body. A
+    request recorded several times is replayed in the same order,
+    the last response being repeated once they are exhausted.
+
+    Modes:
+        - ``replay``: never use the network. Unknown requests raise CassetteMiss.
+        - ``record``: send every request and record it. Clears the cassette first.
+        - ``auto``: replay known requests, record the others.
+    '''
+
+    def __init__(self,
+                 path: Union[str, os.PathLike],
+                 mode: Mode = 'auto',
+                 latency: float = 0,
+                 bandwidth: float = None,
+                 ignore: tuple[str] = ()) -> None:
+        '''
+        Initialise a new cassette.
+
+        Args:
+            path (PathLike): The archive path.
+            mode (str): The cassette mode (replay, record or auto).
+            latency (float): Simulated delay before each replayed response, in seconds.
+                             Use ``'recorded'`` to replay the recorded delays.
+            bandwidth (float): Simulated replay bandwidth, in bytes per second.
+            ignore (tuple[str]): Query parameters to ignore when matching requests.
+        '''
+
+        assert mode in ('replay', 'record', 'auto'), f'Invalid cassette mode `{mode}`'
+
+        self.path = os.fspath(path)
+        self.mode = mode
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.ignore = set(ignore)
+
+        self.lock = threading.Lock()
+        self.plays: dict[str, int] = {}
+        self.records: dict[str, int] = {}
+
+        self._local = threading.local()
+        self.db.executescript(_SCHEMA)
+
+        if mode == 'record':
+            self.db.execute('DELETE FROM interactions')
+            self.db.execute('DELETE FROM bodies')
+
+        logger.debug('Opened cassette %s in %s mode', self.path, mode)
+
+    def __repr__(self) -> str:
+
+        return f'phub.Cassette(path={self.path}, mode={self.mode})'
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        '''
+        The database connection of the current thread.
+        '''
+
+        if not (db := getattr(self._local, 'db', None)):
+            db = sqlite3.connect(self.path, timeout = 30, isolation_level = None)
+            db.execute('PRAGMA journal_mode=WAL')
+            self._local.db = db
+
+        return db
+
+    def make_key(self, request: httpx.Request) -> str:
+        '''
+        Build the key a request is matched on.
+
+        Args:
+            request (httpx.Request): The request.
+
+        Returns:
+            str: The key.
+        '''
+
+        parts = urlsplit(str(request.url))
+        params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values = True)
+                  if k not in self.ignore]
+
+        url = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or '/',
+                          urlencode(sorted(params)), ''))
+
+        body = hashlib.sha1(request.content).hexdigest() if request.content else ''
+        return hashlib.sha1(f'{request.method}|{url}|{body}'.encode()).hexdigest()
+
+    def play(self, request: httpx.Request) -> Union[tuple[int, list, bytes, float], None]:
+        '''
+        Find the next recorded response of a request.
+
+        Args:
+            request (httpx.Request): The request.
+
+        Returns:
+            tuple: The status, headers, raw body and recorded delay, or None if the request is unknown.
+        '''
+
+        key = self.make_key(request)
+
+        with self.lock:
+            index = self.plays.get(key, 0)
+            self.plays[key] = index + 1
+
+        row = self.db.execute('''
+            SELECT status, headers, compressed, data, elapsed FROM interactions
+            JOIN bodies ON bodies.hash = interactions.body
+            WHERE key = ? ORDER BY seq <= ? DESC, seq DESC LIMIT 1
+        ''', (key, index)).fetchone()
+
+        if row is None:
+            return None
+
+        status, headers, compressed, data, elapsed = row
+        body = zlib.decompress(data) if compressed else data
+        return status, json.loads(headers), body, elapsed
+
+    def record(self,
+               request: httpx.Request,
+               response: httpx.Response,
+               body: bytes,
+               elapsed: float) -> None:
+        '''
+        Save a response.
+
+        Args:
+            request (httpx.Request): The request.
+            response (httpx.Response): The response.
+            body (bytes): The raw (still encoded) response body.
+            elapsed (float): Time the response took, in seconds.
+        '''
+
+        key = self.make_key(request)
+        digest = hashlib.sha1(body).hexdigest()
+
+        kind = response.headers.get('content-type', '')
+        compressed = 'content-encoding' not in response.headers \
+                     and any(text in kind for text in _TEXT_TYPES)
+
+        with self.lock:
+            if key not in self.records:
+                self.records[key] = self.db.execute('SELECT COUNT(*) FROM interactions WHERE key = ?',
+                                                    (key,)).fetchone()[0]
+
+            seq = self.records[key]
+            self.records[key] += 1
+
+        self.db.execute('INSERT OR IGNORE INTO bodies VALUES (?, ?, ?)',
+                        (digest, compressed, zlib.compress(body) if compressed else body))
+
+        self.db.execute('INSERT INTO interactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (key, seq, request.method, str(request.url), response.status_code,
+                         json.dumps(response.headers.multi_items()), digest, elapsed))
+
+    def _delay(self, elapsed: float) -> float:
+        '''
+        Get the simulated delay before a replayed response.
+        '''
+
+        return elapsed if self.latency == 'recorded' else self.latency
+
+    def _miss(self, request: httpx.Request) -> None:
+        '''
+        Handle a request that is not in the cassette.
+        '''
+
+        if self.mode == 'replay':
+            raise errors.CassetteMiss(f'{request.method} {request.url} is not in cassette {self.path}')
+
+    def transport(self, inner: httpx.BaseTransport = None) -> CassetteTransport:
+        '''
+        Build a transport using this cassette.
+
+        Args:
+            inner (httpx.BaseTransport): The transport to record from.
+
+        Returns:
+            CassetteTransport: The transport.
+        '''
+
+        return CassetteTransport(self, inner)
+
+    def close(self) -> None:
+        '''
+        Close the connection of the current thread.
+        '''
+
+        if db := getattr(self._local, 'db', None):
+            db.close()
+            self._local.db = None
+
+class _ReplayStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    '''
+    A replayed body, optionally throttled.
+    '''
+
+    def __init__(self, body: bytes, bandwidth: float = None, chunk_size: int = 64 * 1024) -> None:
+
+        self.body = body
+        self.bandwidth = bandwidth
+        self.chunk_size = chunk_size
+
+    def _chunks(self) -> Iterator[tuple[bytes, float]]:
+
+        for start in range(0, len(self.body), self.chunk_size):
+            chunk = self.body[start:start + self.chunk_size]
+            yield chunk, len(chunk) / self.bandwidth if self.bandwidth else 0
+
+    def __iter__(self) -> Iterator[bytes]:
+
+        for chunk, wait in self._chunks():
+            if wait: time.sleep(wait)
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+
+        for chunk, wait in self._chunks():
+            if wait: await asyncio.sleep(wait)
+            yield chunk
+
+class CassetteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    '''
+    An httpx transport replaying and recording a cassette.
+    Works with both sync and async sessions.
+    '''
+
+    def __init__(self, cassette: Cassette, inner: Union[httpx.BaseTransport, httpx.AsyncBaseTransport] = None) -> None:
+        '''
+        Initialise a new transport.
+
+        Args:
+            cassette (Cassette): The cassette.
+            inner (httpx.BaseTransport): The transport to record from. Defaults to a plain HTTP transport.
+        '''
+
+        self.cassette = cassette
+        self.inner = inner
+
+    def __repr__(self) -> str:
+
+        return f'phub.CassetteTransport({self.cassette})'
+
+    def _replay(self, request: httpx.Request, recorded: tuple) -> httpx.Response:
+
+        status, headers, body, _ = recorded
+
+        return httpx.Response(
+            status_code = status,
+            headers = headers,
+            stream = _ReplayStream(body, self.cassette.bandwidth),
+            request = request,
+            extensions = {'phub_cassette': 'replay'}
+        )
+
+    def _recorded(self, request: httpx.Request, response: httpx.Response, body: bytes, started: float) -> httpx.Response:
+
+        self.cassette.record(request, response, body, time.perf_counter() - started)
+
+        return httpx.Response(
+            status_code = response.status_code,
+            headers = response.headers.multi_items(),
+            stream = _ReplayStream(body),
+            request = request,
+            extensions = {'phub_cassette': 'record'}
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+
+        if self.cassette.mode != 'record' and (recorded := self.cassette.play(request)):
+            if delay := self.cassette._delay(recorded[3]): time.sleep(delay)
+            return self._replay(request, recorded)
+
+        self.cassette._miss(request)
+
+        if self.inner is None:
+            self.inner = httpx.HTTPTransport()
+
+        started = time.perf_counter()
+        response = self.inner.handle_request(request)
+
+        try:
+            body = b''.join(response.stream)
+
+        finally:
+            response.close()
+
+        return self._recorded(request, response, body, started)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+
+        if self.cassette.mode != 'record' and (recorded := self.cassette.play(request)):
+            if delay := self.cassette._delay(recorded[3]): await asyncio.sleep(delay)
+            return self._replay(request, recorded)
+
+        self.cassette._miss(request)
+
+        if self.inner is None:
+            self.inner = httpx.AsyncHTTPTransport()
+
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+
+        try:
+            body = b''.join([chunk async for chunk in response.stream])
+
+        finally:
+            await response.aclose()
+
+        return self._recorded(request, response, body, started)
+
+    def close(self) -> None:
+
+        if self.inner is not None:
+            self.inner.close()
+
+    async def aclose(self) -> None:
+
+        if self.inner is not None:
+            await self.inner.aclose()
+
+# EOF
@@ -3,11 +3,11 @@ from __future__ import annotations
 import time
 import logging
 from pathlib import Path
-from ffmpeg_progress_yield import FfmpegProgress
 from typing import TYPE_CHECKING, Callable, Union
 from concurrent.futures import ThreadPoolExecutor as Pool, as_completed
 
 from .. import consts
+from . import trace
 
 if TYPE_CHECKING:
     from .. import Client
@@ -19,6 +19,7 @@ logger = logging.getLogger(__name__)
 CallbackType = Callable[[int, int], None]
 
 
+@trace.traced('download.default')
 def default(video: Video,
             quality: Quality,
             callback: CallbackType,
@@ -37,40 +38,44 @@ def default(video: Video,
     
     logger.info('Downloading using default downloader')
     
-    buffer = b''
-    
     segments = list(video.get_segments(quality))[start:]
     length = len(segments)
+    resume = None
     
-    # Fetch segments
-    for i, url in enumerate(segments):
-        for _ in range(consts.DOWNLOAD_SEGMENT_MAX_ATTEMPS):
-        
-            try:
-                segment = video.client.call(url, throw = False, timeout = 4, silent = True)
-                
-                if segment.is_success:
-                    buffer += segment.content
-                    callback(i + 1, length)
-                    break
+    # Segments are written as they arrive, so a retry starts over from the
+    # end of the last complete segment
+    with open(path, 'ab' if start else 'wb') as file:
+        for i, url in enumerate(segments):
+            for _ in range(consts.DOWNLOAD_SEGMENT_MAX_ATTEMPS):
+                position = file.tell()
             
-            except Exception as err:
-                logger.error('Error while downloading: %s', err)
-            
-            logger.warning('Segment %s failed. Retrying.', i)
-            time.sleep(consts.DOWNLOAD_SEGMENT_ERROR_DELAY)
+                try:
+                    with video.client.stream(url, throw = False, timeout = 4, silent = True) as segment:
+                        
+                        if segment.is_success:
+                            segment.write_to(file)
+                            callback(i + 1, length)
+                            break
+                
+                except Exception as err:
+                    logger.error('Error while downloading: %s', err)
+                    file.seek(position)
+                    file.truncate()
                 
-        else:
-            logger.error('Maximum attempts reached. Refreshing M3U...')
-            return default(video, quality, callback, i - 1)
+                logger.warning('Segment %s failed. Retrying.', i)
+                time.sleep(consts.DOWNLOAD_SEGMENT_ERROR_DELAY)
+                    
+            else:
+                resume = start + i
+                break
     
-    # Concatenate
-    logger.info('Concatenating buffer to %s', path)
-    with open(path, 'wb') as file:
-        file.write(buffer)
+    if resume is not None:
+        logger.error('Maximum attempts reached. Refreshing M3U...')
+        return default(video, quality, callback, path, resume)
     
     logger.info('Downloading successful.')
 
+@trace.traced('download.ffmpeg')
 def FFMPEG(video: Video, quality: Quality, callback: CallbackType, path: Union[str, Path], start: int = 0) -> None:
     '''
     Download using FFMPEG with real-time progress reporting.
@@ -85,6 +90,9 @@ def FFMPEG(video: Video, quality: Quality, callback: CallbackType, path: Union[s
         start         (int): Where to start the download from. Used for download retries.
     '''
 
+    # Imported here so other downloaders don't pay for it
+    from ffmpeg_progress_yield import FfmpegProgress
+
     logger.info('Downloading using FFMPEG')
     M3U = video.get_M3U_URL(quality)
 
@@ -116,13 +124,21 @@ def FFMPEG(video: Video, quality: Quality, callback: CallbackType, path: Union[s
 
 def _thread(client: Client, url: str, timeout: int) -> bytes:
     '''
-    Download a single segment using the client's call method.
+    Download a single segment using the client's stream method.
     This function is intended to be used within a ThreadPoolExecutor.
     '''
     try:
-        response = client.call(url, timeout=timeout, silent=True)
-        response.raise_for_status()
-        return (url, response.content, True)
+        with trace.span('download.segment', url=url), \
+             client.stream(url, timeout=timeout, silent=True) as response:
+            
+            # Read straight into a buffer of the announced size
+            if (length := response.length) is not None:
+                data = bytearray(length)
+                del data[response.readinto(data):]
+                data += response.read()
+                return (url, data, True)
+            
+            return (url, response.read(), True)
 
     except Exception as e:
         logging.warning(f"Failed to download segment {url}: {e}")
@@ -130,16 +146,20 @@ def _thread(client: Client, url: str, timeout: int) -> bytes:
 
 # Modify _base_threaded to use ThreadPoolExecutor
 def _base_threaded(client: Client, segments: list[str], callback: CallbackType, max_workers: int = 20,
-                   timeout: int = 10) -> dict[str, bytes]:
+                   timeout: int = 10, write: Callable[[bytes], None] = None) -> dict[str, bytes]:
     '''
     Base threaded downloader using ThreadPoolExecutor.
+    
+    If ``write`` is given, segments are passed to it in order as soon
+    as possible and dropped from the returned buffer.
     '''
     logging.info('Threaded download initiated')
     buffer = {}
     length = len(segments)
+    done = written = 0
     
     with Pool(max_workers=max_workers) as executor:
-        future_to_url = {executor.submit(_thread, client, url, timeout): url for url in segments}
+        future_to_url = {executor.submit(trace.propagate(_thread), client, url, timeout): url for url in segments}
 
         for future in as_completed(future_to_url):
             url = future_to_url[future]
@@ -147,10 +167,21 @@ def _base_threaded(client: Client, segments: list[str], callback: CallbackType,
                 url, data, success = future.result()
                 if success:
                     buffer[url] = data
+                    done += 1
+                
+                elif write:
+                    buffer[url] = b''
+                
                 # Regardless of success, update the progress
-                callback(len(buffer), length)
+                callback(done, length)
             except Exception as e:
                 logging.warning(f"Error processing segment {url}: {e}")
+                if write: buffer[url] = b''
+            
+            # Flush the segments that are ready
+            while write and written < length and segments[written] in buffer:
+                write(buffer.pop(segments[written]))
+                written += 1
 
     return buffer
 
@@ -167,6 +198,7 @@ def threaded(max_workers: int = 20,
         Callable: A download wrapper.
     '''
     
+    @trace.traced('download.threaded')
     def wrapper(video: Video,
                 quality: Quality,
                 callback: CallbackType,
@@ -177,19 +209,20 @@ def threaded(max_workers: int = 20,
         
         segments = list(video.get_segments(quality))
         
-        buffer = _base_threaded(
-            client = video.client,
-            segments = segments,
-            callback = callback,
-            max_workers = max_workers,
-            timeout = timeout
-        )
+        # Open the CDN connections before the burst, if the transport profile asks to
+        if segments:
+            video.client.prewarm(segments[0])
         
-        # Concatenate and write
-        logger.info('Writing buffer to file')
+        # Write segments in order as they arrive
         with open(path, 'wb') as file:
-            for url in segments:
-                file.write(buffer.get(url, b''))
+            _base_threaded(
+                client = video.client,
+                segments = segments,
+                callback = callback,
+                max_workers = max_workers,
+                timeout = timeout,
+                write = file.write
+            )
         
         logger.info('Successfully wrote file to %s', path)
     
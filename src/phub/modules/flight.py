@@ -0,0 +1,123 @@
+'''
+PHUB single-flight request coalescing.
+'''
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Awaitable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    '''
+    Represents a call in progress.
+    '''
+
+    def __init__(self) -> None:
+
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+class FlightGroup:
+    '''
+    Coalesces concurrent identical calls: the first caller runs
+    the call while the others wait for its result (or error).
+
+    Sync and async calls are tracked separately, since an event
+    loop can't wait on a thread and vice versa.
+    '''
+
+    def __init__(self) -> None:
+        '''
+        Initialise a new flight group.
+        '''
+
+        self.lock = threading.Lock()
+        self.flights: dict[Hashable, _Flight] = {}
+        self.tasks: dict[Hashable, list] = {} # Futures and their waiter count
+
+    def __repr__(self) -> str:
+
+        return f'phub.FlightGroup(flights={len(self.flights)}, tasks={len(self.tasks)})'
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        '''
+        Run a call, or wait for an identical one in progress.
+
+        Args:
+            key (Hashable): The call key.
+            func (Callable): The call.
+
+        Returns:
+            Any: The call result.
+        '''
+
+        with self.lock:
+            flight = self.flights.get(key)
+
+            if leader := flight is None:
+                flight = self.flights[key] = _Flight()
+
+        if not leader:
+            logger.debug('Joining call in progress %s', key)
+            flight.done.wait()
+
+            if flight.error is not None:
+                raise flight.error
+
+            return flight.result
+
+        try:
+            flight.result = func()
+            return flight.result
+
+        except BaseException as err:
+            flight.error = err
+            raise
+
+        finally:
+            with self.lock:
+                del self.flights[key]
+
+            flight.done.set()
+
+    async def ado(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        '''
+        Run an async call, or wait for an identical one in progress.
+
+        Args:
+            key (Hashable): The call key.
+            func (Callable): The coroutine function.
+
+        Returns:
+            Any: The call result.
+        '''
+
+        if (entry := self.tasks.get(key)) is None:
+            entry = self.tasks[key] = [asyncio.ensure_future(func()), 0]
+
+        else:
+            logger.debug('Joining call in progress %s', key)
+
+        future = entry[0]
+        entry[1] += 1
+
+        try:
+            # Shield the call from a single waiter being cancelled
+            return await asyncio.shield(future)
+
+        finally:
+            entry[1] -= 1
+
+            if future.done() or not entry[1]:
+                if self.tasks.get(key) is entry:
+                    del self.tasks[key]
+
+                future.cancel()
+
+# EOF
@@ -0,0 +1,79 @@
+'''
+PHUB identity map.
+'''
+
+from __future__ import annotations
+
+import logging
+import threading
+from weakref import WeakValueDictionary
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class IdentityMap:
+    '''
+    Shares a single object per identifier (e.g. one video per
+    viewkey), so data fetched through one reference benefits
+    all the others.
+
+    Objects are weakly referenced: they are freed as usual
+    once nothing else uses them.
+    '''
+
+    def __init__(self) -> None:
+        '''
+        Initialise a new identity map.
+        '''
+
+        self.lock = threading.Lock()
+        self.objects: WeakValueDictionary[Hashable, Any] = WeakValueDictionary()
+
+    def __repr__(self) -> str:
+
+        return f'phub.IdentityMap(objects={len(self)})'
+
+    def __len__(self) -> int:
+
+        return len(self.objects)
+
+    def __contains__(self, key: Hashable) -> bool:
+
+        return key in self.objects
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        '''
+        Get the object of an identifier, or build and register it.
+
+        Args:
+            key (Hashable): The object identifier.
+            build (Callable): Builds the object if it is not mapped.
+
+        Returns:
+            Any: The shared object.
+        '''
+
+        with self.lock:
+            obj = self.objects.get(key)
+
+        if obj is not None:
+            logger.debug('Reusing mapped object %s', obj)
+            return obj
+
+        # Build outside the lock, since it can send requests.
+        # If another thread was faster, its object wins.
+        obj = build()
+
+        with self.lock:
+            return self.objects.setdefault(key, obj)
+
+    def clear(self) -> None:
+        '''
+        Forget all mapped objects.
+        '''
+
+        with self.lock:
+            self.objects.clear()
+
+# EOF
@@ -0,0 +1,230 @@
+'''
+PHUB request rate limiting.
+'''
+
+from __future__ import annotations
+
+import time
+import asyncio
+import logging
+import threading
+from typing import Union
+
+from .. import literals
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    '''
+    A thread-safe token bucket.
+
+    Tokens are reserved rather than waited for while holding
+    the lock, so concurrent callers are given successive time
+    slots instead of all sleeping for the same delay.
+    '''
+
+    def __init__(self, rate: float, burst: float = 1) -> None:
+        '''
+        Initialise a new bucket.
+
+        Args:
+            rate (float): Tokens refilled per second.
+            burst (float): Maximum amount of tokens the bucket can hold.
+        '''
+
+        assert rate > 0, 'Bucket rate must be positive'
+
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def __repr__(self) -> str:
+
+        return f'phub.TokenBucket(rate={self.rate}, burst={self.capacity})'
+
+    def _refill(self) -> None:
+        '''
+        Refill the bucket depending on the elapsed time.
+        Must be called while holding the lock.
+        '''
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        '''
+        Take tokens from the bucket, possibly borrowing from the future.
+
+        Args:
+            tokens (float): Amount of tokens to take.
+
+        Returns:
+            float: Time (in seconds) to wait before the tokens can be used.
+        '''
+
+        with self.lock:
+            self._refill()
+            self.tokens -= tokens
+
+            if self.tokens >= 0:
+                return 0
+
+            return -self.tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        '''
+        Take tokens only if they are immediately available.
+
+        Args:
+            tokens (float): Amount of tokens to take.
+
+        Returns:
+            bool: Whether the tokens were taken.
+        '''
+
+        with self.lock:
+            self._refill()
+
+            if self.tokens < tokens:
+                return False
+
+            self.tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1) -> None:
+        '''
+        Take tokens, blocking until they are available.
+
+        Args:
+            tokens (float): Amount of tokens to take.
+        '''
+
+        if wait := self.reserve(tokens):
+            time.sleep(wait)
+
+Budget = Union[TokenBucket, float, None]
+
+class RateLimiter:
+    '''
+    Paces requests with separate budgets for site pages,
+    the webmasters API and media CDN hosts.
+
+    Traffic classes without a budget fall back on the
+    default bucket, which is shared between them. If there
+    is no default bucket, they are not limited.
+    '''
+
+    def __init__(self,
+                 page: Budget = None,
+                 api: Budget = None,
+                 media: Budget = None,
+                 *,
+                 default: Budget = None) -> None:
+        '''
+        Initialise a new rate limiter.
+
+        Args:
+            page (TokenBucket | float): Budget for site pages (bucket or requests per second).
+            api (TokenBucket | float): Budget for the webmasters API.
+            media (TokenBucket | float): Budget for CDN hosts.
+            default (TokenBucket | float): Budget shared by the traffic classes left to None.
+        '''
+
+        default = self._bucket(default)
+
+        self.buckets: dict[str, Union[TokenBucket, None]] = {
+            'page': self._bucket(page) or default,
+            'api': self._bucket(api) or default,
+            'media': self._bucket(media) or default
+        }
+
+    def __repr__(self) -> str:
+
+        return f'phub.RateLimiter({self.buckets})'
+
+    @staticmethod
+    def _bucket(budget: Budget) -> Union[TokenBucket, None]:
+        '''
+        Convert a budget to a bucket.
+        '''
+
+        if isinstance(budget, TokenBucket) or not budget:
+            return budget or None
+
+        return TokenBucket(rate = budget)
+
+    @classmethod
+    def from_delay(cls, delay: float) -> RateLimiter:
+        '''
+        Build a limiter that enforces a minimum delay between
+        any two requests.
+
+        Args:
+            delay (float): The delay in seconds.
+
+        Returns:
+            RateLimiter: The limiter.
+        '''
+
+        if not delay:
+            return cls()
+
+        return cls(default = TokenBucket(rate = 1 / delay))
+
+    def reserve(self, kind: literals.url_kind) -> float:
+        '''
+        Reserve a request slot without blocking.
+
+        Args:
+            kind (str): The request traffic class.
+
+        Returns:
+            float: Time (in seconds) to wait before sending the request.
+        '''
+
+        bucket = self.buckets.get(kind)
+        return bucket.reserve() if bucket else 0
+
+    def try_acquire(self, kind: literals.url_kind) -> bool:
+        '''
+        Take a request slot only if one is immediately available.
+
+        Args:
+            kind (str): The request traffic class.
+
+        Returns:
+            bool: Whether the request can be sent now.
+        '''
+
+        bucket = self.buckets.get(kind)
+        return bucket.try_acquire() if bucket else True
+
+    def acquire(self, kind: literals.url_kind) -> None:
+        '''
+        Wait for a request slot.
+
+        Args:
+            kind (str): The request traffic class.
+        '''
+
+        if wait := self.reserve(kind):
+            logger.debug('Limiting %s request for %.3fs', kind, wait)
+            time.sleep(wait)
+
+    async def aacquire(self, kind: literals.url_kind) -> None:
+        '''
+        Wait for a request slot without blocking the event loop.
+
+        Args:
+            kind (str): The request traffic class.
+        '''
+
+        if wait := self.reserve(kind):
+            logger.debug('Limiting %s request for %.3fs', kind, wait)
+            await asyncio.sleep(wait)
+
+# EOF
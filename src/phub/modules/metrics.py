@@ -0,0 +1,279 @@
+'''
+PHUB client metrics.
+'''
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets, in seconds
+DEFAULT_BUCKETS = (.025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+
+# Metric names, types and descriptions
+DEFINITIONS = {
+    'requests_total': ('counter', 'Requests sent, by endpoint class and status'),
+    'request_seconds': ('histogram', 'Time to receive response headers, by endpoint class'),
+    'bytes_total': ('counter', 'Bytes downloaded, by endpoint class'),
+    'errors_total': ('counter', 'Requests that failed without a response, by endpoint class'),
+    'retries_total': ('counter', 'Retried attempts, by endpoint class'),
+    'throttled_total': ('counter', 'Requests rate limited by Pornhub (429), by endpoint class'),
+    'challenges_total': ('counter', 'Challenges resolved'),
+    'cache_total': ('counter', 'Response cache lookups, by outcome')
+}
+
+
+class Histogram:
+    '''
+    A cumulative histogram with fixed buckets.
+    '''
+
+    def __init__(self, buckets: tuple[float] = DEFAULT_BUCKETS) -> None:
+        '''
+        Initialise a new histogram.
+
+        Args:
+            buckets (tuple[float]): Sorted bucket upper bounds.
+        '''
+
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # Last one is +Inf
+        self.sum = 0
+        self.count = 0
+
+    def __repr__(self) -> str:
+
+        return f'phub.Histogram(count={self.count}, sum={self.sum:.3f})'
+
+    def observe(self, value: float) -> None:
+        '''
+        Record a value.
+        '''
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Union[float, None]:
+        '''
+        Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            q (float): The quantile (0 to 1).
+
+        Returns:
+            float: The estimation, or None if there are no values.
+        '''
+
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank: return bound
+
+    def snapshot(self) -> dict:
+        '''
+        Export the histogram to a dict.
+        '''
+
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.quantile(.5),
+            'p99': self.quantile(.99),
+            'buckets': dict(zip(map(str, self.buckets + ('+Inf',)), self.counts))
+        }
+
+class Metrics:
+    '''
+    A thread-safe metrics registry. Can be shared between clients.
+
+    Endpoint classes are ``page``, ``webmasters``, ``cdn`` (media
+    hosts) and ``head`` (connection probes).
+    '''
+
+    def __init__(self, buckets: tuple[float] = DEFAULT_BUCKETS) -> None:
+        '''
+        Initialise a new registry.
+
+        Args:
+            buckets (tuple[float]): Latency histograms buckets.
+        '''
+
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.reset()
+
+    def __repr__(self) -> str:
+
+        return f'phub.Metrics(requests={self.total("requests_total")})'
+
+    def reset(self) -> None:
+        '''
+        Clear all metrics.
+        '''
+
+        with self.lock:
+            self.counters: dict[str, dict[tuple, float]] = {}
+            self.histograms: dict[str, dict[tuple, Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        '''
+        Increment a counter.
+
+        Args:
+            name (str): The counter name.
+            amount (float): The increment.
+            labels (str): The counter labels.
+        '''
+
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        '''
+        Record a value in a histogram.
+
+        Args:
+            name (str): The histogram name.
+            value (float): The value.
+            labels (str): The histogram labels.
+        '''
+
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+
+            if key not in series:
+                series[key] = Histogram(self.buckets)
+
+            series[key].observe(value)
+
+    def total(self, name: str, **labels: str) -> float:
+        '''
+        Sum a counter over the series matching some labels.
+
+        Args:
+            name (str): The counter name.
+            labels (str): Labels to filter on.
+
+        Returns:
+            float: The total.
+        '''
+
+        wanted = {(k, str(v)) for k, v in labels.items()}
+
+        with self.lock:
+            return sum(value for key, value in self.counters.get(name, {}).items()
+                       if wanted <= set(key))
+
+    @property
+    def cache_hit_ratio(self) -> Union[float, None]:
+        '''
+        Part of cache lookups served without downloading the body.
+        '''
+
+        lookups = self.total('cache_total')
+        if not lookups: return None
+
+        served = self.total('cache_total', outcome = 'hit') \
+               + self.total('cache_total', outcome = 'revalidated')
+
+        return served / lookups
+
+    def snapshot(self) -> dict:
+        '''
+        Export the metrics to a plain dict.
+
+        Returns:
+            dict: Series of each metric, as label dicts with a value.
+        '''
+
+        with self.lock:
+            snapshot = {
+                name: [dict(key) | {'value': value} for key, value in series.items()]
+                for name, series in self.counters.items()
+            }
+
+            snapshot |= {
+                name: [dict(key) | hist.snapshot() for key, hist in series.items()]
+                for name, series in self.histograms.items()
+            }
+
+        snapshot['cache_hit_ratio'] = self.cache_hit_ratio
+        return snapshot
+
+    def to_prometheus(self, prefix: str = 'phub') -> str:
+        '''
+        Export the metrics in the Prometheus text format.
+
+        Args:
+            prefix (str): Metric names prefix.
+
+        Returns:
+            str: The exposition text.
+        '''
+
+        def escape(value: str) -> str:
+            # Label values escape backslashes, quotes and newlines
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        def fmt(key: tuple, **extra: str) -> str:
+            labels = list(key) + list(extra.items())
+            if not labels: return ''
+            return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in labels) + '}'
+
+        lines = []
+
+        with self.lock:
+            for name, series in [*self.counters.items(), *self.histograms.items()]:
+                kind, doc = DEFINITIONS.get(name, ('untyped', name))
+                full = f'{prefix}_{name}'
+
+                lines.append(f'# HELP {full} {doc}')
+                lines.append(f'# TYPE {full} {kind}')
+
+                for key, value in series.items():
+                    if not isinstance(value, Histogram):
+                        lines.append(f'{full}{fmt(key)} {value}')
+                        continue
+
+                    cumulative = 0
+                    for bound, count in zip(value.buckets + ('+Inf',), value.counts):
+                        cumulative += count
+                        lines.append(f'{full}_bucket{fmt(key, le = bound)} {cumulative}')
+
+                    lines.append(f'{full}_sum{fmt(key)} {value.sum}')
+                    lines.append(f'{full}_count{fmt(key)} {value.count}')
+
+        return '\n'.join(lines) + '\n'
+
+def endpoint(kind: str, method: str = 'GET') -> str:
+    '''
+    Get the endpoint class of a request.
+
+    Args:
+        kind (str): The request traffic class.
+        method (str): The request method.
+
+    Returns:
+        str: The endpoint class.
+    '''
+
+    if method == 'HEAD':
+        return 'head'
+
+    return {'api': 'webmasters', 'media': 'cdn'}.get(kind, kind)
+
+# EOF
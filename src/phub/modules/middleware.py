@@ -0,0 +1,393 @@
+'''
+PHUB request middlewares.
+
+Each call goes through an ordered chain of middlewares:
+
+- ``before_request`` hooks run in order and can rewrite the call or
+  short-circuit it by returning a response (e.g. from a cache).
+- ``after_response`` hooks run in reverse order on the response.
+- ``on_error`` hooks run in reverse order if the attempt failed, and
+  can recover by returning a response.
+
+Hooks run once per attempt, retries being handled by the client
+retry policy.
+'''
+
+from __future__ import annotations
+
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Union
+
+import httpx
+
+from .. import utils
+from .. import consts
+from .. import errors
+from .. import literals
+from . import parser
+from .metrics import endpoint
+
+if TYPE_CHECKING:
+    from ..core import Client
+    from .retry import RetryPolicy
+    from .cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Call:
+    '''
+    Represents a call going through the middleware chain.
+    '''
+
+    url: str
+    method: str = 'GET'
+    data: dict = None
+    headers: dict = None
+    timeout: float = consts.CALL_TIMEOUT
+    throw: bool = True
+    silent: bool = False
+    cache: bool = True
+    retry: RetryPolicy = None
+    stream: bool = False # Whether the body is left unread for the caller
+    attempt: int = 0
+    meta: dict[str, Any] = field(default_factory = dict) # Scratch space for middlewares
+
+    @property
+    def kind(self) -> literals.url_kind:
+        '''
+        The call traffic class.
+        '''
+
+        return utils.url_kind(self.url)
+
+def _has_body(call: Call, response: httpx.Response) -> bool:
+    '''
+    Whether a response body can be inspected. Streamed bodies
+    are only read if they are HTML pages.
+    '''
+
+    if not call.stream:
+        return True
+
+    if 'html' not in response.headers.get('content-type', ''):
+        return False
+
+    response.read()
+    return True
+
+async def _ahas_body(call: Call, response: httpx.Response) -> bool:
+    '''
+    Whether a response body can be inspected, for async clients.
+    '''
+
+    if call.stream and 'html' in response.headers.get('content-type', ''):
+        await response.aread()
+
+    return _has_body(call, response)
+
+class Middleware:
+    '''
+    Base middleware. Subclasses override the hooks they need.
+
+    Async clients call the ``a``-prefixed hooks, which default
+    to the synchronous ones.
+    '''
+
+    def __repr__(self) -> str:
+
+        return f'phub.{type(self).__name__}()'
+
+    def before_request(self, client: Client, call: Call) -> Union[httpx.Response, None]:
+        '''
+        Called before sending a request.
+
+        Args:
+            client (Client): The client sending the call.
+            call (Call): The call, which can be modified.
+
+        Returns:
+            httpx.Response: A response to short-circuit the call with, or None.
+        '''
+
+    def after_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+        '''
+        Called after receiving a response. Can raise to fail the attempt.
+
+        Args:
+            client (Client): The client sending the call.
+            call (Call): The call.
+            response (httpx.Response): The response.
+
+        Returns:
+            httpx.Response: The response to pass along.
+        '''
+
+        return response
+
+    def on_error(self, client: Client, call: Call, error: Exception) -> Union[httpx.Response, None]:
+        '''
+        Called when an attempt failed.
+
+        Args:
+            client (Client): The client sending the call.
+            call (Call): The call.
+            error (Exception): The attempt error.
+
+        Returns:
+            httpx.Response: A response to recover with, or None.
+        '''
+
+    async def abefore_request(self, client: Client, call: Call) -> Union[httpx.Response, None]:
+
+        return self.before_request(client, call)
+
+    async def aafter_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+
+        return self.after_response(client, call, response)
+
+    async def aon_error(self, client: Client, call: Call, error: Exception) -> Union[httpx.Response, None]:
+
+        return self.on_error(client, call, error)
+
+class URLMiddleware(Middleware):
+    '''
+    Fix language specific URLs and select the client host.
+    '''
+
+    @staticmethod
+    def resolve(client: Client, url: str) -> str:
+        '''
+        Build the full URL of a call.
+
+        Args:
+            client (Client): The client sending the call.
+            url (str): The URL or PH function.
+
+        Returns:
+            str: The absolute URL.
+        '''
+
+        url = utils.fix_url(url)
+
+        if 'http' in url:
+            return url
+
+        if not client.language == "en":
+            host = consts.LANGUAGE_MAPPING.get(client.language)
+            logging.debug(f"Changed PornHub root host to: {host}")
+
+        else:
+            host = consts.HOST
+
+        return utils.concat(host, url)
+
+    def before_request(self, client: Client, call: Call) -> None:
+
+        call.url = self.resolve(client, call.url)
+
+class RaiseMiddleware(Middleware):
+    '''
+    Raise an error on failed responses, if the call asks to.
+    '''
+
+    def after_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+
+        if call.throw:
+            response.raise_for_status()
+
+        return response
+
+class LimiterMiddleware(Middleware):
+    '''
+    Wait for the client limiter before sending requests.
+    '''
+
+    def before_request(self, client: Client, call: Call) -> None:
+
+        client.limiter.acquire(call.kind)
+
+    async def abefore_request(self, client: Client, call: Call) -> None:
+
+        await client.limiter.aacquire(call.kind)
+
+class TooManyRequestsMiddleware(Middleware):
+    '''
+    Detect silent 429 errors.
+    '''
+
+    def after_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+
+        if _has_body(call, response) and b'429</title>' in response.content:
+            raise errors.TooManyRequests('Pornhub raised error 429: too many requests', response = response)
+
+        return response
+
+    async def aafter_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+
+        await _ahas_body(call, response)
+        return self.after_response(client, call, response)
+
+class ChallengeMiddleware(Middleware):
+    '''
+    Resolve Pornhub challenges and ask for the page to be reloaded.
+    '''
+
+    def after_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+
+        if not _has_body(call, response):
+            return response
+
+        challenge = consts.re.get_challenge(response.text, False)
+
+        if challenge:
+            logger.info('Challenge found, attempting to resolve')
+            parser.challenge(client, *challenge)
+
+            logger.info(f"Sleeping for {consts.CHALLENGE_TIMEOUT} seconds")
+            raise errors.RetryRequested('Challenge resolved', delay = consts.CHALLENGE_TIMEOUT)
+
+        return response
+
+    async def aafter_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+
+        await _ahas_body(call, response)
+        return self.after_response(client, call, response)
+
+class CacheMiddleware(Middleware):
+    '''
+    Serve GET calls from a persistent response cache and
+    revalidate expired entries.
+    '''
+
+    def __init__(self, cache: ResponseCache) -> None:
+        '''
+        Initialise a new cache middleware.
+
+        Args:
+            cache (ResponseCache): The response cache.
+        '''
+
+        self.cache = cache
+
+    def __repr__(self) -> str:
+
+        return f'phub.CacheMiddleware({self.cache})'
+
+    def _cacheable(self, client: Client, call: Call) -> bool:
+
+        # Account pages (tokens, favorites, history) must not be shared between sessions
+        if client.logged or any(name.lower() in ('cookie', 'authorization') for name in call.headers or ()):
+            return False
+
+        return call.cache and not call.stream and call.method == 'GET' and self.cache.cacheable(call.kind)
+
+    def before_request(self, client: Client, call: Call) -> Union[httpx.Response, None]:
+
+        call.meta.pop('cache', None)
+        if not self._cacheable(client, call):
+            return None
+
+        entry = self.cache.get(call.url, client.language)
+        if entry is None:
+            return None
+
+        if self.cache.is_fresh(entry, call.kind):
+            logger.debug('Serving %s from cache', call.url)
+            call.meta['cache'] = 'hit'
+            client.metrics.inc('cache_total', outcome = 'hit')
+            return entry.response()
+
+        call.meta['cache_entry'] = entry
+        call.headers = entry.validators | (call.headers or {})
+
+    def after_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+
+        if call.meta.get('cache') == 'hit' or not self._cacheable(client, call):
+            return response
+
+        entry = call.meta.get('cache_entry')
+
+        if entry is not None and response.status_code == 304:
+            logger.debug('Revalidated cache entry for %s', call.url)
+            self.cache.revalidated(entry, response)
+            call.meta['cache'] = 'revalidated'
+            client.metrics.inc('cache_total', outcome = 'revalidated')
+            return entry.response()
+
+        if response.is_success:
+            self.cache.store(call.url, client.language, response)
+
+        call.meta['cache'] = 'miss'
+        client.metrics.inc('cache_total', outcome = 'miss')
+        return response
+
+class MetricsMiddleware(Middleware):
+    '''
+    Record requests, latencies, bytes, retries, 429s and challenges
+    in the client metrics. Must be last in the chain so it only
+    measures network attempts.
+    '''
+
+    def before_request(self, client: Client, call: Call) -> None:
+
+        if call.attempt:
+            client.metrics.inc('retries_total', endpoint = endpoint(call.kind, call.method))
+
+        call.meta['sent'] = time.perf_counter()
+
+    def after_response(self, client: Client, call: Call, response: httpx.Response) -> httpx.Response:
+
+        point = endpoint(call.kind, call.method)
+        metrics = client.metrics
+
+        metrics.observe('request_seconds', time.perf_counter() - call.meta['sent'], endpoint = point)
+        metrics.inc('requests_total', endpoint = point, status = response.status_code)
+
+        if response.status_code == 429:
+            metrics.inc('throttled_total', endpoint = point)
+
+        # Streamed bodies are counted once read
+        if not call.stream:
+            metrics.inc('bytes_total', response.num_bytes_downloaded or len(response.content), endpoint = point)
+
+        return response
+
+    def on_error(self, client: Client, call: Call, error: Exception) -> None:
+
+        point = endpoint(call.kind, call.method)
+
+        if isinstance(error, errors.TooManyRequests):
+            client.metrics.inc('throttled_total', endpoint = point)
+
+        elif isinstance(error, errors.RetryRequested):
+            client.metrics.inc('challenges_total')
+
+        elif not isinstance(error, httpx.HTTPStatusError):
+            client.metrics.inc('errors_total', endpoint = point)
+
+def defaults(cache: ResponseCache = None) -> list[Middleware]:
+    '''
+    Build the default middleware chain.
+
+    Args:
+        cache (ResponseCache): A response cache to serve calls from, if any.
+
+    Returns:
+        list[Middleware]: The middlewares, in order.
+    '''
+
+    return [
+        URLMiddleware(),
+        RaiseMiddleware(),
+        *([CacheMiddleware(cache)] if cache else []),
+        LimiterMiddleware(),
+        TooManyRequestsMiddleware(),
+        ChallengeMiddleware(),
+        MetricsMiddleware()
+    ]
+
+# EOF
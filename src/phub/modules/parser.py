@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple, Union
 
 from .. import utils
 from .. import errors
 from .. import consts
+from . import trace
 
 if TYPE_CHECKING:
     from .. import Client
@@ -15,30 +16,134 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-def resolve(video: Video) -> dict:
+class Page(NamedTuple):
     '''
-    Resolves obfuscation that protects PornHub video M3U files.
+    Data extracted from a video page, kept in place of the raw page.
+    '''
+    
+    title: str = None
+    token: str = None
+    author: tuple[str, str] = None # URL and name
+    favorite: bool = False
+    views: int = None
+    likes: tuple[int, int] = None # Up and down votes
+    tags: tuple[str, ...] = ()
+    date: str = None # ISO format
+    categories: tuple[str, ...] = ()
+    pornstars: tuple[tuple[str, str], ...] = () # URLs and names
+
+# Field of each anchor found by consts.re.scan_video
+_ANCHORS = (('var', 'flash'), ('"name', 'title'), ('token', 'token'), ('n class', 'model'),
+            ('data-event', 'channel'), ('js-', 'favorite'), ('class="views', 'views'),
+            ('class="votes', 'votes'), ('data-label="C', 'category'), ('data-label', 'tag'),
+            ('"uploadDate', 'date'), ('data-mxptype', 'pornstar'))
+
+# Fields that can appear multiple times
+_LISTS = ('tag', 'category', 'pornstar')
+
+def _count(raw: str) -> Union[int, None]:
+    '''
+    Parse a displayed counter (e.g. 1,234,567).
+    '''
+    
+    digits = ''.join(char for char in raw if char.isdigit())
+    return int(digits) if digits else None
+
+def resolve(video: Union[Video, str]) -> dict:
+    '''
+    Resolves the player flashvars of a video page.
+    Kept for compatibility, see :func:`extract`.
+    
+    Args:
+        video (Video | str): The video, whose page is fetched, or a raw video page.
+    
+    Returns:
+        dict: The player flashvars.
+    
+    Raises:
+        ParsingError: If the page has no valid flashvars.
+    '''
+    
+    if not isinstance(video, str):
+        logger.info('Resolving %s page', video)
+        video = video.client.call(video.url).text
+    
+    return extract(video)[0]
+
+@trace.traced('parser.extract')
+def extract(page: str) -> tuple[dict, Page]:
+    '''
+    Extract all the data of a video page in a single scan.
     
     Args:
-        video (Video): The object that called the parser.
+        page (str): The raw video page.
     
     Returns:
-        dict: A dictionary containing clean video data, fresh from PH.
+        tuple[dict, Page]: The player flashvars and the other page data.
+    
+    Raises:
+        ParsingError: If the page has no valid flashvars.
     '''
     
-    # NOTE - Keeping this in a separate file in case PH adds
-    # more obfuscation stuff
+    found = {}
+    votes = {}
+    lists = {kind: {} for kind in _LISTS} # Ordered sets
     
-    logger.info('Resolving %s page', video)
-    flash, ctx = consts.re.get_flash(video.page)
+    # Each anchor is matched against its field regex where it was found
+    for anchor in consts.re.scan_video(page):
+        text, start = anchor.group(), anchor.start()
+        kind = next(kind for prefix, kind in _ANCHORS if text.startswith(prefix))
+        
+        if kind in found:
+            continue
+        
+        match = getattr(consts.re, f'page_{kind}')(page, start)
+        if not match:
+            continue
+        
+        if kind == 'pornstar':
+            lists[kind][match[2], match[1]] = None
+        
+        elif kind in lists:
+            lists[kind][match[1]] = None
+        
+        elif kind == 'votes':
+            votes.setdefault(match[1], int(match[2]))
+        
+        elif kind == 'channel':
+            # The channel URL is the attribute before the anchor
+            url = page.rfind('href="', 0, start)
+            if url < 0: continue
+            found[kind] = page[url + 6:start - 2], match[1]
+        
+        else:
+            found[kind] = match.groups() or (True,)
+    
+    if 'flash' not in found:
+        logger.error('No flashvars found on page')
+        raise errors.ParsingError('Failed to find video data on page')
     
     try:
-        obj = json.loads(ctx)
-        return obj
+        flashvars = json.loads(found['flash'][0])
+    
+    except ValueError as err:
+        logger.error('Failed to parse flashvars: %s', err)
+        raise errors.ParsingError('Failed to parse video data on page') from err
+    
+    first = lambda kind: found[kind][0] if kind in found else None
     
-    except Exception:
-        logger.error('Failed to parse flash %s for video %s', flash, video)
-        raise errors.ParsingError('Failed to resolve page for', video)
+    return flashvars, Page(
+        title = first('title'),
+        token = first('token'),
+        author = found.get('model') or found.get('channel'),
+        favorite = 'favorite' in found,
+        views = _count(first('views') or ''),
+        likes = (votes['Up'], votes['Down']) if len(votes) == 2 else None,
+        tags = tuple(lists['tag']),
+        date = first('date'),
+        categories = tuple(lists['category']),
+        pornstars = tuple(lists['pornstar'])
+    )
 
 def challenge(client: Client, challenge: str, token: str) -> None:
     '''
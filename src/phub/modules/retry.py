@@ -0,0 +1,177 @@
+'''
+PHUB request retry policies.
+'''
+
+from __future__ import annotations
+
+import time
+import random
+import logging
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Union
+
+import httpx
+
+from .. import consts
+from .. import literals
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetryPolicy:
+    '''
+    Decides whether and when a failed call should be retried.
+    '''
+
+    attempts: int = consts.MAX_CALL_RETRIES # Maximum amount of attempts
+    base: float = consts.MAX_CALL_TIMEOUT # Delay before the first retry
+    cap: float = consts.MAX_CALL_BACKOFF # Maximum delay between two attempts
+    jitter: float = .5 # Part of the delay that is randomized (0 to 1)
+    deadline: float = None # Maximum total time spent on a call, retries included
+    statuses: tuple[int] = (429, 500, 502, 503, 504) # Response status codes worth retrying
+    retry_after: bool = True # Whether to honor server Retry-After headers
+
+    retryable: tuple[type[Exception]] = field(default = (httpx.TransportError, ConnectionError), repr = False)
+    fatal: tuple[type[Exception]] = field(default = (httpx.UnsupportedProtocol,), repr = False)
+
+    def is_retryable(self, error: Exception) -> bool:
+        '''
+        Classify an error.
+
+        Args:
+            error (Exception): The error raised by the attempt.
+
+        Returns:
+            bool: Whether retrying can solve this error.
+        '''
+
+        if isinstance(error, self.fatal):
+            return False
+
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.statuses
+
+        return isinstance(error, self.retryable)
+
+    def backoff(self, attempt: int) -> float:
+        '''
+        Compute a capped exponential backoff with jitter.
+
+        Args:
+            attempt (int): The index of the failed attempt.
+
+        Returns:
+            float: The delay in seconds.
+        '''
+
+        delay = min(self.cap, self.base * 2 ** attempt)
+        return delay * (1 - self.jitter * random.random())
+
+    def parse_retry_after(self, response: httpx.Response) -> Union[float, None]:
+        '''
+        Read the server Retry-After header, if any.
+
+        Args:
+            response (httpx.Response): The failed response.
+
+        Returns:
+            float: The delay in seconds, or None if there is no usable header.
+        '''
+
+        if not self.retry_after or response is None:
+            return None
+
+        raw = response.headers.get('Retry-After')
+        if not raw: return None
+
+        try:
+            delay = float(raw)
+
+        except ValueError:
+            try:
+                date = parsedate_to_datetime(raw)
+                delay = (date - datetime.now(timezone.utc)).total_seconds()
+
+            except (TypeError, ValueError):
+                logger.warning('Invalid Retry-After header: %s', raw)
+                return None
+
+        return min(max(delay, 0), consts.MAX_RETRY_AFTER)
+
+    def wait(self,
+             attempt: int,
+             started: float,
+             error: Exception = None,
+             response: httpx.Response = None,
+             delay: float = None) -> Union[float, None]:
+        '''
+        Decide what to do after a failed attempt.
+
+        Args:
+            attempt (int): The index of the failed attempt.
+            started (float): Monotonic time at which the call started.
+            error (Exception): The error raised by the attempt, if any.
+            response (httpx.Response): The failed response, if any.
+            delay (float): Force a delay instead of the computed backoff.
+
+        Returns:
+            float: The delay before the next attempt, or None to give up.
+        '''
+
+        if attempt + 1 >= self.attempts:
+            return None
+
+        if error is not None and not self.is_retryable(error):
+            return None
+
+        if delay is None:
+            delay = self.parse_retry_after(response or getattr(error, 'response', None))
+
+        if delay is None:
+            delay = self.backoff(attempt)
+
+        if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+            logger.info('Retry deadline of %ss reached', self.deadline)
+            return None
+
+        return delay
+
+    def copy(self, **changes) -> RetryPolicy:
+        '''
+        Copy the policy with some changes.
+
+        Returns:
+            RetryPolicy: The new policy.
+        '''
+
+        return replace(self, **changes)
+
+def get_policies(policy: Union[RetryPolicy, dict[literals.url_kind, RetryPolicy], None]) -> dict[literals.url_kind, RetryPolicy]:
+    '''
+    Build the policies of each traffic class.
+
+    Args:
+        policy (RetryPolicy | dict): A policy for all traffic classes, or overrides per class.
+
+    Returns:
+        dict: A policy for each traffic class.
+    '''
+
+    if isinstance(policy, RetryPolicy):
+        return dict.fromkeys(DEFAULT_POLICIES, policy)
+
+    return DEFAULT_POLICIES | (policy or {})
+
+DEFAULT_POLICIES: dict[literals.url_kind, RetryPolicy] = {
+    'page': RetryPolicy(deadline = 120),
+    'api': RetryPolicy(deadline = 120),
+    'media': RetryPolicy(attempts = consts.DOWNLOAD_SEGMENT_MAX_ATTEMPS,
+                         base = consts.DOWNLOAD_SEGMENT_ERROR_DELAY,
+                         cap = 4,
+                         deadline = 60)
+}
+
+# EOF
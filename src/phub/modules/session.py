@@ -0,0 +1,268 @@
+'''
+PHUB persistent login sessions.
+'''
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import logging
+import tempfile
+from dataclasses import dataclass, field, asdict
+from typing import TYPE_CHECKING, Union
+
+from .. import errors
+
+if TYPE_CHECKING:
+    from ..core import Client
+
+logger = logging.getLogger(__name__)
+
+# Session format version, bumped on incompatible changes
+VERSION = 1
+
+# Account fields of the login response needed to reconnect an account
+ACCOUNT_KEYS = ('username', 'avatar', 'premium_redirect_cookie')
+
+
+@dataclass
+class Session:
+    '''
+    Represents a saved login session.
+    '''
+
+    email: str
+    language: str
+    cookies: list[dict]
+    account: dict
+    created: float = field(default_factory = time.time)
+    token: str = None
+    token_time: float = None
+
+    @property
+    def age(self) -> float:
+        '''
+        Time since the login.
+        '''
+
+        return time.time() - self.created
+
+    @property
+    def token_age(self) -> Union[float, None]:
+        '''
+        Time since the granted token was fetched, if any.
+        '''
+
+        return None if self.token_time is None else time.time() - self.token_time
+
+    def sync(self, client: Client) -> None:
+        '''
+        Update the saved cookies from a client session.
+
+        Args:
+            client (Client): The client using the session.
+        '''
+
+        self.cookies = [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain,
+                         'path': cookie.path, 'expires': cookie.expires}
+                        for cookie in client.session.cookies.jar]
+
+class SessionStore:
+    '''
+    Save client sessions (cookies, account data and granted token)
+    to a local file, so restarted clients can skip the login.
+
+    The file is only readable by its owner. If a key is given, it
+    is also encrypted (requires the ``cryptography`` package).
+    Restored sessions are trusted until they are used, and clients
+    log in again if they turn out to be stale.
+    '''
+
+    def __init__(self,
+                 path: Union[str, os.PathLike] = 'phub-session.json',
+                 key: Union[str, bytes] = None,
+                 max_age: float = 7 * 24 * 60 * 60,
+                 token_ttl: float = 60 * 60) -> None:
+        '''
+        Initialise a new session store.
+
+        Args:
+            path (PathLike): The session file path.
+            key (str | bytes): A Fernet key to encrypt the file with.
+            max_age (float): Time after which sessions are not restored, in seconds.
+            token_ttl (float): Time after which granted tokens are fetched again, in seconds.
+        '''
+
+        self.path = os.fspath(path)
+        self.max_age = max_age
+        self.token_ttl = token_ttl
+        self.fernet = None
+
+        if key is not None:
+            try:
+                from cryptography.fernet import Fernet # type: ignore
+
+            except ImportError as err:
+                raise ImportError('Session encryption requires the cryptography package') from err
+
+            self.fernet = Fernet(key)
+
+    def __repr__(self) -> str:
+
+        return f'phub.SessionStore(path={self.path}, encrypted={self.fernet is not None})'
+
+    def load(self) -> Union[Session, None]:
+        '''
+        Read the saved session.
+
+        Returns:
+            Session: The session, or None if there is no saved session.
+
+        Raises:
+            SessionError: If the file is unreadable or has another format version.
+        '''
+
+        try:
+            with open(self.path, 'rb') as file:
+                raw = file.read()
+
+        except FileNotFoundError:
+            return None
+
+        try:
+            if self.fernet:
+                raw = self.fernet.decrypt(raw)
+
+            data = json.loads(raw)
+            version = data.pop('version', None)
+
+        except Exception as err:
+            raise errors.SessionError(f'Unreadable session file {self.path}') from err
+
+        if version != VERSION:
+            raise errors.SessionError(f'Session file {self.path} has version {version}, expected {VERSION}')
+
+        try:
+            return Session(**data)
+
+        except TypeError as err:
+            raise errors.SessionError(f'Malformed session file {self.path}') from err
+
+    def save(self, session: Session) -> None:
+        '''
+        Write a session, replacing the previous one.
+
+        Args:
+            session (Session): The session to save.
+        '''
+
+        raw = json.dumps({'version': VERSION} | asdict(session)).encode()
+
+        if self.fernet:
+            raw = self.fernet.encrypt(raw)
+
+        # Write to a private temporary file first so readers never see partial sessions
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp = tempfile.mkstemp(prefix = '.phub-session-', dir = directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(raw)
+
+            os.chmod(temp, 0o600)
+            os.replace(temp, self.path)
+
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+        logger.debug('Saved session to %s', self.path)
+
+    def clear(self) -> None:
+        '''
+        Delete the saved session.
+        '''
+
+        try:
+            os.unlink(self.path)
+
+        except FileNotFoundError:
+            pass
+
+    def capture(self, client: Client, account: dict) -> Session:
+        '''
+        Build a session from a freshly logged client.
+
+        Args:
+            client (Client): The logged client.
+            account (dict): The login response.
+
+        Returns:
+            Session: The new session.
+        '''
+
+        session = Session(
+            email = client.credentials['email'],
+            language = client.language,
+            cookies = [],
+            account = {key: account.get(key) for key in ACCOUNT_KEYS}
+        )
+
+        session.sync(client)
+        return session
+
+    def restore(self, client: Client) -> Union[Session, None]:
+        '''
+        Load the saved session into a client, if it belongs
+        to the same account and is not too old.
+
+        Args:
+            client (Client): The client to restore.
+
+        Returns:
+            Session: The restored session, or None.
+        '''
+
+        try:
+            session = self.load()
+
+        except errors.SessionError as err:
+            logger.warning('Ignoring saved session: %s', err)
+            return None
+
+        if session is None:
+            return None
+
+        if session.email != client.credentials['email'] or session.language != client.language:
+            logger.info('Saved session belongs to another account or language')
+            return None
+
+        if session.age > self.max_age:
+            logger.info('Saved session is too old to be restored')
+            return None
+
+        now = time.time()
+        for cookie in session.cookies:
+            if cookie['expires'] is None or cookie['expires'] > now:
+                client.session.cookies.set(cookie['name'], cookie['value'],
+                                           domain = cookie['domain'], path = cookie['path'])
+
+        logger.info('Restored session of %s (%ss old)', session.account.get('username'), round(session.age))
+        return session
+
+    def token(self, session: Session) -> Union[str, None]:
+        '''
+        Get the saved granted token, if it is still fresh.
+
+        Args:
+            session (Session): The current session.
+
+        Returns:
+            str: The granted token, or None.
+        '''
+
+        if session.token and session.token_age < self.token_ttl:
+            return session.token
+
+# EOF
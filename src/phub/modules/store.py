@@ -0,0 +1,262 @@
+'''
+PHUB persistent video metadata store.
+'''
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import Callable, Iterator, Union
+
+from .. import literals
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS videos (
+    key TEXT NOT NULL,
+    language TEXT NOT NULL,
+    source TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    stored REAL NOT NULL,
+    PRIMARY KEY (key, language, source)
+);
+'''
+
+
+@dataclass
+class StoreEntry:
+    '''
+    Represents a stored video source.
+    '''
+
+    key: str
+    source: str
+    payload: dict
+    stored: float
+
+    @property
+    def age(self) -> float:
+        '''
+        Time since the entry was stored.
+        '''
+
+        return time.time() - self.stored
+
+class MetadataStore:
+    '''
+    An on-disk store for video data, shared safely between threads
+    and processes (SQLite in WAL mode).
+
+    Each source of a video (webmasters data or parsed page) is
+    stored by viewkey and client language. Fresh entries are served
+    as is. Stale entries are served too, while a background thread
+    refreshes them, unless they are older than ``max_stale``.
+    '''
+
+    def __init__(self,
+                 path: Union[str, os.PathLike] = 'phub-store.db',
+                 ttl: dict[literals.video_source, float] = None,
+                 max_stale: float = 7 * 24 * 60 * 60,
+                 workers: int = 2) -> None:
+        '''
+        Initialise a new store.
+
+        Args:
+            path (PathLike): The database path.
+            ttl (dict): Time to live of each source in seconds.
+            max_stale (float): Maximum age of served stale entries in seconds, or None for no limit.
+            workers (int): Maximum amount of concurrent background refreshes.
+        '''
+
+        self.path = os.fspath(path)
+        self.ttl = DEFAULT_TTL | (ttl or {})
+        self.max_stale = max_stale
+        self.workers = workers
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor = None
+        self._refreshing: dict[tuple, Future] = {}
+
+        self.db.executescript(_SCHEMA)
+
+        logger.debug('Initialised metadata store at %s', self.path)
+
+    def __repr__(self) -> str:
+
+        return f'phub.MetadataStore(path={self.path})'
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        '''
+        The database connection of the current thread.
+        '''
+
+        if not (db := getattr(self._local, 'db', None)):
+            db = sqlite3.connect(self.path, timeout = 30, isolation_level = None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+
+        return db
+
+    def is_fresh(self, entry: StoreEntry) -> bool:
+        '''
+        Whether an entry can be served without refreshing it.
+        '''
+
+        return entry.age < (self.ttl.get(entry.source) or 0)
+
+    def get(self, key: str, language: str, source: literals.video_source) -> Union[StoreEntry, None]:
+        '''
+        Look up an entry.
+
+        Args:
+            key (str): The video viewkey.
+            language (str): The client language.
+            source (str): The video source ('data' or 'page').
+
+        Returns:
+            StoreEntry: The entry, or None if it is missing or too stale.
+        '''
+
+        row = self.db.execute('SELECT payload, stored FROM videos WHERE key = ? AND language = ? AND source = ?',
+                              (key, language, source)).fetchone()
+
+        if row is None:
+            return None
+
+        entry = StoreEntry(key, source, json.loads(row[0]), row[1])
+
+        if self.max_stale is not None and entry.age > self.max_stale:
+            logger.debug('Ignoring outdated %s entry of %s', source, key)
+            return None
+
+        return entry
+
+    def save(self, key: str, language: str, source: literals.video_source, payload: dict) -> None:
+        '''
+        Save a video source.
+
+        Args:
+            key (str): The video viewkey.
+            language (str): The client language.
+            source (str): The video source ('data' or 'page').
+            payload (dict): The JSON serializable source data.
+        '''
+
+        self.db.execute('INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?)',
+                        (key, language, source, json.dumps(payload), time.time()))
+
+    def entries(self, language: str) -> Iterator[tuple[str, dict[literals.video_source, dict]]]:
+        '''
+        Iterate all stored videos of a language, regardless of their age.
+
+        Args:
+            language (str): The client language.
+
+        Returns:
+            Iterator[tuple]: The viewkey and payload of each source of the videos.
+        '''
+
+        key, sources = None, {}
+        for row in self.db.execute('SELECT key, source, payload FROM videos WHERE language = ? ORDER BY key',
+                                   (language,)):
+
+            if row[0] != key:
+                if sources:
+                    yield key, sources
+
+                key, sources = row[0], {}
+
+            sources[row[1]] = json.loads(row[2])
+
+        if sources:
+            yield key, sources
+
+    def revalidate(self, key: str, language: str, source: literals.video_source, refresh: Callable[[], None]) -> None:
+        '''
+        Refresh a stale entry in the background. Does nothing
+        if the entry is already being refreshed.
+
+        Args:
+            key (str): The video viewkey.
+            language (str): The client language.
+            source (str): The video source ('data' or 'page').
+            refresh (Callable): Fetches the source and saves it.
+        '''
+
+        task = (key, language, source)
+
+        with self._lock:
+            if task in self._refreshing:
+                return
+
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers = self.workers, thread_name_prefix = 'phub-store')
+
+            logger.debug('Refreshing %s entry of %s in background', source, key)
+            self._refreshing[task] = self._pool.submit(self._refresh, task, refresh)
+
+    def _refresh(self, task: tuple, refresh: Callable[[], None]) -> None:
+        '''
+        Run a background refresh.
+        '''
+
+        try:
+            refresh()
+
+        except Exception as err:
+            # Keep serving the stale entry
+            logger.warning('Failed to refresh %s entry of %s: %s', task[2], task[0], err)
+
+        finally:
+            with self._lock:
+                self._refreshing.pop(task, None)
+
+    def wait(self, timeout: float = None) -> None:
+        '''
+        Wait for background refreshes to finish.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds.
+        '''
+
+        with self._lock:
+            futures = list(self._refreshing.values())
+
+        wait(futures, timeout)
+
+    def invalidate(self, key: str, language: str = None, source: literals.video_source = None) -> None:
+        '''
+        Remove the entries of a video.
+
+        Args:
+            key (str): The video viewkey.
+            language (str): Only remove entries of this language.
+            source (str): Only remove entries of this source.
+        '''
+
+        self.db.execute('DELETE FROM videos WHERE key = ? AND language = COALESCE(?, language) '
+                        'AND source = COALESCE(?, source)', (key, language, source))
+
+    def clear(self) -> None:
+        '''
+        Remove all entries.
+        '''
+
+        self.db.execute('DELETE FROM videos')
+
+DEFAULT_TTL: dict[literals.video_source, float] = {
+    'data': 24 * 60 * 60,
+    'page': 6 * 60 * 60
+}
+
+# EOF
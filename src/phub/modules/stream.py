@@ -0,0 +1,228 @@
+'''
+PHUB streamed responses.
+'''
+
+from __future__ import annotations
+
+import logging
+from typing import IO, Iterator, AsyncIterator, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class Stream:
+    '''
+    A streamed response body, read by chunks or into
+    caller-supplied buffers.
+    '''
+
+    def __init__(self, response: httpx.Response, chunk_size: int = None) -> None:
+        '''
+        Initialise a new stream.
+
+        Args:
+            response (httpx.Response): A response opened with ``stream=True``.
+            chunk_size (int): Size of the yielded chunks, if they need to be fixed.
+        '''
+
+        self.response = response
+        self.chunk_size = chunk_size
+
+        self._chunks: Iterator[bytes] = None
+        self._pending = memoryview(b'')
+
+    def __repr__(self) -> str:
+
+        return f'phub.Stream(url={self.response.url}, status={self.status_code})'
+
+    @property
+    def status_code(self) -> int:
+        '''
+        The response status code.
+        '''
+
+        return self.response.status_code
+
+    @property
+    def is_success(self) -> bool:
+        '''
+        Whether the response is successful.
+        '''
+
+        return self.response.is_success
+
+    @property
+    def headers(self) -> httpx.Headers:
+        '''
+        The response headers.
+        '''
+
+        return self.response.headers
+
+    @property
+    def length(self) -> Union[int, None]:
+        '''
+        The body length announced by the server, if any.
+        '''
+
+        if 'content-encoding' in self.headers:
+            return None
+
+        length = self.headers.get('content-length')
+        return int(length) if length and length.isdigit() else None
+
+    def _next(self) -> bytes:
+        '''
+        Get the next chunk of the body, or an empty one at the end.
+        '''
+
+        if self._chunks is None:
+            self._chunks = self.response.iter_bytes(self.chunk_size)
+
+        return next(self._chunks, b'')
+
+    def __iter__(self) -> Iterator[bytes]:
+        '''
+        Iterate over the body chunks.
+        '''
+
+        if self._pending:
+            yield self._pending.tobytes()
+            self._pending = memoryview(b'')
+
+        while chunk := self._next():
+            yield chunk
+
+    def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        '''
+        Read the body into a buffer.
+
+        Args:
+            buffer (bytearray | memoryview): A writable buffer.
+
+        Returns:
+            int: Amount of bytes read. Zero means the body is fully read.
+        '''
+
+        view = memoryview(buffer).cast('B')
+        filled = 0
+
+        while filled < len(view):
+            if not self._pending:
+                self._pending = memoryview(self._next())
+                if not self._pending: break
+
+            size = min(len(view) - filled, len(self._pending))
+            view[filled:filled + size] = self._pending[:size]
+            self._pending = self._pending[size:]
+            filled += size
+
+        return filled
+
+    def read(self) -> bytes:
+        '''
+        Read the rest of the body.
+
+        Returns:
+            bytes: The body.
+        '''
+
+        return b''.join(self)
+
+    def write_to(self, file: IO[bytes]) -> int:
+        '''
+        Write the rest of the body to a file.
+
+        Args:
+            file (IO): A binary file.
+
+        Returns:
+            int: Amount of bytes written.
+        '''
+
+        written = 0
+        for chunk in self:
+            file.write(chunk)
+            written += len(chunk)
+
+        return written
+
+class AsyncStream(Stream):
+    '''
+    A streamed response body, for async clients.
+    '''
+
+    async def _anext(self) -> bytes:
+        '''
+        Get the next chunk of the body, or an empty one at the end.
+        '''
+
+        if self._chunks is None:
+            self._chunks = self.response.aiter_bytes(self.chunk_size)
+
+        try:
+            return await self._chunks.__anext__()
+
+        except StopAsyncIteration:
+            return b''
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        '''
+        Iterate over the body chunks.
+        '''
+
+        if self._pending:
+            yield self._pending.tobytes()
+            self._pending = memoryview(b'')
+
+        while chunk := await self._anext():
+            yield chunk
+
+    def __iter__(self):
+
+        raise TypeError('Use `async for` with async streams')
+
+    async def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        '''
+        Read the body into a buffer.
+        See :meth:`Stream.readinto`.
+        '''
+
+        view = memoryview(buffer).cast('B')
+        filled = 0
+
+        while filled < len(view):
+            if not self._pending:
+                self._pending = memoryview(await self._anext())
+                if not self._pending: break
+
+            size = min(len(view) - filled, len(self._pending))
+            view[filled:filled + size] = self._pending[:size]
+            self._pending = self._pending[size:]
+            filled += size
+
+        return filled
+
+    async def read(self) -> bytes:
+        '''
+        Read the rest of the body.
+        '''
+
+        return b''.join([chunk async for chunk in self])
+
+    async def write_to(self, file: IO[bytes]) -> int:
+        '''
+        Write the rest of the body to a file.
+        See :meth:`Stream.write_to`.
+        '''
+
+        written = 0
+        async for chunk in self:
+            file.write(chunk)
+            written += len(chunk)
+
+        return written
+
+# EOF
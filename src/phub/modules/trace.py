@@ -0,0 +1,351 @@
+'''
+PHUB tracing spans.
+
+Spans are only recorded while at least one exporter is
+registered, so instrumentation is close to free otherwise.
+'''
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import json
+import time
+import logging
+import itertools
+import threading
+import contextvars
+from functools import wraps
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import IO, Any, Callable, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+_ids = itertools.count(1)
+_current: contextvars.ContextVar[Union[Span, None]] = contextvars.ContextVar('phub_span', default = None)
+
+
+@dataclass
+class Span:
+    '''
+    Represents a timed operation.
+    '''
+
+    name: str
+    id: int
+    parent: int = None # Parent span id
+    start: float = 0 # Epoch time
+    duration: float = None
+    thread: str = None
+    error: str = None
+    attributes: dict[str, Any] = field(default_factory = dict)
+
+    def set(self, **attributes: Any) -> None:
+        '''
+        Add attributes to the span.
+        '''
+
+        self.attributes.update(attributes)
+
+class Exporter:
+    '''
+    Base span exporter.
+    '''
+
+    def on_start(self, span: Span) -> None:
+        '''
+        Called when a span starts.
+        '''
+
+    def on_end(self, span: Span) -> None:
+        '''
+        Called when a span ends.
+        '''
+
+class MemoryExporter(Exporter):
+    '''
+    Keep finished spans in memory.
+    '''
+
+    def __init__(self) -> None:
+
+        self.spans: list[Span] = []
+        self.lock = threading.Lock()
+
+    def __repr__(self) -> str:
+
+        return f'phub.MemoryExporter(spans={len(self.spans)})'
+
+    def on_end(self, span: Span) -> None:
+
+        with self.lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        '''
+        Remove recorded spans.
+        '''
+
+        with self.lock:
+            self.spans.clear()
+
+class JSONLinesExporter(Exporter):
+    '''
+    Write finished spans to a JSON lines file.
+    '''
+
+    def __init__(self, file: Union[str, os.PathLike, IO[str]]) -> None:
+        '''
+        Initialise a new exporter.
+
+        Args:
+            file (PathLike | IO): A path to append to, or a text file.
+        '''
+
+        self.owned = not isinstance(file, io.IOBase)
+        self.file = open(file, 'a', encoding = 'utf-8') if self.owned else file
+        self.lock = threading.Lock()
+
+    def __repr__(self) -> str:
+
+        return f'phub.JSONLinesExporter(file={getattr(self.file, "name", self.file)})'
+
+    def on_end(self, span: Span) -> None:
+
+        line = json.dumps(asdict(span), default = str)
+
+        with self.lock:
+            self.file.write(line + '\n')
+
+    def close(self) -> None:
+        '''
+        Close the file, if it was opened by the exporter.
+        '''
+
+        self.file.flush()
+        if self.owned: self.file.close()
+
+class OpenTelemetryExporter(Exporter):
+    '''
+    Forward spans to OpenTelemetry. Requires the
+    ``opentelemetry-api`` package.
+    '''
+
+    def __init__(self, tracer: Any = None) -> None:
+        '''
+        Initialise a new exporter.
+
+        Args:
+            tracer (opentelemetry.trace.Tracer): The tracer to use. Defaults to the global one.
+        '''
+
+        try:
+            from opentelemetry import trace as otel # type: ignore
+
+        except ImportError as err:
+            raise ImportError('OpenTelemetry export requires the opentelemetry-api package') from err
+
+        self.otel = otel
+        self.tracer = tracer or otel.get_tracer('phub')
+        self.live: dict[int, Any] = {}
+
+    def __repr__(self) -> str:
+
+        return f'phub.OpenTelemetryExporter(tracer={self.tracer})'
+
+    def on_start(self, span: Span) -> None:
+
+        parent = self.live.get(span.parent)
+        context = self.otel.set_span_in_context(parent) if parent else None
+
+        self.live[span.id] = self.tracer.start_span(
+            span.name,
+            context = context,
+            start_time = int(span.start * 1e9)
+        )
+
+    def on_end(self, span: Span) -> None:
+
+        if (otel_span := self.live.pop(span.id, None)) is None:
+            return
+
+        for key, value in span.attributes.items():
+            otel_span.set_attribute(key, value if isinstance(value, (str, int, float, bool)) else str(value))
+
+        if span.error:
+            otel_span.set_status(self.otel.Status(self.otel.StatusCode.ERROR, span.error))
+
+        otel_span.end(end_time = int((span.start + span.duration) * 1e9))
+
+exporters: list[Exporter] = []
+
+def add_exporter(exporter: Exporter) -> Exporter:
+    '''
+    Start sending spans to an exporter.
+
+    Args:
+        exporter (Exporter): The exporter.
+
+    Returns:
+        Exporter: The same exporter.
+    '''
+
+    exporters.append(exporter)
+    return exporter
+
+def remove_exporter(exporter: Exporter) -> None:
+    '''
+    Stop sending spans to an exporter.
+    '''
+
+    if exporter in exporters:
+        exporters.remove(exporter)
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Union[Span, None]]:
+    '''
+    Record a span around a block.
+
+    Args:
+        name (str): The span name.
+        attributes: Span attributes.
+
+    Returns:
+        Span: The span, or None if tracing is disabled.
+    '''
+
+    if not exporters:
+        yield None
+        return
+
+    parent = _current.get()
+    current = Span(name, next(_ids), parent and parent.id, time.time(),
+                   thread = threading.current_thread().name, attributes = attributes)
+
+    for exporter in exporters:
+        exporter.on_start(current)
+
+    token = _current.set(current)
+    started = time.perf_counter()
+
+    try:
+        yield current
+
+    except BaseException as err:
+        current.error = repr(err)
+        raise
+
+    finally:
+        current.duration = time.perf_counter() - started
+        _current.reset(token)
+
+        for exporter in exporters:
+            exporter.on_end(current)
+
+def traced(name: str) -> Callable:
+    '''
+    Decorate a function to record a span around its calls.
+
+    Args:
+        name (str): The span name.
+    '''
+
+    def decorator(func: Callable) -> Callable:
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+
+            if not exporters:
+                return func(*args, **kwargs)
+
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+def propagate(func: Callable) -> Callable:
+    '''
+    Bind a function to the current span, so spans it records
+    in another thread are nested correctly. Bind once per task,
+    as a bound function can't run in two threads at once.
+
+    Args:
+        func (Callable): The function.
+
+    Returns:
+        Callable: The bound function.
+    '''
+
+    if not exporters:
+        return func
+
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(func, *args, **kwargs)
+
+def breakdown(spans: list[Span]) -> list[dict]:
+    '''
+    Aggregate spans by name.
+
+    Args:
+        spans (list[Span]): Finished spans.
+
+    Returns:
+        list[dict]: Count, total and self time of each span name, slowest first.
+    '''
+
+    children: dict[int, float] = {}
+    for item in spans:
+        if item.parent is not None:
+            children[item.parent] = children.get(item.parent, 0) + item.duration
+
+    stages: dict[str, dict] = {}
+    for item in spans:
+        stage = stages.setdefault(item.name, {'name': item.name, 'count': 0, 'total': 0, 'self': 0, 'errors': 0})
+        stage['count'] += 1
+        stage['total'] += item.duration
+        stage['self'] += max(item.duration - children.get(item.id, 0), 0)
+        stage['errors'] += bool(item.error)
+
+    return sorted(stages.values(), key = lambda stage: stage['self'], reverse = True)
+
+@contextmanager
+def profile(file: IO[str] = None) -> Iterator[MemoryExporter]:
+    '''
+    Record spans in a block and print a per-stage breakdown.
+    
+    Self time excludes nested spans (e.g. ``video.fetch`` self time
+    excludes the ``client.call`` it waited for). Threaded spans can
+    overlap, so self times may add up to more than the wall time.
+
+    Args:
+        file (IO): Where to print the breakdown. Defaults to stderr.
+
+    Returns:
+        MemoryExporter: The exporter holding the recorded spans.
+    '''
+
+    exporter = add_exporter(MemoryExporter())
+    started = time.perf_counter()
+
+    try:
+        yield exporter
+
+    finally:
+        wall = time.perf_counter() - started
+        remove_exporter(exporter)
+
+        file = file or sys.stderr
+        print(f'{"stage":<24} {"count":>7} {"total (s)":>10} {"self (s)":>10} {"self %":>7}', file = file)
+
+        for stage in breakdown(exporter.spans):
+            share = stage['self'] / wall * 100 if wall else 0
+            print(f'{stage["name"]:<24} {stage["count"]:>7} {stage["total"]:>10.3f} '
+                  f'{stage["self"]:>10.3f} {share:>6.1f}%', file = file)
+
+        print(f'{"wall":<24} {"":>7} {wall:>10.3f}', file = file)
+
+# EOF
@@ -0,0 +1,133 @@
+'''
+PHUB transport profiles.
+'''
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Union
+
+import httpx
+
+from .. import literals
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransportProfile:
+    '''
+    Connection settings of a client sessions.
+
+    If ``media_limits`` is set, media CDN hosts (segments,
+    images, etc.) get their own connection pool so downloads
+    can't starve site and API calls.
+    '''
+
+    limits: httpx.Limits = field(default_factory = lambda: httpx.Limits(max_connections = 100, max_keepalive_connections = 20)) # Site pool limits
+    media_limits: httpx.Limits = None # Separate media pool limits, if any
+    http2: bool = False # Whether to use HTTP/2 multiplexing (requires the h2 package)
+    keepalive_expiry: float = 5 # Time before idle connections are closed
+    prewarm: int = 0 # Connections to open to the media host before a download starts
+
+    def __post_init__(self) -> None:
+
+        if self.http2 and not _has_h2():
+            logger.warning('HTTP/2 requires the h2 package (pip install httpx[http2]). Falling back to HTTP/1.1')
+            self.http2 = False
+
+    @property
+    def separate_media(self) -> bool:
+        '''
+        Whether media hosts use their own pool.
+        '''
+
+        return self.media_limits is not None
+
+    def session_args(self, kind: literals.url_kind = 'page') -> dict:
+        '''
+        Get the session arguments for a pool.
+
+        Args:
+            kind (str): The traffic class of the pool.
+
+        Returns:
+            dict: Keyword arguments for httpx.Client or httpx.AsyncClient.
+        '''
+
+        limits = self.media_limits if kind == 'media' and self.separate_media else self.limits
+
+        return {
+            'http2': self.http2,
+            'limits': httpx.Limits(
+                max_connections = limits.max_connections,
+                max_keepalive_connections = limits.max_keepalive_connections,
+                keepalive_expiry = self.keepalive_expiry
+            )
+        }
+
+    def copy(self, **changes) -> TransportProfile:
+        '''
+        Copy the profile with some changes.
+
+        Returns:
+            TransportProfile: The new profile.
+        '''
+
+        return replace(self, **changes)
+
+def _has_h2() -> bool:
+    '''
+    Check if HTTP/2 support is installed.
+    '''
+
+    try:
+        import h2 # type: ignore
+        return True
+
+    except ImportError:
+        return False
+
+def get_profile(profile: Union[TransportProfile, str, None]) -> TransportProfile:
+    '''
+    Get a transport profile.
+
+    Args:
+        profile (TransportProfile | str): A profile or the name of a preset.
+
+    Returns:
+        TransportProfile: The profile.
+    '''
+
+    if isinstance(profile, TransportProfile):
+        return profile
+
+    if profile not in PROFILES:
+        raise KeyError(f'Unknown transport profile `{profile}`. Must be one of {list(PROFILES)}')
+
+    return PROFILES[profile]()
+
+# Presets are built lazily since they depend on installed packages
+PROFILES = {
+    None: TransportProfile,
+    'default': TransportProfile,
+
+    # Many small page and API requests
+    'crawl': lambda: TransportProfile(
+        limits = httpx.Limits(max_connections = 32, max_keepalive_connections = 32),
+        http2 = True,
+        keepalive_expiry = 30
+    ),
+
+    # Few site requests, lots of concurrent segments
+    'download': lambda: TransportProfile(
+        limits = httpx.Limits(max_connections = 8, max_keepalive_connections = 8),
+        media_limits = httpx.Limits(max_connections = 32, max_keepalive_connections = 32),
+        http2 = True,
+        keepalive_expiry = 30,
+        prewarm = 8
+    )
+}
+
+# EOF
@@ -4,21 +4,50 @@ PHUB objects.
 
 __all__ = [
     'Image',
-    'Tag', 'Like', 'FeedItem', 'User',
-    'Feed', 'Video', 'Account',
+    'Tag', 'Like', 'FeedItem', 'Lookup', 'User',
+    'Feed', 'Video', 'VideoRecord', 'Account',
     '_BaseQuality', 'Query', 'queries', 'Playlist'
 ]
 
-# Dataclasses
-from .image import Image
-from .data import Tag, Like, FeedItem, _BaseQuality
+from typing import TYPE_CHECKING
 
-# Classes
-from .user import User
-from .feed import Feed
-from .video import Video
-from .account import Account
-from .query import Query, queries
-from .playlist import Playlist
+from .._lazy import attach
 
-# EOF
\ No newline at end of file
+# Objects are imported on first access
+__getattr__, __dir__ = attach(__name__, attributes = {
+    # Dataclasses
+    'Image': '.image',
+    'Tag': '.data',
+    'Like': '.data',
+    'FeedItem': '.data',
+    'Lookup': '.data',
+    '_BaseQuality': '.data',
+
+    # Classes
+    'User': '.user',
+    'Feed': '.feed',
+    'Video': '.video',
+    'VideoRecord': '.record',
+    'Account': '.account',
+    'Query': '.query',
+    'queries': '.query',
+    'Playlist': '.playlist'
+})
+
+# utils.Quality subclasses _BaseQuality, so utils must start
+# loading before any object module to settle the import cycle
+from .. import utils
+
+if TYPE_CHECKING:
+    from .image import Image
+    from .data import Tag, Like, FeedItem, Lookup, _BaseQuality
+
+    from .user import User
+    from .feed import Feed
+    from .video import Video
+    from .record import VideoRecord
+    from .account import Account
+    from .query import Query, queries
+    from .playlist import Playlist
+
+# EOF
@@ -14,6 +14,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Attributes set when the account connects
+ACCOUNT_DATA = ('name', 'avatar', 'is_premium', 'user')
+
 
 class Account:
     '''
@@ -46,18 +49,38 @@ class Account:
         
         self.client = client
         
-        self.name: str = None
-        self.avatar: Image = None
-        self.is_premium: bool = None
-        self.user: User = None
+        # Account data (name, avatar, is_premium, user) is set once connected
         
         # Save data keys so far, so we can make a difference with the
         # cached property ones.
-        self.loaded_keys = list(self.__dict__.keys()) + ['loaded_keys']
+        self.loaded_keys = list(self.__dict__.keys()) + list(ACCOUNT_DATA) + ['loaded_keys']
+    
+    def __getattr__(self, key: str) -> object:
+        '''
+        Get account data, logging in first if the client
+        logs in lazily.
+        '''
+        
+        if key not in ACCOUNT_DATA:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {key!r}')
+        
+        self._ensure_login()
+        return self.__dict__.get(key)
+    
+    def _ensure_login(self) -> None:
+        '''
+        Log in if the client logs in lazily, and check a restored
+        session before account-only requests. Async clients must
+        be logged in explicitly.
+        '''
+        
+        if not self.client.is_async:
+            self.client.ensure_login()
             
     def __repr__(self) -> str:
         
-        status = 'logged-out' if self.name is None else f'name={self.name}' 
+        name = self.__dict__.get('name')
+        status = 'logged-out' if name is None else f'name={name}' 
         return f'phub.Account({status})'
 
     def connect(self, data: dict) -> None:
@@ -73,7 +96,8 @@ class Account:
         self.is_premium = data.get('premium_redirect_cookie') != '0'
         
         url = consts.HOST + f'/users/{self.name}'
-        self.user = User(client = self.client, name = self.name, url = url)
+        self.user = self.client._shared(('user', consts.re.remove_host(url)),
+                                        lambda: User(client = self.client, name = self.name, url = url))
         
         # We assert that the account is from a normal user (not model, etc.)
         if not 'users/' in self.user.url:
@@ -139,6 +163,7 @@ class Account:
         
         from . import queries
         
+        self._ensure_login()
         return queries.VideoQuery(self.client, f'users/{self.name}/videos/recent')
     
     @cached_property
@@ -149,6 +174,7 @@ class Account:
         
         from . import queries
         
+        self._ensure_login()
         return queries.VideoQuery(self.client, f'users/{self.name}/videos/favorites')
     
     @cached_property
@@ -157,6 +183,7 @@ class Account:
         Get the account subscriptions.
         '''
         
+        self._ensure_login()
         page = self.client.call(f'users/{self.name}/subscriptions')
         
         for url, avatar in consts.re.get_users(page.text):
@@ -173,7 +200,8 @@ class Account:
         '''
         
         from . import Feed
-
+        
+        self._ensure_login()
         return Feed(self.client)
     
     def dictify(self,
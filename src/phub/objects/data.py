@@ -9,7 +9,7 @@ from .. import consts
 
 if TYPE_CHECKING:
     from .. import Client
-    from . import User
+    from . import User, Video
     from bs4 import BeautifulSoup as Soup
 
 
@@ -154,6 +154,24 @@ class FeedItem:
         
         return consts.FEED_CLASS_TO_CONST.get(raw)
 
+@dataclass
+class Lookup:
+    '''
+    Result of a bulk video lookup for a single key.
+    '''
+    
+    key: Union[str, Video]
+    video: Video = None
+    error: Exception = None
+    
+    @property
+    def ok(self) -> bool:
+        '''
+        Whether the lookup succeeded.
+        '''
+        
+        return self.error is None
+
 class _BaseQuality:
     '''
     Represents a constant quality object that can selects
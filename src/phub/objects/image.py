@@ -75,8 +75,9 @@ class Image:
         with open(path, 'wb') as file:
             
             try:
-                raw = self.client.call(url).content
-                file.write(raw)
+                with self.client.stream(url) as response:
+                    response.write_to(file)
+                
                 return path
                 
             except Exception as err:
@@ -88,7 +89,7 @@ class Image:
                 server = self._servers.pop(0)
                 logger.info('Retrying download with server %s', server)
                 self.url = server['src']
-                self.download(path)
+                return self.download(path)
 
     def dictify(self,
                 keys: Union[Literal['all'], list[str]] = 'all',
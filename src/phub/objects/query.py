@@ -1,22 +1,29 @@
 from __future__ import annotations
 
+import os
 import json
+import asyncio
 import logging
-from functools import cache, cached_property
-from typing import TYPE_CHECKING, Iterator, Any, Callable, Union
+from collections import deque
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterator, AsyncIterator, Any, Callable, Union
 
 from . import Video, User, FeedItem
+from .record import VideoRecord
 
 from .. import utils
 from .. import consts
 from .. import errors
+from .. import literals
+from ..modules import trace
 
 if TYPE_CHECKING:
     from ..core import Client
+    from ..frame import VideoFrame
 
 logger = logging.getLogger(__name__)
 
-QueryItem = Union[Video, FeedItem, User]
+QueryItem = Union[Video, VideoRecord, FeedItem, User]
 
 class Pages:
     '''
@@ -62,6 +69,39 @@ class Pages:
         '''
                 
         return self[:]
+    
+    async def __aiter__(self) -> AsyncIterator[Iterator[QueryItem]]:
+        '''
+        Asynchronously iterate each page.
+        Up to ``Query.READAHEAD`` next pages are fetched
+        while the current one is being consumed.
+        '''
+        
+        pending: deque[asyncio.Task] = deque()
+        index = 0
+        
+        try:
+            while 1:
+                # Schedule the current page and the ones ahead
+                while len(pending) <= self.query.READAHEAD:
+                    pending.append(asyncio.ensure_future(self.query._aget_page(index)))
+                    index += 1
+                
+                try:
+                    items = await pending.popleft()
+                
+                except errors.NoResult:
+                    return
+                
+                yield self.query._iter_page(items)
+        
+        finally:
+            for task in pending:
+                task.cancel()
+                
+                # Avoid unretrieved exception warnings
+                if task.done() and not task.cancelled():
+                    task.exception()
 
 class Query:
     '''
@@ -69,6 +109,7 @@ class Query:
     '''
     
     BASE: str = None
+    READAHEAD: int = 1 # Pages to fetch ahead when iterating asynchronously
     
     def __init__(self,
                  client: Client,
@@ -97,6 +138,12 @@ class Query:
         
         self.suppress_spicevids = True
         
+        # Compact queries yield video records and don't keep their pages
+        self.compact = client.compact
+        self._keep_pages = not self.compact
+        self._raw_pages: dict[int, str] = {}
+        self._pages: dict[int, list] = {}
+        
         logger.debug('Initialised new query %s', self)
     
     def __repr__(self) -> str:
@@ -134,6 +181,16 @@ class Query:
             for item in page:
                 yield item
     
+    async def __aiter__(self) -> AsyncIterator[QueryItem]:
+        '''
+        Asynchronously iterate through the query items.
+        Requires an async client.
+        '''
+        
+        async for page in self.pages:
+            for item in page:
+                yield item
+    
     def sample(self,
                max: int = 0,
                filter: Callable[[QueryItem], bool] = None,
@@ -165,7 +222,63 @@ class Query:
             i += 1
             yield item
     
-    @cache
+    def export(self,
+               path: Union[str, os.PathLike],
+               format: literals.export_format = None,
+               fields: list[str] = None,
+               max: int = 0,
+               **kwargs) -> int:
+        '''
+        Stream the query videos to a file (see :func:`phub.export.write`).
+        
+        Args:
+            path (PathLike): The file path.
+            format (str): The file format (jsonl, csv or parquet). Guessed from the path extension by default.
+            fields (list[str]): The columns (see :data:`phub.export.SCHEMA`).
+            max (int): Maximum amount of videos to export.
+            kwargs: Other arguments passed to :func:`phub.export.write`.
+        
+        Returns:
+            int: The amount of exported videos.
+        '''
+        
+        from .. import export
+        
+        return export.write(self._stream(max), path, format, fields, **kwargs)
+    
+    def frame(self, max: int = 0, concurrency: int = 4) -> VideoFrame:
+        '''
+        Load the query videos in a columnar frame (see :class:`phub.frame.VideoFrame`).
+        
+        Args:
+            max (int): Maximum amount of videos.
+            concurrency (int): Maximum amount of videos fetched at once.
+        
+        Returns:
+            VideoFrame: The frame.
+        '''
+        
+        from ..frame import VideoFrame
+        
+        return VideoFrame.from_query(self, max, concurrency)
+    
+    def _stream(self, max: int = 0) -> Iterator[QueryItem]:
+        '''
+        Iterate through the query items without keeping its
+        pages, so exports use constant memory.
+        
+        Args:
+            max (int): Maximum amount of items.
+        '''
+        
+        keep, self._keep_pages = self._keep_pages, False
+        
+        try:
+            yield from self.sample(max)
+        
+        finally:
+            self._keep_pages = keep
+    
     def _get_raw_page(self, index: int) -> str:
         '''
         Get the raw page.
@@ -179,15 +292,21 @@ class Query:
         
         assert isinstance(index, int)
         
-        req = self.client.call(self.url.format(page = index + 1),
-                               throw = False)
+        if index in self._raw_pages:
+            return self._raw_pages[index]
+        
+        with trace.span('query.get_raw_page', query = type(self).__name__, index = index):
+            req = self.client.call(self.url.format(page = index + 1),
+                                   throw = False)
         
         if req.status_code == 404:
             raise errors.NoResult()
         
+        if self._keep_pages:
+            self._raw_pages[index] = req.text
+        
         return req.text
     
-    @cache
     def _get_page(self, index: int) -> list:
         '''
         Get split unparsed page items.
@@ -199,8 +318,59 @@ class Query:
             list: a semi-parsed representation of the page.
         '''
         
+        if index in self._pages:
+            return self._pages[index]
+        
         raw = self._get_raw_page(index)
-        els = self._parse_page(raw)
+        
+        with trace.span('query.parse_page', query = type(self).__name__, index = index):
+            els = self._parse_page(raw)
+        
+        if not len(els):
+            raise errors.NoResult()
+        
+        if self._keep_pages:
+            self._pages[index] = els
+        
+        return els
+    
+    async def _aget_raw_page(self, index: int) -> str:
+        '''
+        Get the raw page using an async client.
+        
+        Args:
+            index (int): The page index.
+        
+        Returns:
+            str: The raw page content.
+        '''
+        
+        assert isinstance(index, int)
+        
+        req = await self.client.call(self.url.format(page = index + 1),
+                                     throw = False)
+        
+        if req.status_code == 404:
+            raise errors.NoResult()
+        
+        return req.text
+    
+    async def _aget_page(self, index: int) -> list:
+        '''
+        Get split unparsed page items using an async client.
+        
+        Args:
+            index (int): The page index:
+        
+        Returns:
+            list: a semi-parsed representation of the page.
+        '''
+        
+        with trace.span('query.get_raw_page', query = type(self).__name__, index = index):
+            raw = await self._aget_raw_page(index)
+        
+        with trace.span('query.parse_page', query = type(self).__name__, index = index):
+            els = self._parse_page(raw)
         
         if not len(els):
             raise errors.NoResult()
@@ -255,11 +425,17 @@ class queries:
         
         BASE = consts.API_ROOT
         
-        def _parse_item(self, data: dict) -> Video:
+        def _parse_item(self, data: dict) -> Union[Video, VideoRecord]:
+            
+            entries = {f'data@{k}': v for k, v in data.items()}
+            key = consts.re.get_viewkey(data['url'])
+            
+            if self.compact:
+                return VideoRecord(self.client, key, entries)
             
-            # Create the object and inject data
-            video = Video(self.client, url = data['url'])
-            video.data = {f'data@{k}': v for k, v in data.items()} | {'query@parent': self}
+            # Get the object and inject data
+            video = self.client._shared(('video', key), lambda: Video(self.client, url = data['url']))
+            video.data |= entries | {'query@parent': self}
             
             return video
         
@@ -301,28 +477,35 @@ class queries:
             
             return {'mediabook': None, 'markers': ''} | data | public_data | {'raw': raw}
         
-        def _parse_item(self, raw: str) -> Video:
+        def _parse_item(self, raw: str) -> Union[Video, VideoRecord]:
             
             # Parse data
             data = self._eval_video(raw)
             
-            url = f'{consts.HOST}view_video.php?viewkey={data["key"]}'
-            obj = Video(self.client, url)
-            
-            # Override the _as_query property since we already have a query 
-            obj._as_query = data
-            
-            obj.data = {
+            entries = {
                 # Property overrides
                 'page@video_title': data["title"],
                 'data@thumb': data["image"],
-                'page@id': id,
+                'page@id': data["id"].lstrip('v'),
                 
                 # Custom query properties
-                'query@parent': self,
-                'query@watched': 'videos/recent' in self.url
+                'query@watched': 'videos/recent' in self.url,
+                'query@markers': data['markers']
             }
             
+            # Records keep what query-only properties need instead of the raw item
+            if self.compact:
+                entries['query@preview'] = data.get('preview')
+                entries['query@watched'] |= 'class="watchedVideoText' in raw
+                return VideoRecord(self.client, data['key'], entries)
+            
+            url = f'{consts.HOST}view_video.php?viewkey={data["key"]}'
+            obj = self.client._shared(('video', data['key']), lambda: Video(self.client, url))
+            
+            # Override the _as_query property since we already have a query 
+            obj._as_query = data
+            obj.data |= entries | {'query@parent': self}
+            
             return obj
         
         def _parse_page(self, raw: str) -> list:
@@ -336,7 +519,7 @@ class queries:
 
                 # Yield each object of the page, but only if it does not have the spicevids
                 # markers and we explicitely suppress spicevids videos.
-                if not(self.suppress_spicevids and 'premiumIcon' in wrapped._as_query['markers']):
+                if not(self.suppress_spicevids and 'premiumIcon' in wrapped.data['query@markers']):
                     yield wrapped
                 
                 else:
@@ -391,5 +574,9 @@ class queries:
         @cached_property
         def pages(self):
             return []
+        
+        async def __aiter__(self):
+            return
+            yield
 
 # EOF
\ No newline at end of file
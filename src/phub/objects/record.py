@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from .. import consts
+
+if TYPE_CHECKING:
+    from ..core import Client
+    from ..modules.parser import Page
+    from . import Video
+
+logger = logging.getLogger(__name__)
+
+
+class VideoRecord:
+    '''
+    A compact video, yielded by compact queries.
+
+    Records only hold the data parsed so far (without raw HTML
+    or reference to their query). Other attributes are read from
+    a full :py:class:`.Video`, created on first access.
+    '''
+
+    __slots__ = ('client', 'key', 'data', 'page', '_video', '__weakref__')
+
+    def __init__(self,
+                 client: Client,
+                 key: str,
+                 data: dict[str, Any],
+                 page: Page = None) -> None:
+        '''
+        Initialise a new video record.
+
+        Args:
+            client (Client): The parent client.
+            key (str): The video viewkey.
+            data (dict): Parsed data, with the same keys as ``Video.data``.
+            page (Page): Extracted video page data, if any.
+        '''
+
+        self.client = client
+        self.key = key
+        self.data = data
+        self.page = page
+        self._video = None
+
+    def __repr__(self) -> str:
+
+        return f'phub.VideoRecord(key={self.key})'
+
+    def __getattr__(self, name: str) -> Any:
+
+        # Private names are never forwarded (e.g. copy and pickle probes)
+        if name.startswith('_'):
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+        return getattr(self.video, name)
+
+    @property
+    def url(self) -> str:
+        '''
+        The video URL.
+        '''
+
+        return f'{consts.HOST}view_video.php?viewkey={self.key}'
+
+    @property
+    def video(self) -> Video:
+        '''
+        The full video object, built from the record on first access.
+        '''
+
+        if self._video is None:
+            from .video import Video
+
+            logger.debug('Upgrading %s', self)
+            video = self.client._shared(('video', self.key), lambda: Video(self.client, self.url))
+            video.data |= self.data
+            
+            if self.page is not None:
+                video.page = self.page
+
+            # Rebuild the listing data used by query-only properties
+            if 'query@preview' in self.data:
+                video._as_query = {
+                    'id': self.data.get('page@id'),
+                    'key': self.key,
+                    'title': self.data.get('page@video_title'),
+                    'image': self.data.get('data@thumb'),
+                    'preview': self.data['query@preview'],
+                    'markers': self.data.get('query@markers', ''),
+                    'raw': ''
+                }
+
+            self._video = video
+
+        return self._video
+
+# EOF
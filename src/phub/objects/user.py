@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Literal, Union
 from .. import utils
 from .. import consts
 from .. import errors
+from ..modules import trace
 
 if TYPE_CHECKING:
     from ..core import Client
@@ -102,15 +103,15 @@ class User:
         if video.page is None:
             video.fetch('page@')
         
-        guess = consts.re.video_model(video.page, throw = False) or \
-                consts.re.video_channel(video.page, throw = False)
+        guess = video.page.author
         
         if not guess:
             logger.error('Author of %s not found', video)
             raise errors.RegexError('Could not find user for video', video)
         
-        return cls(client = video.client, name = guess[1],
-                   url = utils.concat(consts.HOST, guess[0]))
+        url = utils.concat(consts.HOST, guess[0])
+        return video.client._shared(('user', consts.re.remove_host(url)),
+                                    lambda: cls(client = video.client, name = guess[1], url = url))
     
     @classmethod
     def get(cls, client: Client, user: str) -> 'User':
@@ -135,22 +136,24 @@ class User:
             name = '-'.join(user.split())
             
             # Guess the user type
-            for type_ in ('model', 'pornstar', 'channels'):            
+            with trace.span('user.guess_type', user = name):
+                for type_ in ('model', 'pornstar', 'channels'):            
+                    
+                    guess = utils.concat(type_, name)
+                    response = utils.head(client, guess)
+                    
+                    if response:
+                        logger.info('Guessing type of %s is %s', user, type_)
+                        url = str(response)
+                        user_type = type_
+                        break
                 
-                guess = utils.concat(type_, name)
-                response = utils.head(client, guess)
-                
-                if response:
-                    logger.info('Guessing type of %s is %s', user, type_)
-                    url = response
-                    user_type = type_
-                    break
-            
-            else:
-                logger.error('Could not guess type of %s', user)
-                raise errors.UserNotFound(f'User {user} not found.')
+                else:
+                    logger.error('Could not guess type of %s', user)
+                    raise errors.UserNotFound(f'User {user} not found.')
         
-        return cls(client = client, name = name, type = user_type, url = url)
+        return client._shared(('user', consts.re.remove_host(url)),
+                              lambda: cls(client = client, name = name, type = user_type, url = url))
     
     @cached_property
     def _supports_queries(self) -> _QuerySupportIndex:
@@ -2,18 +2,23 @@ from __future__ import annotations
 
 import html
 import os
+import time
 import random
+import asyncio
 import logging
+import threading
 from functools import cached_property
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Iterator, Literal, Callable, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal, Callable, Any, Union
 
 from . import Tag, Like, User, Image
+from .record import VideoRecord
 from .. import utils
 from .. import errors
 from .. import consts
 from .. import literals
-from ..modules import download, parser, display
+from ..modules import download, parser, display, trace
 
 if TYPE_CHECKING:
     from ..core import Client
@@ -21,6 +26,46 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Guards loaded sources against background refreshes
+_merge_lock = threading.Lock()
+
+def _freeze(value: Any) -> Any:
+    '''
+    Convert JSON lists back to tuples.
+    '''
+
+    return tuple(map(_freeze, value)) if isinstance(value, list) else value
+
+# Where each field can be read from, by order of preference.
+# 'page' needs the video page, 'page.<name>' a field of the parsed
+# page, and other entries a key of Video.data.
+# Fields without sources are either known or listing-only.
+FIELDS: dict[str, tuple[str, ...]] = {
+    'url':             (),
+    'key':             (),
+    'id':              ('page@id', 'page@playbackTracking', 'page@image_url', 'data@thumb'),
+    'title':           ('page@video_title', 'data@title'),
+    'image':           ('page@image_url', 'data@thumb'),
+    'is_vertical':     ('page@isVertical',),
+    'duration':        ('page@video_duration', 'data@duration'),
+    'tags':            ('page.tags', 'data@tags'),
+    'likes':           ('page.likes', 'data@ratings'),
+    'views':           ('page.views', 'data@views'),
+    'hotspots':        ('page@hotspots',),
+    'date':            ('page.date', 'data@publish_date'),
+    'pornstars':       ('page.pornstars', 'data@pornstars'),
+    'categories':      ('page.categories', 'data@categories'),
+    'orientation':     ('data@segment',),
+    'author':          ('page.author',),
+    'is_HD':           ('page@isHD',),
+    'is_VR':           ('page@isVR',),
+    'embed':           ('page@embedCode', 'page@id', 'page@playbackTracking', 'page@image_url', 'data@thumb'),
+    'is_favorite':     ('page',),
+    'is_free_premium': (),
+    'preview':         (),
+    'watched':         ()
+}
+
 
 class Video:
     '''
@@ -50,12 +95,14 @@ class Video:
         self.url = url
         self.key = consts.re.get_viewkey(url)
         self.data: dict = {}  # The video webmasters data
+        self.requests = 0  # Requests sent to fetch data
+        self.loaded_at: dict[str, float] = {}  # When each source was loaded
 
-        if self.use_webmaster_api is False:
-            self.page = self.fetch("page@")
+        if self.use_webmaster_api is False and not client.is_async:
+            self.fetch("page@")
 
         else:
-            self.page: str = None  # The video page content
+            self.page: parser.Page = None  # The video page data
 
         # Save data keys so far, so we can make a difference with the
         # cached property ones.
@@ -69,27 +116,91 @@ class Video:
 
         return f'phub.Video(key={self.key})'
 
-    def refresh(self, page: bool = True, data: bool = True) -> None:
+    def refresh(self, page: bool = True, data: bool = True, fields: Iterable[str] = None) -> None:
         '''
         Refresh video data.
         
         Args:
             page (bool): Whether to refresh the video page.
             data (bool): Whether to refresh the video data.
+            fields (Iterable[str]): Only refresh these fields, fetching them again right away
+                                    through the cheapest sources. Overrides page and data.
         '''
 
+        if fields is not None:
+            return self._refresh_fields(list(fields))
+
         logger.info('Refreshing %s cache', self)
 
         # Clear saved video page and data 
         if page: self.page = None
         if data: self.data.clear()
 
+        # Don't restore them from the client store
+        if self.client.store is not None:
+            for source, refreshed in (('page', page), ('data', data)):
+                if refreshed: self.client.store.invalidate(self.key, self.client.language, source)
+
         # Clear properties cache
         for key in list(self.__dict__.keys()):
             if not key in self.loaded_keys:
                 logger.debug('Deleting key %s', key)
                 delattr(self, key)
 
+    def _refresh_fields(self, fields: list[str]) -> None:
+        '''
+        Refresh some fields, and only their cached properties.
+        
+        Args:
+            fields (list[str]): The field names (see :data:`FIELDS`).
+        '''
+
+        if self.client.is_async:
+            raise RuntimeError('Refreshing fields requires a sync client.')
+
+        keys = self._plan(fields, cached = False)
+        logger.info('Refreshing fields %s of %s from %s', fields, self, keys)
+
+        for field in fields:
+            self.__dict__.pop(field, None)
+
+            # Drop page copies, so fields are read from the fresh webmasters data
+            if 'page@' not in keys:
+                for source in self._sources(field):
+                    if source.startswith('page@'):
+                        self.data.pop(source, None)
+
+                    elif source.startswith('page.') and self.page is not None:
+                        name = source[5:]
+                        self.page = self.page._replace(**{name: parser.Page._field_defaults[name]})
+
+        # Refreshed data must not come from the response cache
+        with trace.span('video.refresh', video = self.key, keys = ','.join(keys)):
+            self._run([trace.propagate(lambda source: self._download(source, cache = False)) for _ in keys],
+                      [key[:-1] for key in keys])
+
+    def revalidate(self, ttl: dict[str, Union[float, None]] = None) -> list[str]:
+        '''
+        Refresh the fields older than their time to live.
+        
+        Args:
+            ttl (dict): Time to live of each field in seconds, or None for never.
+                        Defaults to the client freshness policy.
+        
+        Returns:
+            list[str]: The refreshed fields.
+        '''
+
+        ttl = self.client.freshness if ttl is None else ttl
+
+        stale = [field for field, seconds in ttl.items()
+                 if seconds is not None and (age := self._age(field)) is not None and age > seconds]
+
+        if stale:
+            self._refresh_fields(stale)
+
+        return stale
+
     def fetch(self, key: str) -> Any:
         '''
         Lazily fetch some data.
@@ -107,65 +218,441 @@ class Video:
         
         '''
 
+        key = self._resolve_key(key)
+
+        # If key is already cached 
+        if key in self.data or self._restore(key.split('@')[0]):
+            return self.data.get(key)
+
+        if self.client.is_async:
+            raise RuntimeError(f'Key {key} is not cached. Use `await video.afetch(...)` with async clients.')
+
+        logger.debug('Fetching %s key %s', self, key)
+
+        with trace.span('video.fetch', key = key, video = self.key):
+            self._download(key.split('@')[0])
+
+        return self.data.get(key)
+
+    def _download(self, source: literals.video_source, cache: bool = True, started: float = None) -> None:
+        '''
+        Fetch a video source from the network.
+        
+        Args:
+            source (str): The source to fetch ('data' or 'page').
+            cache (bool): Whether the response cache can serve it.
+            started (float): When a background refresh started. Its result is
+                             dropped if the source was loaded since.
+        '''
+
+        self.requests += 1
+
+        # Fetch only webmasters data
+        if source == 'data':
+            self._load_data(self.client.call(self._api_url, cache = cache).json(), started)
+
+        # Fetch raw page
+        elif source == 'page':
+            self._load_page(self.client.call(self.url, cache = cache).text, started)
+
+    async def afetch(self, key: str) -> Any:
+        '''
+        Lazily fetch some data using an async client.
+        See :meth:`Video.fetch` for the key format.
+        
+        Once a key is fetched, properties depending on it
+        can be accessed synchronously.
+        
+        Args:
+            key (str): The key to fetch.
+        
+        Returns:
+            Any: The fetched or cached object.
+        '''
+
+        key = self._resolve_key(key)
+
+        if key in self.data or self._restore(key.split('@')[0]):
+            return self.data.get(key)
+
+        logger.debug('Fetching %s key %s', self, key)
+        self.requests += 1
+
+        with trace.span('video.fetch', key = key, video = self.key):
+            
+            if key.startswith('data@'):
+                self._load_data((await self.client.call(self._api_url)).json())
+
+            elif key.startswith('page@'):
+                self._load_page((await self.client.call(self.url)).text)
+
+        return self.data.get(key)
+
+    def _resolve_key(self, key: str) -> str:
+        '''
+        Choose between data and page keys considering cache.
+        
+        Args:
+            key (str): The key to resolve.
+        
+        Returns:
+            str: A data@ or page@ key.
+        '''
+
         # Multiple keys handle
         if '|' in key:
             datakey, pagekey = key.split('|')
 
             if self.page and self.use_webmaster_api is False:
-                key = 'page@' + pagekey
+                return 'page@' + pagekey
 
-            else:
-                key = 'data@' + datakey
+            return 'data@' + datakey
 
-        # If key is already cached 
-        if key in self.data:
-            return self.data.get(key)
+        return key
 
-        logger.debug('Fetching %s key %s', self, key)
+    @property
+    def _api_url(self) -> str:
+        '''
+        The webmasters URL of the video.
+        '''
 
-        # Fetch only webmasters data
-        if key.startswith('data@'):
-            url = utils.concat(consts.API_ROOT, 'video_by_id?id=' + self.key)
-            data = self.client.call(url).json()
+        return utils.concat(consts.API_ROOT, 'video_by_id?id=' + self.key)
+
+    def _load_data(self, data: dict, started: float = None) -> None:
+        '''
+        Inject webmasters data.
+        
+        Args:
+            data (dict): The webmasters API response.
+            started (float): When a background refresh started, if any.
+        
+        Raises:
+            RegionBlocked: If the video is not available in the client country.
+            VideoError: If the video is not available.
+        '''
+
+        if 'message' in data:
+            logger.warning('Video %s is not available. Error code: %s', self, data.get('code'))
 
-            if 'message' in data:
-                logger.warning('Video %s is not available. Error code: %s', self, data.get('code'))
+            if data.get('code') == "2002":
+                raise errors.RegionBlocked("The video is not available in your country.")
 
-                if data.get('code') == "2002":
-                    raise errors.RegionBlocked("The video is not available in your country.")
+            else:
+                raise errors.VideoError(f'Video is not available. Reason: {data["message"]}')
 
-                else:
-                    raise errors.VideoError(f'Video is not available. Reason: {data["message"]}')
+        with _merge_lock:
+            if self._outdated('data', started):
+                return
 
             self.data |= {f'data@{k}': v for k, v in data['video'].items()}
+            self.loaded_at['data'] = time.time()
 
-        # Fetch raw page
-        elif key.startswith('page@'):
-            self.page = self.client.call(self.url).text
-            data = parser.resolve(self)
+        self._save('data', data['video'])
+
+    def _load_page(self, page: str, started: float = None) -> None:
+        '''
+        Inject the video page data. The raw page is not kept.
+        
+        Args:
+            page (str): The raw video page.
+            started (float): When a background refresh started, if any.
+        '''
+
+        data, extracted = parser.extract(page)
+
+        with _merge_lock:
+            if self._outdated('page', started):
+                return
+
+            self.page = extracted
             self.data |= {f'page@{k}': v for k, v in data.items()}
+            self.loaded_at['page'] = time.time()
 
-        return self.data.get(key)
+        # Account data can't be reused by other sessions
+        self._save('page', {'flashvars': data, 'page': extracted._replace(token = None, favorite = False)._asdict()})
+
+    def _outdated(self, source: str, started: Union[float, None]) -> bool:
+        '''
+        Whether a background refresh result is older than the loaded source.
+        '''
+
+        if started is not None and self.loaded_at.get(source, 0) > started:
+            logger.debug('Dropping background refresh of %s %s, loaded since', self, source)
+            return True
+
+        return False
+
+    def _save(self, source: literals.video_source, payload: dict) -> None:
+        '''
+        Save a fetched source to the client store, if any.
+        
+        Args:
+            source (str): The source name ('data' or 'page').
+            payload (dict): The JSON serializable source data.
+        '''
+
+        if self.client.store is not None:
+            self.client.store.save(self.key, self.client.language, source, payload)
+
+    def _restore(self, source: str) -> bool:
+        '''
+        Load a source from the client store, if any. Stale sources
+        are refreshed in the background (sync clients only).
+        
+        Args:
+            source (str): The source name ('data' or 'page').
+        
+        Returns:
+            bool: Whether the source was restored.
+        '''
+
+        store = self.client.store
+        if store is None or source not in ('data', 'page'):
+            return False
+
+        entry = store.get(self.key, self.client.language, source)
+        if entry is None:
+            return False
+
+        stale = not store.is_fresh(entry)
+
+        # Async clients can't refresh in a thread
+        if stale and self.client.is_async:
+            return False
+
+        logger.debug('Restored %s %s from store', self, source)
+
+        with _merge_lock:
+            self.loaded_at[source] = entry.stored
+
+            if source == 'data':
+                self.data |= {f'data@{k}': v for k, v in entry.payload.items()}
+
+            else:
+                self.data |= {f'page@{k}': v for k, v in entry.payload['flashvars'].items()}
+                self.page = parser.Page(**{k: _freeze(v) for k, v in entry.payload['page'].items()
+                                           if k in parser.Page._fields})
+
+        # The stale payload is applied first, so it never overwrites the refresh
+        if stale:
+            started = time.time()
+            store.revalidate(self.key, self.client.language, source,
+                             trace.propagate(lambda: self._download(source, cache = False, started = started)))
+
+        return True
+
+    def _account_page(self) -> parser.Page:
+        '''
+        Get the video page, with account data (token and favorite).
+        
+        Returns:
+            Page: The video page data.
+        '''
+
+        if not self.page:
+            self.fetch('page@')
+
+        # Pages restored from the store or the response cache have no account data
+        if self.page.token is None and not self.client.is_async:
+            with trace.span('video.fetch', key = 'page@', video = self.key):
+                self._download('page', cache = False)
+
+        return self.page
+
+    def _sources(self, field: str) -> tuple[str, ...]:
+        '''
+        Get the sources of a field (see :data:`FIELDS`).
+        '''
+
+        # Translated titles are read from the page
+        if field == 'title' and self.change_titles:
+            return ('page',)
+
+        return FIELDS.get(field, ())
+
+    def _has(self, source: str) -> bool:
+        '''
+        Whether a field source is loaded.
+        '''
+
+        if source == 'page':
+            return self.page is not None
+
+        if source.startswith('page.'):
+            return self.page is not None and getattr(self.page, source[5:]) not in (None, ())
+
+        return source in self.data
+
+    def _age(self, field: str) -> Union[float, None]:
+        '''
+        Time since the source serving a field was loaded.
+        Sources of unknown age (e.g. query data) are considered outdated.
+        
+        Args:
+            field (str): The field name.
+        
+        Returns:
+            float: The field age in seconds, or None if it is not loaded.
+        '''
+
+        for source in self._sources(field):
+            if self._has(source):
+                return time.time() - self.loaded_at.get('data' if source.startswith('data@') else 'page', 0)
+
+    def _plan(self, fields: Iterable[str], cached: bool = True) -> list[str]:
+        '''
+        Find the smallest set of sources serving some fields.
+        
+        Args:
+            fields (Iterable[str]): The field names (see :data:`FIELDS`).
+            cached (bool): Whether to skip fields already served by the loaded sources.
+        
+        Returns:
+            list[str]: The keys to fetch (``data@`` and/or ``page@``).
+        '''
+
+        required, flexible = set(), []
+
+        for field in fields:
+            if field not in FIELDS:
+                logger.warning('Cannot plan unknown field %s', field)
+                continue
+
+            sources = self._sources(field)
+
+            # Skip fields that are already cached
+            if cached and (field in self.__dict__ or any(map(self._has, sources))):
+                continue
+
+            # Listing keys can only be gained through the page
+            fetchable = {'data' if source.startswith('data@') else 'page' for source in sources}
+
+            # A loaded page won't give more
+            if cached and self.page is not None:
+                fetchable.discard('page')
+
+            if len(fetchable) == 1:
+                required |= fetchable
+
+            elif fetchable:
+                flexible.append(fetchable)
+
+        # Serve flexible fields with planned sources, or with the lighter webmasters API
+        for fetchable in flexible:
+            if not fetchable & required:
+                required.add('data')
+
+        return [source + '@' for source in sorted(required)]
+
+    def prefetch(self, fields: Iterable[str], users: bool = True) -> list[str]:
+        '''
+        Fetch the data needed by some fields, in as few requests as possible.
+        Sources are fetched concurrently, and pornstars looked up in parallel.
+        The fields can then be read without further requests.
+        
+        Args:
+            fields (Iterable[str]): The field names (e.g. ``['title', 'views', 'pornstars']``).
+            users (bool): Whether to look pornstars up, if they are not on the page.
+        
+        Returns:
+            list[str]: The fetched keys.
+        '''
+
+        fields = list(fields)
+        keys = self._plan(fields)
+
+        with trace.span('video.prefetch', video = self.key, keys = ','.join(keys)):
+            self._run([trace.propagate(self.fetch) for _ in keys], keys)
+
+            # Pornstars missing from the page may each need up to 3 requests
+            if users and 'pornstars' in fields and 'pornstars' not in self.__dict__ \
+               and not (self.page and self.page.pornstars):
+                names = [ps['pornstar_name'] for ps in self.fetch('data@pornstars')]
+
+                if names:
+                    with ThreadPoolExecutor(max_workers = min(len(names), 8)) as pool:
+                        futures = [pool.submit(trace.propagate(User.get), self.client, name) for name in names]
+                        self.pornstars = [future.result() for future in futures]
+
+        return keys
+
+    def _run(self, funcs: list[Callable], args: list) -> None:
+        '''
+        Call functions concurrently (one thread each).
+        
+        Args:
+            funcs (list[Callable]): The functions.
+            args (list): The argument of each function.
+        '''
+
+        if len(funcs) == 1:
+            funcs[0](args[0])
+
+        elif funcs:
+            with ThreadPoolExecutor(max_workers = len(funcs)) as pool:
+                for future in [pool.submit(func, arg) for func, arg in zip(funcs, args)]:
+                    future.result()
+
+    async def aprefetch(self, fields: Iterable[str]) -> list[str]:
+        '''
+        Fetch the data needed by some fields using an async client.
+        See :meth:`Video.prefetch`. Pornstars are not looked up.
+        
+        Args:
+            fields (Iterable[str]): The field names.
+        
+        Returns:
+            list[str]: The fetched keys.
+        '''
+
+        keys = self._plan(fields)
+
+        with trace.span('video.prefetch', video = self.key, keys = ','.join(keys)):
+            await asyncio.gather(*(self.afetch(key) for key in keys))
+
+        return keys
 
     def dictify(self,
                 keys: Literal['all'] | list[str] = 'all',
-                recursive: bool = False) -> dict:
+                recursive: bool = False,
+                fields: Literal['all'] | list[str] = None) -> dict:
         '''
         Convert the object to a dictionary.
         
         Args:
             keys (str): The data keys to include.
             recursive (bool): Whether to allow other PHUB objects to dictify.
+            fields (str): The data keys to include, prefetched beforehand
+                          (see :meth:`prefetch`). Overrides ``keys``.
         
         Returns:
             dict: A dict version of the object.
         '''
 
-        return utils.dictify(self, keys, [
+        all_ = [
             'url', 'key', 'title', 'image', 'is_vertical', 'duration',
-            'tags', 'like', 'views', 'hotspots', 'date', 'pornstars',
+            'tags', 'likes', 'views', 'hotspots', 'date', 'pornstars',
             'categories', 'orientation', 'author'
-        ], recursive)
+        ]
+
+        if fields is not None:
+            keys = [fields] if isinstance(fields, str) else fields
+            keys = all_ if 'all' in keys else keys
+            self.prefetch(keys)
+
+        return utils.dictify(self, keys, all_, recursive)
+
+    def compact(self) -> VideoRecord:
+        '''
+        Get a compact record of the video, holding its data
+        but not its query.
+        
+        Returns:
+            VideoRecord: The video record.
+        '''
+
+        data = {k: v for k, v in self.data.items() if k != 'query@parent'}
+        return VideoRecord(self.client, self.key, data, self.page)
 
     # === Download methods === #
 
@@ -296,6 +783,14 @@ class Video:
         if 'success' in res and not res['success']:
             raise Exception(f'Call failed: `{res.get("message")}`')
 
+    @cached_property
+    def _token(self) -> str:
+        '''
+        The video page token.
+        '''
+
+        return self._account_page().token
+
     @cached_property
     def _as_query(self) -> dict[str, str]:
         '''
@@ -417,6 +912,56 @@ class Video:
 
         self._assert_internal_success(res.json())
 
+    async def alike(self, toggle: bool = True) -> None:
+        '''
+        Set the video like value using an async client.
+        See :meth:`like`.
+        '''
+
+        token = await self.client._agranted_token()
+        await self.aprefetch(['id', 'likes'])
+
+        await self.client.call('video/rate', 'POST', dict(
+            id=self.id,
+            current=self.likes.up,
+            value=int(toggle),
+            token=token
+        ))
+
+    async def afavorite(self, toggle: bool = True) -> None:
+        '''
+        Set video as favorite or not using an async client.
+        See :meth:`favorite`.
+        '''
+
+        token = await self.client._agranted_token()
+        await self.aprefetch(['id'])
+
+        res = await self.client.call('video/favourite', 'POST', dict(
+            toggle=int(toggle),
+            id=self.id,
+            token=token
+        ))
+
+        self._assert_internal_success(res.json())
+
+    async def awatch_later(self, toggle: bool = True) -> None:
+        '''
+        Add or remove the video to the watch later playlist using an async client.
+        See :meth:`watch_later`.
+        '''
+
+        token = await self.client._agranted_token()
+        await self.aprefetch(['id'])
+        mod = 'add' if toggle else 'remove'
+
+        res = await self.client.call(f'playlist/video_{mod}_watchlater', 'POST', dict(
+            vid=self.id,
+            token=token
+        ))
+
+        self._assert_internal_success(res.json())
+
     # === Data properties === #
 
     @cached_property
@@ -443,7 +988,7 @@ class Video:
             if not self.page:
                 self.fetch("page@")
 
-            return html.unescape(consts.re.fixed_title(self.page))
+            return html.unescape(self.page.title or self.data['page@video_title'])
 
         else:
             return html.unescape(self.data.get('page@video_title')  # Use page title if cached
@@ -501,7 +1046,10 @@ class Video:
         The video tags.
         '''
 
-        # TODO - Can be harvested on page
+        # Use page tags if the page is loaded
+        if self.page and self.page.tags:
+            return [Tag(name) for name in self.page.tags]
+
         return [Tag(tag['tag_name'])
                 for tag in self.fetch('data@tags')]
 
@@ -511,7 +1059,10 @@ class Video:
         Positive and negative reviews of the video.
         '''
 
-        # TODO - Can be harvested on page
+        if self.page and self.page.likes:
+            up, down = self.page.likes
+            return Like(up=up, down=down, ratings=up / (up + down) if up + down else 0)
+
         rating = self.fetch('data@rating') / 100
         counter = self.fetch('data@ratings')
 
@@ -525,7 +1076,9 @@ class Video:
         How many people watched the video.
         '''
 
-        # TODO - Can be harvested on page
+        if self.page and self.page.views is not None:
+            return self.page.views
+
         return self.fetch('data@views')
 
     @cached_property
@@ -542,6 +1095,9 @@ class Video:
         The video publish date.
         '''
 
+        if self.page and self.page.date:
+            return datetime.strptime(self.page.date[:19], '%Y-%m-%dT%H:%M:%S')
+
         raw = self.fetch('data@publish_date')
         return datetime.strptime(raw, '%Y-%m-%d %H:%M:%S')
 
@@ -551,7 +1107,13 @@ class Video:
         The pornstars present in the video.
         '''
 
-        # TODO - Can be harvested on page and cache more data
+        # The page gives the pornstar URLs directly
+        if self.page and self.page.pornstars:
+            urls = {utils.concat(consts.HOST, url): name for url, name in self.page.pornstars}
+            return [self.client._shared(('user', consts.re.remove_host(url)),
+                                        lambda url = url, name = name: User(self.client, name, url))
+                    for url, name in urls.items()]
+
         return [User.get(self.client, ps['pornstar_name'])
                 for ps in self.fetch('data@pornstars')]
 
@@ -561,6 +1123,9 @@ class Video:
         The categories of the video.
         '''
 
+        if self.page and self.page.categories:
+            return list(self.page.categories)
+
         return [item['category'] for item in self.fetch('data@categories')]
 
     @cached_property
@@ -638,7 +1203,8 @@ class Video:
         Whether the video was viewed previously by the account.
         '''
 
-        assert self.client.logged, 'Client must be logged in to use this property'
+        logged = self.client.logged if self.client.is_async else self.client.ensure_login()
+        assert logged, 'Client must be logged in to use this property'
 
         # Use query sortcut if possible
         if self.data.get('query@watched'):
@@ -660,6 +1226,6 @@ class Video:
         Whether the video has been set as favorite by the client.
         '''
 
-        return bool(consts.re.is_favorite(self.page, False))
+        return self._account_page().favorite
 
 # EOF
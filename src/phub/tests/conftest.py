@@ -0,0 +1,48 @@
+'''
+Helpers shared by the offline tests.
+'''
+
+import httpx
+
+try:
+    from phub import Client
+    from phub.modules.retry import RetryPolicy
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client
+    from ...phub.modules.retry import RetryPolicy
+
+KEYS = [f'ph{i:013x}' for i in range(1, 7)]
+FAST = RetryPolicy(attempts = 3, base = .01, cap = .02)
+
+def listing(keys: list[str]) -> str:
+    '''
+    Build a search result page containing the given videos.
+    '''
+
+    items = ''.join(f'<li class="pcVideoListItem videoblock" id="v{i}" data-video-vkey="{key}">'
+                    f'<a title="Video {key}"><img src="https://ei.phncdn.com/{key}.jpg"></a></div></li>'
+                    for i, key in enumerate(keys))
+    return f'<div class="container"><ul>{items}</ul></div>'
+
+def search_page(request: httpx.Request, keys: list[str] = KEYS, size: int = 3) -> httpx.Response:
+    '''
+    Serve the requested search page, 404 past the last one.
+    '''
+
+    page = int(request.url.params['page'])
+    keys = keys[(page - 1) * size: page * size]
+    if not keys: return httpx.Response(404, text = '')
+    return httpx.Response(200, text = listing(keys))
+
+def mock_client(handler, *args, cls: type = Client, **kwargs) -> Client:
+    '''
+    Build a client whose requests are answered by handler.
+    '''
+
+    client = cls(*args, **kwargs)
+    session = httpx.AsyncClient if client.is_async else httpx.Client
+    client.session = session(transport = httpx.MockTransport(handler), follow_redirects = True)
+    return client
+
+# EOF
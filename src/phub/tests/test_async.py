@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+import pytest
+
+try:
+    from phub import AsyncClient, Video
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import AsyncClient, Video
+
+from .conftest import KEYS, search_page, mock_client
+
+def handler(request: httpx.Request) -> httpx.Response:
+    url = str(request.url)
+    
+    if 'video/search' in url:
+        return search_page(request)
+    
+    if 'video_by_id' in url:
+        key = request.url.params['id']
+        return httpx.Response(200, json = {'video': {'title': key, 'views': 42}})
+    
+    return httpx.Response(404, text = '')
+
+def make_client() -> AsyncClient:
+    return mock_client(handler, cls = AsyncClient)
+
+def test_async_search():
+    
+    async def main():
+        async with make_client() as client:
+            query = await client.search('test')
+            return [video async for video in query]
+    
+    videos = asyncio.run(main())
+    assert [video.key for video in videos] == KEYS
+
+def test_async_fetch():
+    
+    async def main():
+        async with make_client() as client:
+            videos = [await client.get(key) for key in KEYS]
+            await asyncio.gather(*(video.afetch('data@') for video in videos))
+            return videos
+    
+    videos = asyncio.run(main())
+    assert all(isinstance(video, Video) for video in videos)
+    assert [video.views for video in videos] == [42] * len(KEYS)
+
+def test_async_account_interactions():
+    sent = {}
+    
+    def account_handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        sent[path] = request.content.decode()
+        
+        if path == '/front/authenticate':
+            return httpx.Response(200, json = {'success': '1', 'username': 'bob', 'premium_redirect_cookie': '0',
+                                               'avatar': 'https://ci.phncdn.com/a.jpg'})
+        
+        if 'video_by_id' in path:
+            return httpx.Response(200, json = {'video': {'rating': 50, 'ratings': 4,
+                'thumb': 'https://ei.phncdn.com/videos/202401/01/123456/original/(m=e)1.jpg'}})
+        
+        if path == '/video/rate':
+            return httpx.Response(200, json = {})
+        
+        return httpx.Response(200, text = '<a href="/users/bob"><script>var token = "tok",</script>')
+    
+    client = mock_client(account_handler, 'bob@example.com', 'pass', cls = AsyncClient)
+    
+    async def main():
+        async with client:
+            video = await client.get(KEYS[0])
+            
+            # Sync interactions can't fetch the token
+            with pytest.raises(RuntimeError):
+                client._granted_token
+            
+            await video.alike()
+    
+    asyncio.run(main())
+    assert client.logged and client._granted_token == 'tok'
+    assert sent['/video/rate'] == 'id=123456&current=2&value=1&token=tok'
+
+# EOF
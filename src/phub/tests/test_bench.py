@@ -0,0 +1,48 @@
+import httpx
+
+try:
+    from phub.bench import suite, runner, imports
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub.bench import suite, runner, imports
+
+def test_suite_runs_offline(tmp_path):
+    names = suite.select(['parser.extract', 'JSONQuery*', 're.get_flash'])
+    assert len(names) == 3
+    
+    results = list(suite.run(names, min_time = .01))
+    assert all(result.ops > 0 and result.p50 <= result.p99 for result in results)
+    
+    path = tmp_path / 'baseline.json'
+    runner.save(results, path)
+    baseline = runner.load(path)
+    
+    assert set(baseline) == set(names)
+    assert runner.change(results[0], baseline) == 0
+    assert 'parser.extract' in runner.report(results, baseline)
+
+def test_whole_suite_runs_offline(monkeypatch):
+    send = httpx.HTTPTransport.handle_request
+    
+    # Only the stand-in server may be reached
+    def handle_request(self, request):
+        assert request.url.host == '127.0.0.1', f'Benchmark reached {request.url}'
+        return send(self, request)
+    
+    monkeypatch.setattr(httpx.HTTPTransport, 'handle_request', handle_request)
+    
+    results = list(suite.run(min_time = .001))
+    assert [result.name for result in results] == suite.select()
+    assert all(result.skipped or result.ops > 0 for result in results)
+
+def test_import_is_lazy():
+    assert imports.loaded('import phub') == []
+    assert 'ffmpeg_progress_yield' not in imports.loaded('import phub.modules.download')
+    assert 'phub.core' in imports.loaded('phub = __import__("phub"); phub.Client')
+
+def test_import_times_exclude_startup():
+    # Measured inside the child, so never negative
+    results = imports.run({'import phub.modules': 20}, repeat = 3)
+    assert 0 < results[0]['ms'] < 1000
+
+# EOF
@@ -0,0 +1,78 @@
+import time
+import asyncio
+import threading
+
+import httpx
+
+try:
+    from phub import Client, AsyncClient, errors
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client, AsyncClient, errors
+
+KEYS = [f'ph{i:013x}' for i in range(1, 13)]
+BLOCKED, MISSING = KEYS[3], KEYS[7]
+
+class Server:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        key = request.url.params['id']
+
+        if key == BLOCKED:
+            return httpx.Response(200, json = {'code': '2002', 'message': 'Blocked'})
+
+        if key == MISSING:
+            return httpx.Response(200, json = {'code': '2001', 'message': 'Removed'})
+
+        return httpx.Response(200, json = {'video': {'title': key, 'views': int(key[2:], 16)}})
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+        time.sleep(.02)
+
+        with self.lock:
+            self.active -= 1
+
+        return self.respond(request)
+
+def check(lookups):
+    assert [lookup.key for lookup in lookups] == KEYS
+    assert [lookup.ok for lookup in lookups].count(False) == 2
+
+    assert isinstance(lookups[3].error, errors.RegionBlocked)
+    assert isinstance(lookups[7].error, errors.VideoError)
+    assert lookups[3].video is None
+
+    assert [lookup.video.views for lookup in lookups if lookup.ok] == [1, 2, 3, 5, 6, 7, 9, 10, 11, 12]
+
+def test_get_many():
+    server = Server()
+    client = Client()
+    client.session = httpx.Client(transport = httpx.MockTransport(server.handler))
+
+    lookups = client.get_many(KEYS, concurrency = 4)
+
+    check(lookups)
+    assert 1 < server.peak <= 4
+
+def test_async_get_many():
+    server = Server()
+
+    async def handler(request):
+        await asyncio.sleep(.01)
+        return server.respond(request)
+
+    async def main():
+        async with AsyncClient() as client:
+            client.session = httpx.AsyncClient(transport = httpx.MockTransport(handler))
+            return await client.get_many(KEYS, concurrency = 4)
+
+    check(asyncio.run(main()))
+
+# EOF
@@ -0,0 +1,106 @@
+import httpx
+
+try:
+    from phub import Client
+    from phub.modules.cache import ResponseCache
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client
+    from ...phub.modules.cache import ResponseCache
+
+from .conftest import mock_client
+
+def make_client(tmp_path, handler, **kwargs) -> Client:
+    return mock_client(handler, cache = ResponseCache(tmp_path / 'cache.db', **kwargs))
+
+def test_fresh_entries(tmp_path):
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, text = 'page')
+    
+    client = make_client(tmp_path, handler)
+    
+    assert client.call('video/search?b=2&a=1').text == 'page'
+    assert client.call('video/search?a=1&b=2').text == 'page'
+    assert len(calls) == 1
+    
+    # Not cached
+    client.call('video/search', method = 'POST')
+    client.call('video/search?a=1&b=2', cache = False)
+    assert len(calls) == 3
+
+def test_revalidation(tmp_path):
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304, headers = {'ETag': '"v1"'})
+        return httpx.Response(200, text = 'page', headers = {'ETag': '"v1"'})
+    
+    client = make_client(tmp_path, handler, ttl = {'page': -1})
+    
+    assert client.call('').text == 'page'
+    assert client.call('').text == 'page'
+    assert len(calls) == 2
+    assert calls[1].headers['If-None-Match'] == '"v1"'
+
+def test_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / 'cache.db', max_size = 2500, level = 0)
+    
+    for i in range(5):
+        cache.store(f'https://www.pornhub.com/{i}', 'en',
+                    httpx.Response(200, content = bytes(1000), request = httpx.Request('GET', 'https://x')))
+    
+    assert cache.get('https://www.pornhub.com/0', 'en') is None
+    assert cache.get('https://www.pornhub.com/4', 'en').body == bytes(1000)
+    assert cache.get('https://www.pornhub.com/4', 'fr') is None
+
+def test_running_size(tmp_path):
+    cache = ResponseCache(tmp_path / 'cache.db', max_size = 2500, level = 0)
+    
+    def store(i, size):
+        cache.store(f'https://www.pornhub.com/{i}', 'en',
+                    httpx.Response(200, content = bytes(size), request = httpx.Request('GET', 'https://x')))
+        return cache.db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+    
+    assert cache.size == 0
+    assert store(0, 1000) == cache.size
+    assert store(1, 1000) == cache.size
+    
+    # Replaced entries are not counted twice
+    assert store(1, 500) == cache.size < 2000
+    
+    # Nor evicted ones
+    assert store(2, 2000) == cache.size <= 2500
+    assert cache.get('https://www.pornhub.com/0', 'en') is None
+    
+    # The total survives reopening
+    assert ResponseCache(cache.path).size == cache.size
+    cache.clear()
+    assert cache.size == 0
+
+def test_account_calls_are_not_cached(tmp_path):
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, text = f'page {len(calls)}')
+    
+    client = make_client(tmp_path, handler)
+    assert client.call('users/bob/videos/favorites').text == 'page 1'
+    
+    # Logged clients neither read nor write entries
+    client.logged = True
+    assert client.call('users/bob/videos/favorites').text == 'page 2'
+    assert client.call('users/bob/videos/favorites').text == 'page 3'
+    
+    # Neither do calls carrying credentials
+    client.logged = False
+    assert client.call('users/bob/videos/recent', headers = {'Cookie': 'il=secret'}).text == 'page 4'
+    assert client.call('users/bob/videos/recent').text == 'page 5'
+    assert client.call('users/bob/videos/favorites').text == 'page 1'
+
+# EOF
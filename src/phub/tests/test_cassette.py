@@ -0,0 +1,75 @@
+import time
+import asyncio
+
+import httpx
+import pytest
+
+try:
+    from phub import Client, AsyncClient, errors
+    from phub.modules.cassette import Cassette
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client, AsyncClient, errors
+    from ...phub.modules.cassette import Cassette
+
+def handler(request):
+    if request.url.path.endswith('.ts'):
+        return httpx.Response(200, content = b'\x00' * 200_000, headers = {'content-type': 'video/mp2t'})
+    
+    return httpx.Response(200, text = f'page {request.url.path}', headers = {'content-type': 'text/html'})
+
+def record(path, urls):
+    cassette = Cassette(path, mode = 'record')
+    client = Client()
+    client.session = httpx.Client(transport = cassette.transport(httpx.MockTransport(handler)))
+    
+    for url in urls:
+        client.call(url)
+
+def test_replay(tmp_path):
+    path = tmp_path / 'run.db'
+    record(path, ['video', 'model', 'https://cdn.example/seg.ts'])
+    
+    client = Client(cassette = Cassette(path, mode = 'replay'))
+    
+    assert client.call('video').text == 'page /video'
+    assert len(client.call('https://cdn.example/seg.ts').content) == 200_000
+    
+    with pytest.raises(errors.CassetteMiss):
+        client.call('unknown')
+
+def test_replay_order(tmp_path):
+    path = tmp_path / 'run.db'
+    cassette = Cassette(path, mode = 'record')
+    pages = iter(['first', 'second'])
+    
+    client = Client(coalesce = False)
+    client.session = httpx.Client(transport = cassette.transport(
+        httpx.MockTransport(lambda request: httpx.Response(200, text = next(pages)))))
+    
+    client.call('video'), client.call('video')
+    
+    client = Client(cassette = Cassette(path, mode = 'replay'))
+    assert [client.call('video').text for _ in range(3)] == ['first', 'second', 'second']
+
+def test_bandwidth_simulation(tmp_path):
+    path = tmp_path / 'run.db'
+    record(path, ['https://cdn.example/seg.ts'])
+    
+    client = Client(cassette = Cassette(path, mode = 'replay', latency = .05, bandwidth = 2_000_000))
+    
+    start = time.perf_counter()
+    client.call('https://cdn.example/seg.ts')
+    assert time.perf_counter() - start >= .14
+
+def test_async_replay(tmp_path):
+    path = tmp_path / 'run.db'
+    record(path, ['video'])
+    
+    async def main():
+        async with AsyncClient(login = False, cassette = Cassette(path, mode = 'replay')) as client:
+            return (await client.call('video')).text
+    
+    assert asyncio.run(main()) == 'page /video'
+
+# EOF
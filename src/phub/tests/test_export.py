@@ -0,0 +1,118 @@
+import csv
+import json
+
+import httpx
+import pytest
+
+try:
+    from phub import export
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import export
+
+from .conftest import KEYS, search_page, mock_client
+
+BLOCKED = KEYS[4]
+
+def make_client():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+
+        if 'video/search' in str(request.url):
+            return search_page(request)
+
+        key = request.url.params['id']
+        if key == BLOCKED:
+            return httpx.Response(200, json = {'code': '2002', 'message': 'Blocked'})
+
+        return httpx.Response(200, json = {'video': {
+            'views': int(key[2:], 16), 'rating': 75, 'ratings': 4, 'publish_date': '2024-01-02 03:04:05',
+            'tags': [{'tag_name': 'a'}, {'tag_name': 'b, c'}], 'title': key}})
+
+    return mock_client(handler, login = False), calls
+
+def test_jsonl(tmp_path):
+    client, calls = make_client()
+    path = tmp_path / 'videos.jsonl'
+
+    assert client.search('x').export(path, fields = ['key', 'views', 'likes', 'dislikes', 'date', 'tags']) == 5
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row['key'] for row in rows] == [key for key in KEYS if key != BLOCKED]
+    assert rows[0] == {'key': KEYS[0], 'views': 1, 'likes': 3, 'dislikes': 1,
+                       'date': '2024-01-02T03:04:05', 'tags': ['a', 'b, c']}
+
+    # One webmasters call per video, and no page
+    assert calls.count('/webmasters/video_by_id') == 6
+    assert '/view_video.php' not in calls
+
+def test_csv(tmp_path):
+    client, _ = make_client()
+    path = tmp_path / 'videos.csv'
+
+    assert client.search('x').export(path, fields = ['key', 'tags'], max = 2) == 2
+
+    with open(path, newline = '') as file:
+        rows = list(csv.DictReader(file))
+
+    assert rows == [{'key': key, 'tags': '["a", "b, c"]'} for key in KEYS[:2]]
+
+def test_pages_are_not_kept(tmp_path):
+    client, _ = make_client()
+    query = client.search('x')
+    kept = []
+
+    get_page = query._get_page
+    def spy(index):
+        kept.append(len(query._pages) + len(query._raw_pages))
+        return get_page(index)
+
+    query._get_page = spy
+    assert query.export(tmp_path / 'videos.jsonl', fields = ['key']) == 6
+    assert kept == [0, 0, 0]
+    assert not query._pages and not query._raw_pages
+
+    # Plain iteration still keeps them
+    assert len([video for video in query]) == 6
+    assert len(query._pages) == 2
+
+def test_rows_are_streamed():
+    client, _ = make_client()
+    pulled = []
+
+    def videos():
+        for key in KEYS:
+            pulled.append(key)
+            yield client.get(key)
+
+    rows = export.rows(videos(), ['views'], concurrency = 2)
+    assert pulled == []
+
+    assert next(rows) == {'views': 1}
+    assert len(pulled) == 2
+
+def test_invalid_arguments(tmp_path):
+    client, _ = make_client()
+
+    with pytest.raises(ValueError):
+        export.write([], tmp_path / 'videos.jsonl', fields = ['nope'])
+
+    with pytest.raises(ValueError):
+        export.write([], tmp_path / 'videos.xml')
+
+    assert not list(tmp_path.iterdir())
+
+def test_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    client, _ = make_client()
+    path = tmp_path / 'videos.parquet'
+
+    assert client.search('x').export(path, fields = ['key', 'views', 'tags'], batch_size = 2) == 5
+
+    table = pq.read_table(path)
+    assert table.column_names == ['key', 'views', 'tags']
+    assert table.column('views').to_pylist() == [1, 2, 3, 4, 6]
+
+# EOF
@@ -0,0 +1,64 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+try:
+    from phub import Client, AsyncClient
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client, AsyncClient
+
+def counting_handler(calls):
+    lock = threading.Lock()
+    
+    def handler(request):
+        with lock: calls.append(request)
+        time.sleep(.1)
+        return httpx.Response(200, text = str(request.url))
+    
+    return handler
+
+def test_concurrent_calls_are_coalesced():
+    calls = []
+    client = Client()
+    client.session = httpx.Client(transport = httpx.MockTransport(counting_handler(calls)))
+    
+    with ThreadPoolExecutor(8) as pool:
+        texts = list(pool.map(lambda url: client.call(url).text, ['video'] * 8 + ['model']))
+    
+    assert len(calls) == 2
+    assert texts.count('https://www.pornhub.com/video') == 8
+
+def test_coalescing_can_be_disabled():
+    calls = []
+    client = Client(coalesce = False)
+    client.session = httpx.Client(transport = httpx.MockTransport(counting_handler(calls)))
+    
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: client.call('video'), range(4)))
+    
+    assert len(calls) == 4
+
+def test_async_calls_are_coalesced():
+    calls = []
+    
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(.1)
+        return httpx.Response(200, text = 'ok')
+    
+    async def main():
+        client = AsyncClient(login = False)
+        client.session = httpx.AsyncClient(transport = httpx.MockTransport(handler))
+        
+        async with client:
+            return await asyncio.gather(*(client.call('video') for _ in range(5)))
+    
+    responses = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(response.text == 'ok' for response in responses)
+
+# EOF
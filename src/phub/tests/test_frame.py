@@ -0,0 +1,153 @@
+import httpx
+import pytest
+
+np = pytest.importorskip('numpy')
+
+try:
+    from phub import VideoFrame
+    from phub.modules.store import MetadataStore
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import VideoFrame
+    from ...phub.modules.store import MetadataStore
+
+from .conftest import KEYS, listing, mock_client
+
+# Views, duration, rating, publish date, tags and categories of each video
+VIDEOS = {
+    KEYS[0]: (500, '10:00', 90, '2024-01-05 00:00:00', ['a', 'b'], ['Amateur']),
+    KEYS[1]: (100, '2:00', 50, '2024-02-01 12:00:00', ['b'], ['Babe', 'Amateur']),
+    KEYS[2]: (900, '1:00:00', 75, '2024-02-10 00:00:00', [], ['Babe']),
+    KEYS[3]: (300, '30', 100, '2023-12-31 23:59:59', ['c', 'a'], []),
+    KEYS[4]: (700, '5:00', 20, '2024-03-01 00:00:00', ['a'], ['Amateur'])
+}
+
+def make_client(store: MetadataStore = None):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+
+        if 'video/search' in str(request.url):
+            if request.url.params['page'] != '1': return httpx.Response(404, text = '')
+            return httpx.Response(200, text = listing(KEYS))
+
+        key = request.url.params['id']
+        if key not in VIDEOS:
+            return httpx.Response(200, json = {'code': '2001', 'message': 'Removed'})
+
+        views, duration, rating, date, tags, categories = VIDEOS[key]
+        return httpx.Response(200, json = {'video': {
+            'views': views, 'duration': duration, 'rating': rating, 'ratings': 10, 'publish_date': date,
+            'tags': [{'tag_name': tag} for tag in tags], 'categories': [{'category': cat} for cat in categories]}})
+
+    return mock_client(handler, login = False, store = store), calls
+
+@pytest.fixture(scope = 'module')
+def frame() -> VideoFrame:
+    client, calls = make_client()
+    frame = client.search('x').frame()
+
+    # One webmasters call per video, unavailable videos are skipped
+    assert calls.count('/webmasters/video_by_id') == 6
+    assert '/view_video.php' not in calls
+    return frame
+
+def test_pages_are_not_kept():
+    client, _ = make_client()
+    query = client.search('x')
+
+    assert len(query.frame()) == 5
+    assert not query._pages and not query._raw_pages
+
+def test_columns(frame):
+    assert len(frame) == 5
+    assert frame['key'].tolist() == list(VIDEOS)
+    assert frame['views'].dtype == np.int64
+    assert frame['duration'].tolist() == [600, 120, 3600, 30, 300]
+    assert frame['likes'].tolist() == [9, 5, 8, 10, 2]
+    assert frame['date'][0] == np.datetime64('2024-01-05T00:00:00')
+    assert frame['tags'].tolist() == [['a', 'b'], ['b'], [], ['c', 'a'], ['a']]
+    assert frame['categories'][1] == ['Babe', 'Amateur']
+
+    assert next(iter(frame)) == {'key': KEYS[0], 'views': 500, 'duration': 600, 'likes': 9, 'dislikes': 1,
+                                 'rating': .9, 'date': frame['date'][0].astype(object),
+                                 'tags': ['a', 'b'], 'categories': ['Amateur']}
+
+def test_filter(frame):
+    assert frame[frame['views'] > 400]['key'].tolist() == [KEYS[0], KEYS[2], KEYS[4]]
+    assert frame.filter(frame.has('tags', 'a'), views = (None, 500))['key'].tolist() == [KEYS[0], KEYS[3]]
+    assert frame.filter(date = ('2024-02-01', '2024-02-28'))['key'].tolist() == [KEYS[1], KEYS[2]]
+
+    # Labels are kept with their rows
+    selected = frame[np.array([4, 1, 3])]
+    assert selected['tags'].tolist() == [['a'], ['b'], ['c', 'a']]
+    assert selected.has('categories', 'Babe').tolist() == [False, True, False]
+
+    with pytest.raises(ValueError):
+        frame.has('views', 'a')
+
+def test_sort_and_top(frame):
+    assert frame.sort('views')['views'].tolist() == [900, 700, 500, 300, 100]
+    assert frame.sort('duration', descending = False)['key'].tolist() == [KEYS[3], KEYS[1], KEYS[4], KEYS[0], KEYS[2]]
+    assert frame.top(2, 'likes')['key'].tolist() == [KEYS[3], KEYS[0]]
+    assert len(frame.top(10)) == 5
+
+def test_missing_values_sort_last():
+    frame = VideoFrame.from_rows([{'key': 'a', 'views': 2, 'date': '2024-01-02T00:00:00'},
+                                  {'key': 'b'},
+                                  {'key': 'c', 'views': 1, 'date': '2024-01-01T00:00:00'}])
+
+    for by in ('views', 'date'):
+        assert frame.sort(by)['key'].tolist() == ['a', 'c', 'b']
+        assert frame.sort(by, descending = False)['key'].tolist() == ['c', 'a', 'b']
+
+    assert frame.top(5, 'rating')['key'].tolist() == []
+
+def test_group(frame):
+    groups = frame.group('tags', 'views', 'mean')
+    assert dict(zip(groups['key'], groups['count'])) == {'a': 3, 'b': 2, 'c': 1}
+    assert dict(zip(groups['key'], groups['views'])) == {'a': 500, 'b': 300, 'c': 300}
+
+    groups = frame.group(frame['date'].astype('datetime64[M]'), 'views', 'max')
+    assert groups['key'].astype(str).tolist() == ['2023-12', '2024-01', '2024-02', '2024-03']
+    assert groups['views'].tolist() == [300, 500, 900, 700]
+
+    # Filtered out labels have no group
+    groups = frame[frame.has('categories', 'Babe')].group('categories')
+    assert dict(zip(groups['key'], groups['count'])) == {'Amateur': 1, 'Babe': 2}
+
+def test_group_ignores_missing_values():
+    frame = VideoFrame.from_rows([{'key': 'a', 'views': 10, 'rating': .5, 'tags': ['x']},
+                                  {'key': 'b', 'tags': ['x', 'y']},
+                                  {'key': 'c', 'views': 30, 'tags': ['x']},
+                                  {'key': 'd', 'tags': ['z']}])
+
+    groups = frame.group('tags', 'views', 'mean')
+    assert groups['count'].tolist() == [3, 1, 1]
+    assert groups['views'][0] == 20 and np.isnan(groups['views'][1:]).all()
+
+    assert frame.group('tags', 'views', 'sum')['views'].tolist() == [40, -1, -1]
+    assert frame.group('tags', 'views', 'min')['views'].tolist() == [10, -1, -1]
+    assert frame.group('tags', 'views', 'max')['views'].tolist() == [30, -1, -1]
+
+    ratings = frame.group('tags', 'rating', 'min')['rating']
+    assert ratings[0] == .5 and np.isnan(ratings[1:]).all()
+
+def test_from_store(tmp_path):
+    store = MetadataStore(tmp_path / 'store.db')
+    client, _ = make_client(store)
+
+    for key in KEYS[:3]:
+        client.get(key).prefetch(['views'])
+
+    client, calls = make_client(store)
+    frame = VideoFrame.from_store(store)
+
+    # Read from the store, without requests
+    assert calls == []
+    assert frame['key'].tolist() == KEYS[:3]
+    assert frame['duration'].tolist() == [600, 120, 3600]
+    assert frame.group('categories')['count'].tolist() == [2, 2]
+
+# EOF
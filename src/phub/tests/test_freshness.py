@@ -0,0 +1,95 @@
+import random
+
+import httpx
+
+try:
+    from phub import Client
+    from phub.bench import fixtures
+    from phub.modules.cache import ResponseCache
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client
+    from ...phub.bench import fixtures
+    from ...phub.modules.cache import ResponseCache
+
+from .conftest import mock_client
+
+KEY = 'ph0000000000001'
+PAGE = fixtures.video_page(random.Random(1), size = 20_000).replace(
+    '</body>', '<div class="views"><span class="count">1,000</span></div></body>')
+
+def make_video(**kwargs):
+    calls = []
+    views = iter(range(1, 100))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+
+        if request.url.path == '/webmasters/video_by_id':
+            return httpx.Response(200, json = {'video': {'title': 'Title', 'views': next(views),
+                                                         'publish_date': '2024-01-02 03:04:05'}})
+
+        return httpx.Response(200, text = PAGE)
+
+    client = Client(login = False, **kwargs)
+    client.session = httpx.Client(transport = httpx.MockTransport(handler))
+    return client.get(KEY), calls
+
+def age(video, seconds):
+    video.loaded_at = {source: time - seconds for source, time in video.loaded_at.items()}
+
+def test_revalidate_through_webmasters():
+    video, calls = make_video(freshness = {'views': 600, 'title': None, 'date': 3600})
+
+    title, date = video.title, video.date
+    assert video.views == 1000 # From the page
+    assert video.revalidate() == []
+
+    age(video, 1000)
+    calls.clear()
+
+    # Only views are refreshed, without downloading the page again
+    assert video.revalidate() == ['views']
+    assert calls == ['/webmasters/video_by_id']
+    assert video.views == 1
+    assert video.page.views is None
+    assert video.__dict__['title'] is title and video.__dict__['date'] is date
+
+    # The refreshed field is now served by fresh data
+    assert video.revalidate() == []
+
+def test_page_only_fields():
+    video, calls = make_video()
+    assert list(video.hotspots)
+
+    age(video, 10)
+    calls.clear()
+
+    assert video.revalidate({'hotspots': 5, 'orientation': 5}) == ['hotspots']
+    assert calls == ['/view_video.php']
+
+def test_refresh_fields():
+    video, calls = make_video()
+    assert video.views == 1 and video.date
+
+    video.refresh(fields = ['views'])
+    assert calls == ['/webmasters/video_by_id'] * 2
+    assert video.views == 2
+    assert 'date' in video.__dict__
+
+def test_refresh_bypasses_response_cache(tmp_path):
+    server = {'views': 1}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json = {'video': {'title': 'Title', 'views': server['views']}})
+
+    client = mock_client(handler, login = False, freshness = {'views': 0},
+                         cache = ResponseCache(tmp_path / 'cache.db'))
+    video = client.get(KEY)
+    assert video.views == 1
+
+    server['views'] = 999
+    assert video.revalidate() == ['views']
+    assert video.views == 999
+
+# EOF
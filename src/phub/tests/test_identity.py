@@ -0,0 +1,66 @@
+import gc
+
+import httpx
+
+try:
+    from phub import User
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import User
+
+from .conftest import KEYS, search_page, mock_client
+
+def make_client(**kwargs):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+
+        if 'video/search' in str(request.url):
+            return search_page(request)
+
+        if 'video_by_id' in str(request.url):
+            return httpx.Response(200, json = {'video': {'title': 'x', 'views': 42}})
+
+        return httpx.Response(404, text = '')
+
+    return mock_client(handler, login = False, **kwargs), calls
+
+def test_shared_videos():
+    client, calls = make_client(identity_map = True)
+
+    video = client.get(KEYS[0])
+    assert video.views == 42
+
+    # Query data is merged into the existing object
+    first = next(iter(client.search('a')))
+    assert first is video and first is client.get(KEYS[0])
+    assert first.data['page@video_title'] == f'Video {KEYS[0]}'
+    assert first.data['data@views'] == 42
+
+    query = client.search('b')
+    assert next(iter(query)) is video
+    assert video.data['query@parent'] is query
+
+    # Nothing was fetched twice
+    assert calls.count('/webmasters/video_by_id') == 1
+
+def test_shared_users():
+    client, _ = make_client(identity_map = True)
+    url = 'https://www.pornhub.com/model/some-model'
+
+    assert User.get(client, url) is User.get(client, url)
+
+def test_weak_references():
+    client, _ = make_client(identity_map = True)
+    client.get(KEYS[0])
+    gc.collect()
+
+    assert ('video', KEYS[0]) not in client.identities
+
+def test_disabled_by_default():
+    client, _ = make_client()
+
+    assert client.get(KEYS[0]) is not client.get(KEYS[0])
+
+# EOF
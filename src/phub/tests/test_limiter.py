@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from phub import Client
+    from phub.modules.limiter import TokenBucket, RateLimiter
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client
+    from ...phub.modules.limiter import TokenBucket, RateLimiter
+
+
+def test_bucket_threaded_pacing():
+    bucket = TokenBucket(rate = 100)
+    
+    start = time.monotonic()
+    with ThreadPoolExecutor(20) as pool:
+        list(pool.map(lambda _: bucket.acquire(), range(21)))
+    
+    # 1 immediate token, then 20 tokens at 100/s
+    assert .18 <= time.monotonic() - start < .5
+
+def test_bucket_try_acquire():
+    bucket = TokenBucket(rate = 1, burst = 2)
+    
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+def test_separate_budgets():
+    limiter = RateLimiter(page = 1, media = TokenBucket(1000, burst = 10))
+    
+    assert limiter.try_acquire('page')
+    assert not limiter.try_acquire('page')
+    assert all(limiter.try_acquire('media') for _ in range(10))
+    assert limiter.try_acquire('api') # Not limited
+
+def test_client_delay():
+    client = Client(delay = 2)
+    
+    assert client.limiter.reserve('page') == 0
+    assert client.limiter.reserve('api') > 1 # Shared budget
+    
+    client.delay = 0
+    assert client.limiter.reserve('page') == 0
+
+# EOF
@@ -0,0 +1,61 @@
+import time
+import httpx
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from phub import Client, AsyncClient
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client, AsyncClient
+
+ACCOUNT = {'success': '1', 'username': 'bob', 'avatar': 'https://ci.phncdn.com/a.jpg',
+           'premium_redirect_cookie': '0'}
+
+def make_client(**kwargs):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        time.sleep(.01) # Let concurrent callers pile up
+
+        if request.url.path == '/front/authenticate':
+            return httpx.Response(200, json = ACCOUNT)
+
+        return httpx.Response(200, text = '<script>var token = "tok",</script>')
+
+    # Swap the session before the lazy login can use it
+    client = Client('bob@example.com', 'pass', login = 'lazy', **kwargs)
+    client.session = httpx.Client(transport = httpx.MockTransport(handler))
+    return client, calls
+
+def test_lazy_login_waits_for_first_use():
+    client, calls = make_client()
+    assert not client.logged and calls == []
+    assert repr(client.account) == 'phub.Account(logged-out)'
+
+    assert client.account.name == 'bob'
+    assert client.logged
+    assert calls == ['/', '/front/authenticate']
+
+def test_lazy_login_happens_once():
+    client, calls = make_client()
+
+    with ThreadPoolExecutor(8) as pool:
+        tokens = list(pool.map(lambda _: client._granted_token, range(8)))
+
+    assert set(tokens) == {'tok'}
+    assert calls.count('/front/authenticate') == 1
+
+def test_anonymous_calls_do_not_log_in():
+    client, calls = make_client()
+    client.call('video/search?search=x')
+
+    assert not client.logged
+    assert calls == ['/video/search']
+
+def test_async_clients_do_not_log_in_lazily():
+    with pytest.raises(ValueError):
+        AsyncClient('bob@example.com', 'pass', login = 'lazy')
+
+# EOF
@@ -0,0 +1,61 @@
+import httpx
+
+try:
+    from phub.modules.cache import ResponseCache
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub.modules.cache import ResponseCache
+
+from .conftest import FAST, mock_client
+
+def test_requests_and_retries():
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        
+        # Throttle the first page attempt only
+        if request.url.path == '/video' and len(calls) == 1:
+            return httpx.Response(429)
+        
+        return httpx.Response(200, content = b'x' * 100)
+    
+    client = mock_client(handler, retry = FAST)
+    client.call('video')
+    client.call('https://cdn.example/seg.ts')
+    
+    metrics = client.metrics
+    assert metrics.total('requests_total', endpoint = 'page') == 2
+    assert metrics.total('requests_total', endpoint = 'cdn') == 1
+    assert metrics.total('retries_total') == 1
+    assert metrics.total('throttled_total') == 1
+    assert metrics.total('bytes_total', endpoint = 'page') == 100
+    
+    # Both page attempts are timed
+    snapshot = metrics.snapshot()
+    assert {series['endpoint']: series['count'] for series in snapshot['request_seconds']} == {'page': 2, 'cdn': 1}
+
+def test_cache_ratio(tmp_path):
+    client = mock_client(lambda request: httpx.Response(200, text = 'ok'),
+                         cache = ResponseCache(tmp_path / 'cache.db'))
+    
+    for _ in range(4):
+        client.call('video')
+    
+    assert client.metrics.cache_hit_ratio == .75
+    assert client.metrics.total('requests_total') == 1
+
+def test_prometheus_export():
+    client = mock_client(lambda request: httpx.Response(200, text = 'ok'))
+    client.call('video')
+    
+    text = client.metrics.to_prometheus()
+    assert '# TYPE phub_requests_total counter' in text
+    assert 'phub_requests_total{endpoint="page",status="200"} 1' in text
+    assert 'phub_request_seconds_bucket{endpoint="page",le="+Inf"} 1' in text
+    
+    # Label values are escaped
+    client.metrics.inc('requests_total', endpoint = 'a"b\\c\nd')
+    assert 'phub_requests_total{endpoint="a\\"b\\\\c\\nd"} 1' in client.metrics.to_prometheus()
+
+# EOF
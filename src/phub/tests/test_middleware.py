@@ -0,0 +1,86 @@
+import httpx
+
+try:
+    from phub.modules.middleware import Middleware, MetricsMiddleware
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub.modules.middleware import Middleware, MetricsMiddleware
+
+from .conftest import FAST, mock_client
+
+class Recorder(Middleware):
+    def __init__(self, name, events):
+        self.name, self.events = name, events
+    
+    def before_request(self, client, call):
+        self.events.append(f'before {self.name}')
+    
+    def after_response(self, client, call, response):
+        self.events.append(f'after {self.name}')
+        return response
+
+def test_hooks_order():
+    events = []
+    client = mock_client(lambda request: httpx.Response(200, text = 'ok'),
+                         middlewares = [Recorder('a', events), Recorder('b', events)])
+    
+    assert client.call('').text == 'ok'
+    assert events == ['before a', 'before b', 'after b', 'after a']
+    
+    # Metrics stay last
+    assert isinstance(client.middlewares[-1], MetricsMiddleware)
+    assert isinstance(client.middlewares[-2], Recorder)
+
+def test_short_circuit():
+    calls = []
+    
+    class Stub(Middleware):
+        def before_request(self, client, call):
+            return httpx.Response(200, text = f'stub {call.url}', request = httpx.Request(call.method, call.url))
+    
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200)
+    
+    client = mock_client(handler)
+    client.use(Stub(), index = 1) # Right after URL fixing
+    
+    assert client.call('video').text == 'stub https://www.pornhub.com/video'
+    assert not calls
+
+def test_error_recovery():
+    calls = []
+    
+    class Fallback(Middleware):
+        def on_error(self, client, call, error):
+            if isinstance(error, httpx.ConnectError):
+                return httpx.Response(200, text = 'fallback')
+    
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError('down')
+    
+    client = mock_client(handler, retry = FAST, middlewares = [Fallback()])
+    
+    assert client.call('').text == 'fallback'
+    assert len(calls) == 1
+
+def test_challenge_retries():
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, text = 'ok')
+    
+    class Challenge(Middleware):
+        def after_response(self, client, call, response):
+            if call.attempt == 0:
+                raise ConnectionError('challenge')
+            return response
+    
+    client = mock_client(handler, retry = FAST, middlewares = [Challenge()])
+    
+    assert client.call('').text == 'ok'
+    assert len(calls) == 2
+
+# EOF
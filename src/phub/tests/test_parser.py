@@ -0,0 +1,92 @@
+import random
+from datetime import datetime
+
+import httpx
+
+try:
+    from phub import Client
+    from phub.bench import fixtures
+    from phub.modules import parser
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client
+    from ...phub.bench import fixtures
+    from ...phub.modules import parser
+
+from .conftest import mock_client
+
+INFO = ('<div class="video-info-row"><a href="/channels/chan" data-event="Video Underplayer" class="x">'
+        '<span class="bolded">Chan</span></a><div class="views"><span class="count">1,234,567</span></div>'
+        '<span class="votesUp" data-rating="900">900</span><span class="votesDown" data-rating="100">100</span>'
+        '<a data-label="Tag" href="/tags/a">Amateur</a> <a data-label="tag" href="/x"> Big </a>'
+        '<a data-label="Tag" href="/tags/a">Amateur</a></div>')
+
+def make_page(info: str = INFO) -> str:
+    return fixtures.video_page(random.Random(1), size = 20_000).replace('</body>', info + '</body>')
+
+def test_extract():
+    flashvars, page = parser.extract(make_page())
+
+    assert flashvars['isHD'] == 'true' and len(flashvars['mediaDefinitions']) == 4
+    assert page.title == flashvars['video_title']
+    assert len(page.token) == 80
+    assert page.author == ('/model/some-model', 'Some Model')
+    assert page.favorite
+    assert page.views == 1234567
+    assert page.likes == (900, 100)
+    assert page.tags == ('Amateur', 'Big')
+    assert page.date == '2023-04-05T06:07:08+00:00'
+    assert page.categories == ('Amateur', 'Babe')
+    assert page.pornstars == (('/pornstar/some-star', 'Some Star'),)
+
+def test_extract_channel_author():
+    raw = make_page().replace('usernameBadgesWrapper', 'wrapper').replace(' active"', '"')
+    _, page = parser.extract(raw)
+
+    assert page.author == ('/channels/chan', 'Chan')
+    assert not page.favorite
+
+def test_resolve():
+    page = make_page()
+    assert parser.resolve(page) == parser.extract(page)[0]
+
+    client = mock_client(lambda request: httpx.Response(200, text = page), login = False)
+    assert parser.resolve(client.get('ph0000000000001'))['isHD'] == 'true'
+
+def test_video_keeps_page_data_only():
+    client = Client(login = False)
+    video = client.get('ph0000000000001')
+    video._load_page(make_page())
+
+    assert isinstance(video.page, parser.Page)
+    assert video.data['page@isHD'] == 'true'
+
+    # Served from the page, without webmasters data
+    assert video.views == 1234567
+    assert video.likes.up == 900 and video.likes.ratings == .9
+    assert [tag.name for tag in video.tags] == ['Amateur', 'Big']
+    assert video.author.name == 'Some Model'
+    assert video.is_favorite
+
+def test_page_only_hydration():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, text = make_page())
+
+    client = Client(login = False, use_webmaster_api = False, identity_map = True)
+    client.session = httpx.Client(transport = httpx.MockTransport(handler))
+    video = client.get('ph0000000000001')
+
+    video.dictify(['title', 'image', 'duration', 'tags', 'likes', 'views', 'date', 'categories'])
+    assert video.date == datetime(2023, 4, 5, 6, 7, 8)
+    assert video.categories == ['Amateur', 'Babe']
+    assert video.pornstars[0] is client.get_user('https://www.pornhub.com/pornstar/some-star')
+    assert video.author.name == 'Some Model'
+
+    # The page was enough
+    assert video.requests == 1
+    assert calls == ['/view_video.php']
+
+# EOF
@@ -0,0 +1,91 @@
+import random
+import threading
+
+import httpx
+
+try:
+    from phub import Client
+    from phub.bench import fixtures
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client
+    from ...phub.bench import fixtures
+
+KEY = 'ph0000000000001'
+# Without pornstars, so they are looked up
+PAGE = fixtures.video_page(random.Random(1), size = 20_000).replace('data-mxptype', 'data-type').replace(
+    '</body>', '<div class="views"><span class="count">1,234</span></div></body>')
+
+DATA = {'video': {'title': 'Title', 'views': 42, 'publish_date': '2024-01-02 03:04:05',
+                  'categories': [{'category': 'amateur'}], 'segment': 'straight',
+                  'pornstars': [{'pornstar_name': 'Ann'}, {'pornstar_name': 'Bea'}]}}
+
+def make_client():
+    calls = []
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            calls.append((request.method, request.url.path))
+
+        if request.url.path == '/view_video.php':
+            return httpx.Response(200, text = PAGE)
+
+        if request.url.path == '/webmasters/video_by_id':
+            return httpx.Response(200, json = DATA)
+
+        # Pornstars are guessed as models
+        if request.method == 'HEAD' and request.url.path.startswith('/model/'):
+            return httpx.Response(200)
+
+        return httpx.Response(404)
+
+    client = Client(login = False)
+    client.session = httpx.Client(transport = httpx.MockTransport(handler))
+    return client, calls
+
+def test_plan():
+    client, _ = make_client()
+    video = client.get(KEY)
+
+    assert video._plan(['url', 'key']) == []
+    assert video._plan(['views', 'date']) == ['data@']
+    assert video._plan(['title', 'views']) == ['page@']
+    assert video._plan(['hotspots', 'orientation', 'tags']) == ['data@', 'page@']
+    assert video._plan(['hotspots', 'categories', 'tags']) == ['page@']
+
+    # Listing data already serves titles
+    video.change_titles = False
+    video.data['page@video_title'] = 'Listed'
+    assert video._plan(['title']) == []
+
+def test_prefetch():
+    client, calls = make_client()
+    video = client.get(KEY)
+
+    fields = ['title', 'views', 'date', 'categories', 'orientation', 'author', 'pornstars', 'is_HD']
+    assert video.prefetch(fields) == ['data@', 'page@']
+    assert calls.count(('GET', '/view_video.php')) == 1
+    assert calls.count(('GET', '/webmasters/video_by_id')) == 1
+
+    # Everything is served from cache
+    calls.clear()
+    data = video.dictify(['title', 'views', 'date', 'categories', 'orientation', 'is_HD'])
+
+    assert data['views'] == 1234
+    assert data['orientation'] == 'straight'
+    assert video.author.name == 'Some Model'
+    assert [user.name for user in video.pornstars] == ['Ann', 'Bea']
+    assert calls == []
+    assert video.prefetch(fields) == []
+
+def test_dictify_fields():
+    client, calls = make_client()
+    video = client.get(KEY)
+
+    data = video.dictify(fields = ['url', 'views', 'date'])
+
+    assert list(data) == ['url', 'views', 'date']
+    assert calls == [('GET', '/webmasters/video_by_id')]
+
+# EOF
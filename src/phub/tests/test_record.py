@@ -0,0 +1,82 @@
+import gc
+import weakref
+
+import httpx
+
+try:
+    from phub import Client, Video, VideoRecord
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client, Video, VideoRecord
+
+from .conftest import KEYS, search_page, mock_client
+
+def handler(request: httpx.Request) -> httpx.Response:
+    url = str(request.url)
+
+    if 'video/search' in url:
+        return search_page(request)
+
+    if 'video_by_id' in url:
+        return httpx.Response(200, json = {'video': {'title': 'x', 'views': 42}})
+
+    return httpx.Response(404, text = '')
+
+def make_client(**kwargs) -> Client:
+    return mock_client(handler, **kwargs)
+
+def test_compact_search():
+    query = make_client(compact = True).search('test')
+    records = [record for record in query]
+
+    assert [record.key for record in records] == KEYS
+    assert all(type(record) is VideoRecord for record in records)
+    assert not hasattr(records[0], '__dict__')
+
+    # Neither the raw listing nor the query are kept
+    assert 'query@parent' not in records[0].data
+    assert not query._raw_pages and not query._pages
+    assert all(isinstance(value, (str, int, bool, type(None))) for value in records[0].data.values())
+
+    ref = weakref.ref(query)
+    del query
+    gc.collect()
+    assert ref() is None
+
+def test_record_upgrade():
+    record = next(iter(make_client(compact = True).search('test')))
+    assert record._video is None
+    assert record.data['page@video_title'] == f'Video {KEYS[0]}'
+
+    # Other attributes go through a full video, without refetching listing data
+    assert record.views == 42
+    assert isinstance(record.video, Video)
+    assert record.video.data['page@video_title'] == f'Video {KEYS[0]}'
+    assert not record.is_free_premium
+
+def test_get_records():
+    client = make_client(compact = True)
+    records = [record for record in client.search('test')]
+
+    # Records of the client are upgraded in place
+    video = client.get(records[0])
+    assert video is records[0].video
+    assert video.data['page@video_title'] == f'Video {KEYS[0]}'
+
+    lookups = client.get_many(records[:3], fields = ['views'])
+    assert [lookup.video.key for lookup in lookups] == KEYS[:3]
+    assert [lookup.video.views for lookup in lookups] == [42] * 3
+
+    # Others are resolved by URL
+    other = make_client().get(records[1])
+    assert other.key == KEYS[1] and other is not records[1].video
+
+def test_video_compact():
+    video = next(iter(make_client().search('test')))
+    assert 'query@parent' in video.data
+
+    record = video.compact()
+    assert record.key == video.key
+    assert 'query@parent' not in record.data
+
+# EOF
@@ -0,0 +1,71 @@
+import time
+
+import httpx
+import pytest
+
+try:
+    from phub.modules.retry import RetryPolicy
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub.modules.retry import RetryPolicy
+
+from .conftest import FAST, mock_client
+
+def test_retry_statuses():
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3: return httpx.Response(503, headers = {'Retry-After': '0'})
+        return httpx.Response(200, text = 'ok')
+    
+    client = mock_client(handler, retry = FAST)
+    assert client.call('').text == 'ok'
+    assert len(calls) == 3
+
+def test_fatal_errors_are_not_retried():
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        raise ValueError('boom')
+    
+    client = mock_client(handler, retry = FAST)
+    
+    with pytest.raises(ValueError):
+        client.call('')
+    
+    assert len(calls) == 1
+
+def test_transport_errors_give_up():
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError('down')
+    
+    client = mock_client(handler)
+    
+    with pytest.raises(ConnectionError):
+        client.call('', retry = FAST)
+    
+    assert len(calls) == FAST.attempts
+
+def test_failed_response_is_returned():
+    client = mock_client(lambda _: httpx.Response(404))
+    assert client.call('', throw = False, retry = FAST).status_code == 404
+
+def test_backoff():
+    policy = RetryPolicy(base = 1, cap = 4, jitter = .5)
+    
+    assert all(.5 <= policy.backoff(0) <= 1 for _ in range(100))
+    assert all(2 <= policy.backoff(5) <= 4 for _ in range(100))
+
+def test_retry_after_and_deadline():
+    policy = RetryPolicy(deadline = 5)
+    response = httpx.Response(429, headers = {'Retry-After': '3'})
+    
+    assert policy.wait(0, time.monotonic(), response = response) == 3
+    assert policy.wait(0, time.monotonic() - 3, response = response) is None
+
+# EOF
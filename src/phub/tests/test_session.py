@@ -0,0 +1,118 @@
+import os
+import json
+import httpx
+import pytest
+
+try:
+    from phub import Client, errors
+    from phub.modules.session import SessionStore
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client, errors
+    from ...phub.modules.session import SessionStore
+
+ACCOUNT = {'success': '1', 'username': 'bob', 'avatar': 'https://ci.phncdn.com/a.jpg',
+           'premium_redirect_cookie': '0'}
+
+def make_server(logged: bool = True):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+
+        if request.url.path == '/front/authenticate':
+            return httpx.Response(200, json = ACCOUNT, headers = {'Set-Cookie': 'il=secret; Path=/'})
+
+        menu = '<a href="/users/bob">' if logged or calls.count('/front/authenticate') else ''
+        return httpx.Response(200, text = f'{menu}<script>var token = "tok{len(calls)}",</script>')
+
+    return handler, calls
+
+def make_client(handler, path, login = False) -> Client:
+    client = Client('bob@example.com', 'pass', login = login, session_store = path)
+    client.session = httpx.Client(transport = httpx.MockTransport(handler))
+    return client
+
+def test_session_restored(tmp_path):
+    path = tmp_path / 'session.json'
+    handler, calls = make_server()
+
+    first = make_client(handler, path)
+    first.login()
+    assert first._granted_token == 'tok3'
+    assert calls == ['/', '/front/authenticate', '/']
+
+    if os.name == 'posix':
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    # The restarted client neither logs in nor fetches a new token
+    calls.clear()
+    second = Client('bob@example.com', 'pass', session_store = path)
+    assert second.logged and second.account.name == 'bob'
+    assert second.session.cookies.get('il') == 'secret'
+    assert calls == []
+    
+    # It only checks the session on first use
+    second.session = httpx.Client(transport = httpx.MockTransport(handler), cookies = second.session.cookies)
+    assert second._granted_token == 'tok3'
+    assert calls == ['/']
+
+    # Other accounts are not restored
+    other = Client('alice@example.com', 'pass', login = False, session_store = path)
+    assert not other._restore_session()
+
+def test_stale_session_logs_in_again(tmp_path):
+    path = tmp_path / 'session.json'
+    handler, calls = make_server(logged = False)
+
+    make_client(handler, path).login()
+
+    # Expire the saved token so the session gets validated
+    client = make_client(handler, path)
+    assert client._restore_session() and client.restored
+    client.session_store.token_ttl = 0
+    calls.clear()
+
+    assert client._granted_token == 'tok4'
+    assert calls == ['/', '/', '/front/authenticate', '/']
+    assert not client.restored
+    assert SessionStore(path).load().token == 'tok4'
+
+def test_revoked_session_logs_in_again(tmp_path):
+    path = tmp_path / 'session.json'
+    handler, calls = make_server(logged = False)
+
+    make_client(handler, path).login()
+
+    # The saved token is still fresh, but the session was revoked
+    client = make_client(handler, path)
+    assert client._restore_session()
+    calls.clear()
+
+    watched = client.account.watched
+    assert watched.url.startswith('https://www.pornhub.com/users/bob/videos/recent')
+    assert calls == ['/', '/', '/front/authenticate', '/']
+    assert not client.restored
+
+    # Checked once
+    client.account.liked
+    assert calls.count('/') == 3
+
+def test_unreadable_session(tmp_path):
+    path = tmp_path / 'session.json'
+    store = SessionStore(path)
+    assert store.load() is None
+
+    path.write_text('not json')
+    with pytest.raises(errors.SessionError):
+        store.load()
+
+    path.write_text(json.dumps({'version': 0, 'email': 'bob@example.com'}))
+    with pytest.raises(errors.SessionError, match = 'version 0'):
+        store.load()
+
+    # Clients log in again instead
+    client = Client('bob@example.com', 'pass', login = False)
+    assert store.restore(client) is None
+
+# EOF
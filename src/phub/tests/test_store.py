@@ -0,0 +1,146 @@
+import time
+import random
+import sqlite3
+import threading
+
+import httpx
+
+try:
+    from phub import Client
+    from phub.bench import fixtures
+    from phub.modules.store import MetadataStore
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client
+    from ...phub.bench import fixtures
+    from ...phub.modules.store import MetadataStore
+
+KEY = 'ph0000000000001'
+PAGE = fixtures.video_page(random.Random(1), size = 20_000)
+
+def make_server():
+    calls = []
+    views = iter(range(1, 100))
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            calls.append(request.url.path)
+
+        if request.url.path == '/webmasters/video_by_id':
+            return httpx.Response(200, json = {'video': {'title': 'Title', 'views': next(views)}})
+
+        return httpx.Response(200, text = PAGE)
+
+    return handler, calls
+
+def make_client(handler, store, **kwargs) -> Client:
+    client = Client(login = False, store = store, **kwargs)
+    client.session = httpx.Client(transport = httpx.MockTransport(handler))
+    return client
+
+def test_warm_restart(tmp_path):
+    path = tmp_path / 'store.db'
+    handler, calls = make_server()
+
+    video = make_client(handler, path).get(KEY)
+    assert video.views == 1 and video.hotspots
+    assert calls == ['/webmasters/video_by_id', '/view_video.php']
+
+    # A new client reads everything from the store
+    calls.clear()
+    video = make_client(handler, path).get(KEY)
+
+    assert video.views == 1
+    assert len(list(video.hotspots)) == 100
+    assert video.duration.seconds > 0
+    assert video.author.name == 'Some Model'
+    assert video.requests == 0 and calls == []
+
+    # Account data is not stored
+    assert video.page.token is None
+    assert len(video._token) == 80
+    assert calls == ['/view_video.php']
+
+    # Entries are separated by language
+    calls.clear()
+    assert make_client(handler, path, language = 'fr').get(KEY).views == 2
+    assert calls == ['/webmasters/video_by_id']
+
+def gated(handler):
+    '''
+    Hold background refreshes until released.
+    '''
+
+    release = threading.Event()
+
+    def wrapper(request: httpx.Request) -> httpx.Response:
+        if threading.current_thread().name.startswith('phub-store'):
+            release.wait(5)
+
+        return handler(request)
+
+    return wrapper, release
+
+def test_stale_while_revalidate(tmp_path):
+    handler, calls = make_server()
+    handler, release = gated(handler)
+    store = MetadataStore(tmp_path / 'store.db', ttl = {'data': 0})
+
+    assert make_client(handler, store).get(KEY).views == 1
+
+    # The stale entry is served, then refreshed in the background
+    calls.clear()
+    video = make_client(handler, store).get(KEY)
+    assert video.views == 1
+
+    release.set()
+    store.wait()
+    assert calls == ['/webmasters/video_by_id']
+    assert video.data['data@views'] == 2
+
+    assert make_client(handler, store).get(KEY).views == 2
+
+    # Entries over max_stale are not served
+    store.max_stale = 0
+    assert make_client(handler, store).get(KEY).views == 4
+
+def test_background_refresh_is_not_merged_over_newer_data(tmp_path):
+    handler, calls = make_server()
+    video = make_client(handler, MetadataStore(tmp_path / 'store.db')).get(KEY)
+    assert video.views == 1
+
+    # A refresh started before the last load is dropped
+    video._download('data', cache = False, started = time.time() - 60)
+    assert len(calls) == 2
+    assert video.data['data@views'] == 1
+
+    video._download('data', cache = False, started = time.time())
+    assert video.data['data@views'] == 3
+
+def test_refresh_skips_store(tmp_path):
+    handler, calls = make_server()
+    store = MetadataStore(tmp_path / 'store.db')
+
+    video = make_client(handler, store).get(KEY)
+    assert video.views == 1
+
+    video.refresh()
+    assert video.views == 2
+
+def test_shared_database(tmp_path):
+    path = tmp_path / 'store.db'
+    stores = [MetadataStore(path) for _ in range(4)]
+
+    def write(index):
+        for i in range(50):
+            stores[index].save(f'ph{i}', 'en', 'data', {'views': index})
+
+    threads = [threading.Thread(target = write, args = (i,)) for i in range(4)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+
+    assert sqlite3.connect(path).execute('SELECT COUNT(*) FROM videos').fetchone()[0] == 50
+    assert stores[0].get('ph1', 'en', 'data').payload['views'] in range(4)
+
+# EOF
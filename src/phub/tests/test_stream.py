@@ -0,0 +1,75 @@
+import httpx
+
+try:
+    from phub.modules import download
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub.modules import download
+
+from .conftest import FAST, mock_client
+
+BODY = bytes(range(256)) * 1000
+
+def media(request):
+    return httpx.Response(200, content = BODY, headers = {'content-type': 'video/mp2t'})
+
+def test_stream_chunks():
+    client = mock_client(media)
+    
+    with client.stream('https://cdn.example/seg.ts', chunk_size = 1000) as stream:
+        chunks = list(stream)
+    
+    assert b''.join(chunks) == BODY
+    assert all(len(chunk) == 1000 for chunk in chunks)
+
+def test_stream_readinto():
+    client = mock_client(media)
+    buffer = bytearray(100_000)
+    read = bytearray()
+    
+    with client.stream('https://cdn.example/seg.ts', chunk_size = 4096) as stream:
+        while size := stream.readinto(buffer):
+            read += buffer[:size]
+    
+    assert read == BODY
+
+def test_stream_retries():
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 2: return httpx.Response(503)
+        return media(request)
+    
+    client = mock_client(handler, retry = FAST)
+    
+    with client.stream('https://cdn.example/seg.ts') as stream:
+        assert stream.read() == BODY
+    
+    assert len(calls) == 2
+
+class FakeVideo:
+    def __init__(self, client, count):
+        self.client = client
+        self.count = count
+    
+    def get_segments(self, quality):
+        return [f'https://cdn.example/seg-{i}.ts' for i in range(self.count)]
+
+def segment_handler(request):
+    index = int(request.url.path.split('-')[1].split('.')[0])
+    return httpx.Response(200, content = bytes([index]) * 10_000)
+
+def test_downloaders_write_in_order(tmp_path):
+    client = mock_client(segment_handler)
+    expected = b''.join(bytes([i]) * 10_000 for i in range(20))
+    
+    for name, downloader in [('default', download.default), ('threaded', download.threaded(max_workers = 8))]:
+        progress = []
+        path = tmp_path / f'{name}.ts'
+        downloader(FakeVideo(client, 20), None, lambda *args: progress.append(args), path)
+        
+        assert path.read_bytes() == expected
+        assert progress[-1] == (20, 20)
+
+# EOF
@@ -0,0 +1,81 @@
+import io
+import json
+
+import httpx
+
+try:
+    import phub
+    from phub import Client
+    from phub.modules import trace, download
+
+except (ModuleNotFoundError, ImportError):
+    from ... import phub
+    from ...phub import Client
+    from ...phub.modules import trace, download
+
+PAGE = '''<html><script>var flashvars_123 = {"video_title": "Some title", "mediaDefinitions": []};
+</script></html>'''
+
+def make_client() -> Client:
+    client = Client()
+    client.session = httpx.Client(transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, text = PAGE)))
+    return client
+
+def test_spans_are_nested():
+    client = make_client()
+    exporter = trace.add_exporter(trace.MemoryExporter())
+    
+    try:
+        video = client.get('https://www.pornhub.com/view_video.php?viewkey=abc')
+        video.fetch('page@video_title')
+    
+    finally:
+        trace.remove_exporter(exporter)
+    
+    spans = {span.name: span for span in exporter.spans}
+    assert spans['client.call'].parent == spans['video.fetch'].id
+    assert spans['parser.extract'].parent == spans['video.fetch'].id
+    assert spans['client.call'].attributes['status'] == 200
+
+def test_tracing_disabled_by_default():
+    with trace.span('nothing') as current:
+        assert current is None
+
+def test_json_lines_export():
+    file = io.StringIO()
+    exporter = trace.add_exporter(trace.JSONLinesExporter(file))
+    
+    try:
+        make_client().call('video')
+    
+    finally:
+        trace.remove_exporter(exporter)
+    
+    record = json.loads(file.getvalue().splitlines()[0])
+    assert record['name'] == 'client.call'
+    assert record['duration'] >= 0
+
+class FakeVideo:
+    def __init__(self, client):
+        self.client = client
+    
+    def get_segments(self, quality):
+        return [f'https://cdn.example/seg-{i}.ts' for i in range(4)]
+
+def test_profile_breakdown(tmp_path):
+    client = make_client()
+    out = io.StringIO()
+    
+    with phub.profile(file = out) as exporter:
+        download.threaded(max_workers = 2)(FakeVideo(client), None, lambda *args: None, tmp_path / 'video.ts')
+    
+    spans = exporter.spans
+    root = next(span for span in spans if span.name == 'download.threaded')
+    segments = [span for span in spans if span.name == 'download.segment']
+    
+    assert len(segments) == 4
+    assert all(span.parent == root.id for span in segments)
+    assert 'download.segment' in out.getvalue()
+
+# EOF
@@ -0,0 +1,45 @@
+import httpx
+
+try:
+    from phub import Client
+    from phub.modules.transport import TransportProfile
+    from phub.bench.server import StandInServer
+
+except (ModuleNotFoundError, ImportError):
+    from ...phub import Client
+    from ...phub.modules.transport import TransportProfile
+    from ...phub.bench.server import StandInServer
+
+def test_profile_limits():
+    profile = TransportProfile(limits = httpx.Limits(max_connections = 4), keepalive_expiry = 30)
+    args = profile.session_args()
+    
+    assert args['limits'].max_connections == 4
+    assert args['limits'].keepalive_expiry == 30
+
+def test_separate_media_pool():
+    client = Client(transport = 'download')
+    
+    assert client.media_session is not None
+    assert client._get_session('media') is client.media_session
+    assert client._get_session('page') is client.session
+    
+    plain = Client()
+    assert plain._get_session('media') is plain.session
+
+def test_prewarm():
+    route = lambda path: (200, {}, b'segment')
+    
+    with StandInServer(route, connect_latency = .01) as server:
+        client = Client(transport = TransportProfile(media_limits = httpx.Limits(max_connections = 4), prewarm = 4))
+        client.prewarm(server.url('seg-1.ts'))
+        
+        assert server.connections == 4
+        
+        for i in range(8):
+            assert client.call(server.url(f'seg-{i}.ts')).content == b'segment'
+        
+        # Warm connections were reused
+        assert server.connections == 4
+
+# EOF
@@ -5,10 +5,12 @@ PHUB utilities.
 import math
 import httpx
 import logging
+from urllib.parse import urlsplit
 from typing import Generator, Iterable, Iterator, Union
 
 from . import errors
 from . import consts
+from . import literals
 
 logger = logging.getLogger(__name__)
 
@@ -262,3 +264,26 @@ def fix_url(url: str):
             return url
 
     return url  # Sometimes URL doesn't need to be changed. In this case, just return it.
+
+
+def url_kind(url: str) -> literals.url_kind:
+    '''
+    Find the traffic class of a URL.
+    
+    Args:
+        url (str): An absolute request URL.
+    
+    Returns:
+        str: 'api' for webmasters calls, 'page' for other site
+             pages and 'media' for CDN hosts (segments, images, etc.)
+    '''
+    
+    host = urlsplit(url).hostname or ''
+    
+    if not 'pornhub.' in host:
+        return 'media'
+    
+    if '/webmasters/' in url:
+        return 'api'
+    
+    return 'page'